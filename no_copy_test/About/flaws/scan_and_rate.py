@@ -4,6 +4,10 @@ Project Security Scanner & Rating Tool
 
 Usage:
   python scan_and_rate.py [path] [--json]
+  python scan_and_rate.py [path] --watch      # stay resident, rescan changed files
+  python scan_and_rate.py [path] --query [text|json|scores]
+  python scan_and_rate.py --batch [paths...] [--roots-file FILE] [--db scan_results.sqlite3]
+  python scan_and_rate.py --trend | --history PATH   # queries over stored batch runs
 
 - Scans a project directory for Docker/security heuristics and outputs:
   - Category scores (0-10) and an overall rating with recommendations.
@@ -19,11 +23,25 @@ Categories:
 Heuristics are best-effort and deterministic for lightweight auditing.
 """
 from __future__ import annotations
+import ctypes
+import ctypes.util
+import errno
+import hashlib
 import os
 import re
 import json
+import multiprocessing
+import select
+import signal
+import socket
+import socketserver
+import sqlite3
+import struct
 import sys
-from typing import List, Dict, Tuple
+import tempfile
+import threading
+import time
+from typing import List, Dict, Set, Tuple
 
 DOCKERFILE_NAMES = {"Dockerfile", "dockerfile"}
 COMPOSE_NAMES = {"docker-compose.yml", "docker-compose.yaml", "compose.yaml", "compose.yml"}
@@ -54,17 +72,30 @@ SCANNER_MENTIONS = [
 ]
 
 
+SKIP_DIRS = {".git", "__pycache__", "node_modules", "venv", ".venv", "site-packages", "dist", "build"}
+BINARY_SUFFIXES = ('.png', '.jpg', '.jpeg', '.gif', '.pdf', '.zip', '.tar', '.gz', '.7z', '.rar', '.pyc')
+GRANT_ALL = re.compile(r"GRANT\s+ALL\s+PRIVILEGES\s+ON\s+\*\.\*", re.I)
+WILDCARD_HOST = re.compile(r"'[^']*'@'[^']*%'")
+
+
+def is_skipped_dir(base: str) -> bool:
+    # Skip common virtualenv/build dirs to speed up
+    return any(sk in base.lower().split(os.sep) for sk in SKIP_DIRS)
+
+
+def is_scanned_file(name: str) -> bool:
+    # Exclude documentation files from content scanning to avoid false positives
+    return os.path.splitext(name)[1].lower() not in EXCLUDED_EXTENSIONS
+
+
 def walk_files(root: str) -> List[str]:
     files: List[str] = []
     for base, _, fnames in os.walk(root):
-        # Skip common virtualenv/build dirs to speed up
-        if any(sk in base.lower().split(os.sep) for sk in {".git", "__pycache__", "node_modules", "venv", ".venv", "site-packages", "dist", "build"}):
+        if is_skipped_dir(base):
             continue
         for f in fnames:
-            # Exclude documentation files from content scanning to avoid false positives
-            if os.path.splitext(f)[1].lower() in EXCLUDED_EXTENSIONS:
-                continue
-            files.append(os.path.join(base, f))
+            if is_scanned_file(f):
+                files.append(os.path.join(base, f))
     return files
 
 
@@ -143,67 +174,77 @@ def analyze_dockerfile(text: str) -> Dict[str, object]:
     }
 
 
-def scan(root: str) -> Dict[str, object]:
-    files = walk_files(root)
-
-    dockerfiles = [p for p in files if os.path.basename(p) in DOCKERFILE_NAMES]
-    compose_files = [p for p in files if os.path.basename(p) in COMPOSE_NAMES]
-
-    docker_results = [analyze_dockerfile(load_text(p)) for p in dockerfiles]
+def analyze_file(path: str, root: str) -> Dict[str, object]:
+    """Findings of one file, read once; aggregate() combines them into the report."""
+    base = os.path.basename(path)
+    text = load_text(path)
+    result: Dict[str, object] = {
+        "path": path,
+        "rel": os.path.relpath(path, root),
+        "base": base,
+        "dockerfile": analyze_dockerfile(text) if base in DOCKERFILE_NAMES else None,
+        "secrets": [],
+        "db": [],
+        "scanner": False,
+    }
+    if not text:
+        return result
+    if not base.lower().endswith(BINARY_SUFFIXES):
+        for pat in SECRET_PATTERNS:
+            m = pat.search(text)  # one hit per pattern per file is enough
+            if m:
+                snippet = text[max(0, m.start()-20): m.end()+20]
+                result["secrets"].append(snippet.replace('\n', ' '))
+    if GRANT_ALL.search(text):
+        result["db"].append("GRANT ALL PRIVILEGES *.* usage")
+    if WILDCARD_HOST.search(text):
+        result["db"].append("Wildcard host in DB user '@%'")
+    result["scanner"] = any(pat.search(text) for pat in SCANNER_MENTIONS)
+    return result
+
+
+def letter(score: float) -> str:
+    if score >= 9.0:
+        return "A+"
+    if score >= 8.0:
+        return "A"
+    if score >= 7.0:
+        return "B"
+    if score >= 6.0:
+        return "C"
+    if score >= 5.0:
+        return "D"
+    return "E"
+
+
+def aggregate(root: str, analyses: List[Dict[str, object]]) -> Dict[str, object]:
+    """Scores, details and recommendations from analyze_file() results (in walk order)."""
+    dockerfiles = [a for a in analyses if a["base"] in DOCKERFILE_NAMES]
+    compose_files = [a["rel"] for a in analyses if a["base"] in COMPOSE_NAMES]
+
+    docker_results = [a["dockerfile"] for a in dockerfiles]
     docker_score = 10 if docker_results else 5  # neutral if none found
     docker_notes: List[str] = []
     if docker_results:
         docker_score = int(sum(d["score"] for d in docker_results) / len(docker_results))
-        for i, res in enumerate(docker_results):
-            prefix = f"[{os.path.relpath(dockerfiles[i], root)}] "
-            docker_notes.extend(prefix + n for n in res["notes"]) 
+        for a in dockerfiles:
+            prefix = f"[{a['rel']}] "
+            docker_notes.extend(prefix + n for n in a["dockerfile"]["notes"])
 
     # Secrets scanning
-    secret_findings: List[Tuple[str, str]] = []
-    for p in files:
-        name = os.path.basename(p).lower()
-        if name.endswith(('.png', '.jpg', '.jpeg', '.gif', '.pdf', '.zip', '.tar', '.gz', '.7z', '.rar', '.pyc')):
-            continue
-        text = load_text(p)
-        if not text:
-            continue
-        for pat in SECRET_PATTERNS:
-            for m in pat.finditer(text):
-                snippet = text[max(0, m.start()-20): m.end()+20]
-                secret_findings.append((os.path.relpath(p, root), snippet.replace('\n', ' ')))
-                break  # one hit per pattern per file is enough
+    secret_findings: List[Tuple[str, str]] = [(a["rel"], s) for a in analyses for s in a["secrets"]]
     # Score: start at 10, penalize by number of distinct files with hits
     secret_files = {f for f, _ in secret_findings}
     secrets_score = max(0, 10 - min(10, len(secret_files) * 2))
 
     # Database practices
-    db_findings: List[Tuple[str, str]] = []
-    grant_all = re.compile(r"GRANT\s+ALL\s+PRIVILEGES\s+ON\s+\*\.\*", re.I)
-    wildcard_host = re.compile(r"'[^']*'@'[^']*%'")
-    for p in files:
-        text = load_text(p)
-        if not text:
-            continue
-        if grant_all.search(text) or wildcard_host.search(text):
-            for m in grant_all.finditer(text):
-                db_findings.append((os.path.relpath(p, root), "GRANT ALL PRIVILEGES *.* usage"))
-                break
-            for m in wildcard_host.finditer(text):
-                db_findings.append((os.path.relpath(p, root), "Wildcard host in DB user '@%'") )
-                break
+    db_findings: List[Tuple[str, str]] = [(a["rel"], d) for a in analyses for d in a["db"]]
     db_score = max(0, 10 - min(10, len({f for f, _ in db_findings}) * 3))
 
     # CI/Scanning evidence
-    ci_files = [p for p in files if any(part in p for part in (os.sep + ".github" + os.sep, os.sep + ".gitlab-ci.yml"))]
-    scanner_mentions = []
-    for p in files:
-        text = load_text(p)
-        if not text:
-            continue
-        for pat in SCANNER_MENTIONS:
-            if pat.search(text):
-                scanner_mentions.append(os.path.relpath(p, root))
-                break
+    ci_files = [a["rel"] for a in analyses
+                if any(part in a["path"] for part in (os.sep + ".github" + os.sep, os.sep + ".gitlab-ci.yml"))]
+    scanner_mentions = [a["rel"] for a in analyses if a["scanner"]]
     ci_score = 5
     if ci_files:
         ci_score += 3
@@ -214,19 +255,19 @@ def scan(root: str) -> Dict[str, object]:
     # Repo hygiene - expanded checks
     hygiene_hits: List[str] = []
     security_files: List[str] = []
-    
-    for p in files:
-        base = os.path.basename(p).lower()
+
+    for a in analyses:
+        base = a["base"].lower()
         if base == ".env" or base.endswith(".env"):
-            hygiene_hits.append(os.path.relpath(p, root))
+            hygiene_hits.append(a["rel"])
         # Check for security-related files
         if base in {".dockerignore", ".gitignore", "security.md", "security.txt", ".security.yml"}:
-            security_files.append(os.path.relpath(p, root))
-    
+            security_files.append(a["rel"])
+
     # Check for .gitignore presence
-    has_gitignore = any(os.path.basename(p) == ".gitignore" for p in files)
-    has_dockerignore = any(os.path.basename(p) == ".dockerignore" for p in files)
-    
+    has_gitignore = any(a["base"] == ".gitignore" for a in analyses)
+    has_dockerignore = any(a["base"] == ".dockerignore" for a in analyses)
+
     hygiene_score = 10
     if hygiene_hits:
         hygiene_score -= min(6, len(hygiene_hits) * 2)
@@ -253,19 +294,6 @@ def scan(root: str) -> Dict[str, object]:
     )
     overall = round(overall, 1)
 
-    def letter(score: float) -> str:
-        if score >= 9.0:
-            return "A+"
-        if score >= 8.0:
-            return "A"
-        if score >= 7.0:
-            return "B"
-        if score >= 6.0:
-            return "C"
-        if score >= 5.0:
-            return "D"
-        return "E"
-
     recs: List[str] = []
     if docker_notes:
         recs.extend(sorted(set(docker_notes)))
@@ -282,7 +310,7 @@ def scan(root: str) -> Dict[str, object]:
         recs.append("📝 Missing .gitignore file; add one to prevent committing sensitive files.")
     if not has_dockerignore and dockerfiles:
         recs.append("🐳 Missing .dockerignore file; add one to reduce build context size.")
-    
+
     # Priority recommendations based on score
     if overall < 5.0:
         recs.insert(0, "🚨 URGENT: Project has critical security issues that need immediate attention!")
@@ -302,61 +330,567 @@ def scan(root: str) -> Dict[str, object]:
         },
         "details": {
             "dockerfiles": docker_results,
-            "dockerfile_paths": [os.path.relpath(p, root) for p in dockerfiles],
-            "compose_files": [os.path.relpath(p, root) for p in compose_files],
+            "dockerfile_paths": [a["rel"] for a in dockerfiles],
+            "compose_files": compose_files,
             "secret_findings": secret_findings,
             "db_findings": db_findings,
-            "ci_files": [os.path.relpath(p, root) for p in ci_files],
+            "ci_files": ci_files,
             "scanner_mentions": sorted(set(scanner_mentions)),
             "hygiene_hits": hygiene_hits,
             "security_files": security_files,
             "has_gitignore": has_gitignore,
             "has_dockerignore": has_dockerignore,
-            "total_files_scanned": len(files),
+            "total_files_scanned": len(analyses),
         },
         "recommendations": recs,
     }
     return results
 
 
+def scan(root: str) -> Dict[str, object]:
+    return aggregate(root, [analyze_file(p, root) for p in walk_files(root)])
+
+
+def format_text(res: Dict[str, object]) -> str:
+    s = res["scores"]
+    lines = [
+        f"🔍 Project: {res['path']}",
+        f"📁 Files scanned: {res['details']['total_files_scanned']}",
+        "\n📊 Security Scores (0-10):",
+        f"  🐳 Docker:     {s['docker']}/10",
+        f"  🔐 Secrets:    {s['secrets']}/10",
+        f"  🗄️  Database:   {s['database']}/10",
+        f"  🔄 CI/Scan:    {s['ci']}/10",
+        f"  🧹 Hygiene:    {s['hygiene']}/10",
+        f"\n🎯 Overall Score: {s['overall']}/10 (Grade: {s['grade']})",
+        "",
+    ]
+    if res["recommendations"]:
+        lines.append("Recommendations:")
+        lines.extend(f"- {r}" for r in res["recommendations"])
+    else:
+        lines.append("No recommendations. Good job!")
+
+    # Show a small summary list of Dockerfiles analyzed
+    if res["details"]["dockerfile_paths"]:
+        lines.append("\nDockerfiles analyzed:")
+        lines.extend(f"- {p}" for p in res["details"]["dockerfile_paths"])
+    return "\n".join(lines)
+
+
+# --- Watch mode ---
+#
+# `--watch` scans once, then keeps every file's analyze_file() result in
+# memory and only re-analyses files that changed. Changes come from inotify
+# (through ctypes, Linux only) or, where that is unavailable, from polling
+# mtimes every --poll-interval seconds. After each batch of changes the
+# report is re-aggregated (cheap: no file is read) and served on a Unix
+# socket, so editors and pre-commit hooks get it instantly with
+# `scan_and_rate.py --query [text|json|scores]`.
+
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+# Events arriving within this many seconds of each other are handled together.
+DEBOUNCE = 0.2
+
+
+def default_socket_path(root: str) -> str:
+    digest = hashlib.sha1(os.path.abspath(root).encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"scan_and_rate-{os.getuid()}-{digest}.sock")
+
+
+class Inotify:
+    """Recursive directory watch via the inotify syscalls; reports changed paths."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm = libc.inotify_rm_watch
+        self._rm.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: Dict[int, str] = {}
+
+    def add_tree(self, top: str) -> None:
+        for base, dirnames, _ in os.walk(top):
+            if is_skipped_dir(base):
+                dirnames[:] = []
+                continue
+            wd = self._add(self.fd, os.fsencode(base), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err == errno.ENOSPC:
+                    raise OSError(err, "inotify watch limit reached (fs.inotify.max_user_watches)")
+                continue  # vanished or unreadable
+            self.dirs[wd] = base
+
+    def read(self, timeout: float) -> Tuple[Set[str], Set[str], bool]:
+        """(changed paths, new directories, overflowed) seen within `timeout` seconds."""
+        changed: Set[str] = set()
+        new_dirs: Set[str] = set()
+        overflow = False
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        while ready:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                data = b""
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + EVENT_HEADER.size: offset + EVENT_HEADER.size + length].rstrip(b"\0")
+                offset += EVENT_HEADER.size + length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                base = self.dirs.get(wd)
+                if base is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self.dirs[wd]
+                    continue
+                path = os.path.join(base, os.fsdecode(name)) if name else base
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        new_dirs.add(path)
+                    elif mask & (IN_DELETE | IN_MOVED_FROM):
+                        changed.add(path + os.sep)  # everything below it is gone
+                elif name:
+                    changed.add(path)
+            # Keep collecting while events keep coming, so one save = one rescan.
+            ready, _, _ = select.select([self.fd], [], [], DEBOUNCE)
+        for path in new_dirs:
+            self.add_tree(path)
+        return changed, new_dirs, overflow
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class Poller:
+    """mtime/size polling fallback with the same read() interface as Inotify."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.stamps = self._stamps()
+
+    def _stamps(self) -> Dict[str, Tuple[int, int]]:
+        stamps = {}
+        for path in walk_files(self.root):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            stamps[path] = (st.st_mtime_ns, st.st_size)
+        return stamps
+
+    def read(self, timeout: float) -> Tuple[Set[str], Set[str], bool]:
+        time.sleep(timeout)
+        stamps = self._stamps()
+        changed = {p for p in stamps.keys() | self.stamps.keys() if stamps.get(p) != self.stamps.get(p)}
+        self.stamps = stamps
+        return changed, set(), False
+
+    def close(self) -> None:
+        pass
+
+
+class Watcher:
+    """Per-file results of one root, kept current by applying changed paths."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.results: Dict[str, Dict[str, object]] = {}
+        self.lock = threading.Lock()
+        self.report: Dict[str, object] = {}
+        self.text = ""
+        self.generation = 0
+        self.full_rescan()
+
+    def _wanted(self, path: str) -> bool:
+        return (os.path.isfile(path) and is_scanned_file(os.path.basename(path))
+                and not is_skipped_dir(os.path.dirname(path)))
+
+    def full_rescan(self) -> int:
+        self.results = {p: analyze_file(p, self.root) for p in walk_files(self.root)}
+        self._publish()
+        return len(self.results)
+
+    def apply(self, changed: Set[str], new_dirs: Set[str]) -> int:
+        """Re-analyses changed files and drops deleted ones; returns how many entries changed."""
+        touched = 0
+        for path in changed:
+            if path.endswith(os.sep):
+                gone = [p for p in self.results if p.startswith(path)]
+                for p in gone:
+                    del self.results[p]
+                touched += len(gone)
+            elif self._wanted(path):
+                self.results[path] = analyze_file(path, self.root)
+                touched += 1
+            elif self.results.pop(path, None) is not None:
+                touched += 1
+        for top in new_dirs:
+            for path in walk_files(top):
+                if not is_skipped_dir(os.path.dirname(path)):
+                    self.results[path] = analyze_file(path, self.root)
+                    touched += 1
+        if touched:
+            self._publish()
+        return touched
+
+    def _publish(self) -> None:
+        # Sorted, so the report does not depend on the order changes arrived in.
+        report = aggregate(self.root, [self.results[p] for p in sorted(self.results)])
+        text = format_text(report)
+        with self.lock:
+            self.report, self.text = report, text
+            self.generation += 1
+
+    def answer(self, command: str) -> str:
+        with self.lock:
+            if command == "json":
+                return json.dumps(self.report, indent=2)
+            if command == "scores":
+                return json.dumps({**self.report.get("scores", {}), "generation": self.generation})
+            return self.text
+
+
+def serve_reports(watcher: Watcher, socket_path: str) -> socketserver.BaseServer:
+    """Starts a thread answering one command line per connection on a Unix socket."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            command = self.rfile.readline(64).decode("ascii", "ignore").strip() or "text"
+            self.wfile.write(watcher.answer(command).encode() + b"\n")
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+    server.daemon_threads = True
+    os.chmod(socket_path, 0o600)
+    threading.Thread(target=server.serve_forever, name="report-server", daemon=True).start()
+    return server
+
+
+def query(socket_path: str, command: str) -> int:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(command.encode() + b"\n")
+            chunks = []
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                chunks.append(data)
+    except OSError as exc:
+        print(f"No watcher on {socket_path}: {exc}", file=sys.stderr)
+        return 2
+    sys.stdout.write(b"".join(chunks).decode())
+    return 0
+
+
+def watch(root: str, socket_path: str, poll_interval: float, force_poll: bool = False) -> int:
+    started = time.perf_counter()
+    watcher = Watcher(root)
+    print(f"Scanned {len(watcher.results)} files in {time.perf_counter() - started:.2f}s; "
+          f"overall {watcher.report['scores']['overall']}/10", file=sys.stderr)
+    source = None
+    if not force_poll:
+        try:
+            source = Inotify()
+            source.add_tree(root)
+            mode = "inotify"
+        except (OSError, AttributeError) as exc:
+            if source is not None:
+                source.close()
+            source = None
+            print(f"inotify unavailable ({exc}); polling instead", file=sys.stderr)
+    if source is None:
+        source = Poller(root)
+        mode = f"polling every {poll_interval}s"
+    server = serve_reports(watcher, socket_path)
+    print(f"Watching {root} ({mode}); reports on {socket_path}", file=sys.stderr)
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        while not stop.is_set():
+            changed, new_dirs, overflow = source.read(poll_interval if isinstance(source, Poller) else 1.0)
+            started = time.perf_counter()
+            if overflow:
+                touched = watcher.full_rescan()
+            else:
+                touched = watcher.apply(changed, new_dirs)
+            if touched:
+                scores = watcher.report["scores"]
+                print(f"Rescanned {touched} file(s) in {time.perf_counter() - started:.3f}s; "
+                      f"overall {scores['overall']}/10 ({scores['grade']})", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        server.server_close()
+        source.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+    return 0
+
+
+# --- Batch mode ---
+#
+# `--batch` scans many roots in one process: a multiprocessing pool (rules
+# compiled once per worker) takes one root per task, so memory is bounded by
+# the largest repository rather than the fleet, and each result is written
+# to a SQLite store as it arrives. `--trend` and `--history` query that
+# store across runs.
+
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    roots INTEGER NOT NULL DEFAULT 0,
+    files INTEGER NOT NULL DEFAULT 0,
+    seconds REAL
+);
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    root TEXT NOT NULL,
+    files INTEGER,
+    docker INTEGER,
+    secrets INTEGER,
+    database INTEGER,
+    ci INTEGER,
+    hygiene INTEGER,
+    overall REAL,
+    grade TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS scans_root_run ON scans(root, run_id);
+CREATE TABLE IF NOT EXISTS findings (
+    scan_id INTEGER NOT NULL REFERENCES scans(id),
+    category TEXT NOT NULL,
+    file TEXT NOT NULL,
+    detail TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS findings_scan ON findings(scan_id);
+"""
+SCORE_COLUMNS = ("docker", "secrets", "database", "ci", "hygiene", "overall", "grade")
+
+
+def scan_root(root: str) -> Dict[str, object]:
+    """scan() for a pool worker: errors are returned, not raised, so one bad root does not stop the batch."""
+    if not os.path.isdir(root):
+        return {"path": root, "error": "not a directory"}
+    try:
+        return scan(root)
+    except Exception as exc:  # keep going; the error is stored with the root
+        return {"path": root, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def findings_of(res: Dict[str, object]) -> List[Tuple[str, str, str]]:
+    details = res["details"]
+    rows = [("secret", f, snippet) for f, snippet in details["secret_findings"]]
+    rows += [("database", f, message) for f, message in details["db_findings"]]
+    for path, result in zip(details["dockerfile_paths"], details["dockerfiles"]):
+        rows += [("dockerfile", path, note) for note in result["notes"]]
+    rows += [("hygiene", f, ".env file") for f in details["hygiene_hits"]]
+    return rows
+
+
+class ResultStore:
+    """SQLite file holding one row per (run, root) plus that scan's findings."""
+
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(STORE_SCHEMA)
+
+    def start_run(self) -> int:
+        with self.db:
+            cur = self.db.execute("INSERT INTO runs (started_at) VALUES (?)", (now_iso(),))
+        return cur.lastrowid
+
+    def add(self, run_id: int, res: Dict[str, object]) -> None:
+        with self.db:
+            if "error" in res:
+                self.db.execute("INSERT INTO scans (run_id, root, error) VALUES (?, ?, ?)",
+                                (run_id, res["path"], res["error"]))
+                return
+            scores = res["scores"]
+            cur = self.db.execute(
+                f"INSERT INTO scans (run_id, root, files, {', '.join(SCORE_COLUMNS)}) "
+                f"VALUES (?, ?, ?, {', '.join('?' * len(SCORE_COLUMNS))})",
+                (run_id, res["path"], res["details"]["total_files_scanned"], *(scores[c] for c in SCORE_COLUMNS)),
+            )
+            self.db.executemany(
+                "INSERT INTO findings (scan_id, category, file, detail) VALUES (?, ?, ?, ?)",
+                [(cur.lastrowid, *row) for row in findings_of(res)],
+            )
+
+    def finish_run(self, run_id: int, roots: int, files: int, seconds: float) -> None:
+        with self.db:
+            self.db.execute("UPDATE runs SET finished_at = ?, roots = ?, files = ?, seconds = ? WHERE id = ?",
+                            (now_iso(), roots, files, round(seconds, 3), run_id))
+
+    def trend(self, limit: int = 20) -> List[Tuple]:
+        """(root, previous overall, latest overall, change) for roots scanned in at least one run, worst change first."""
+        return self.db.execute("""
+            WITH ranked AS (
+                SELECT root, overall, run_id,
+                       ROW_NUMBER() OVER (PARTITION BY root ORDER BY run_id DESC) AS n
+                FROM scans WHERE error IS NULL
+            )
+            SELECT latest.root, previous.overall, latest.overall,
+                   ROUND(latest.overall - COALESCE(previous.overall, latest.overall), 1) AS change
+            FROM ranked latest LEFT JOIN ranked previous ON previous.root = latest.root AND previous.n = 2
+            WHERE latest.n = 1
+            ORDER BY change, latest.overall, latest.root
+            LIMIT ?
+        """, (limit,)).fetchall()
+
+    def history(self, root: str, limit: int = 20) -> List[Tuple]:
+        return self.db.execute(f"""
+            SELECT runs.started_at, {', '.join('scans.' + c for c in SCORE_COLUMNS)}, scans.files, scans.error,
+                   (SELECT COUNT(*) FROM findings WHERE findings.scan_id = scans.id)
+            FROM scans JOIN runs ON runs.id = scans.run_id
+            WHERE scans.root = ? ORDER BY scans.run_id DESC LIMIT ?
+        """, (root, limit)).fetchall()
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def now_iso() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def read_roots(paths: List[str], roots_file: str = None) -> List[str]:
+    """Absolute, de-duplicated roots from the command line and/or a file (one per line, '-' for stdin)."""
+    roots = list(paths)
+    if roots_file:
+        fh = sys.stdin if roots_file == "-" else open(roots_file, encoding="utf-8")
+        with fh:
+            roots += [line.strip() for line in fh if line.strip() and not line.lstrip().startswith("#")]
+    return list(dict.fromkeys(os.path.abspath(r) for r in roots))
+
+
+def batch(roots: List[str], db_path: str, jobs: int) -> int:
+    store = ResultStore(db_path)
+    run_id = store.start_run()
+    started = time.perf_counter()
+    files = failed = 0
+    try:
+        with multiprocessing.Pool(jobs, maxtasksperchild=100) as pool:
+            for res in pool.imap_unordered(scan_root, roots):
+                store.add(run_id, res)
+                if "error" in res:
+                    failed += 1
+                    print(f"ERROR  {res['path']}: {res['error']}")
+                    continue
+                files += res["details"]["total_files_scanned"]
+                s = res["scores"]
+                print(f"{s['grade']:<3} {s['overall']:>4}  {res['path']} ({res['details']['total_files_scanned']} files)")
+    finally:
+        seconds = time.perf_counter() - started
+        store.finish_run(run_id, len(roots), files, seconds)
+        store.close()
+    print(f"Run {run_id}: {len(roots)} roots, {files} files in {seconds:.1f}s; {failed} failed; stored in {db_path}",
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+def print_trend(db_path: str, limit: int) -> int:
+    store = ResultStore(db_path)
+    rows = store.trend(limit)
+    store.close()
+    print(f"{'previous':>8} {'latest':>6} {'change':>6}  root")
+    for root, previous, latest, change in rows:
+        prev = "-" if previous is None else f"{previous:.1f}"
+        print(f"{prev:>8} {latest:>6.1f} {change:>+6.1f}  {root}")
+    return 0
+
+
+def print_history(db_path: str, root: str, limit: int) -> int:
+    store = ResultStore(db_path)
+    rows = store.history(os.path.abspath(root), limit)
+    store.close()
+    print(f"{'run started':<19} {'docker':>6} {'secr':>4} {'db':>3} {'ci':>3} {'hyg':>3} {'overall':>7} "
+          f"{'grade':<5} {'files':>6} {'finds':>5}")
+    for started, docker, secrets, database, ci, hygiene, overall, grade, files, error, finds in rows:
+        if error:
+            print(f"{started:<19} error: {error}")
+            continue
+        print(f"{started:<19} {docker:>6} {secrets:>4} {database:>3} {ci:>3} {hygiene:>3} {overall:>7} "
+              f"{grade:<5} {files:>6} {finds:>5}")
+    return 0
+
+
 def main(argv: List[str]) -> int:
     import argparse
     parser = argparse.ArgumentParser(description="Scan project and rate basic security hygiene.")
-    parser.add_argument("path", nargs="?", default=".", help="Path to project root")
+    parser.add_argument("path", nargs="*", default=["."], help="Path to project root (several with --batch)")
     parser.add_argument("--json", action="store_true", help="Output JSON instead of text")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running, rescan changed files and serve the report on a Unix socket")
+    parser.add_argument("--query", nargs="?", const="text", choices=("text", "json", "scores"),
+                        help="Print the report of a running --watch for this path and exit")
+    parser.add_argument("--socket", help="Unix socket for --watch/--query (default: one per path in the temp dir)")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between polls without inotify")
+    parser.add_argument("--poll", action="store_true", help="Poll mtimes even where inotify is available")
+    parser.add_argument("--batch", action="store_true", help="Scan every given root and store results in --db")
+    parser.add_argument("--roots-file", help="File with one root per line for --batch ('-' for stdin)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes for --batch")
+    parser.add_argument("--db", default="scan_results.sqlite3", help="SQLite results store (default: %(default)s)")
+    parser.add_argument("--trend", action="store_true", help="Show each root's latest score change across runs")
+    parser.add_argument("--history", metavar="PATH", help="Show the stored runs of one root")
+    parser.add_argument("--limit", type=int, default=20, help="Rows shown by --trend/--history")
     args = parser.parse_args(argv)
 
-    root = os.path.abspath(args.path)
+    if args.trend:
+        return print_trend(args.db, args.limit)
+    if args.history:
+        return print_history(args.db, args.history, args.limit)
+    if args.batch:
+        roots = read_roots([] if args.roots_file and args.path == ["."] else args.path, args.roots_file)
+        return batch(roots, args.db, max(1, args.jobs))
+    if len(args.path) > 1:
+        parser.error("several paths need --batch")
+
+    root = os.path.abspath(args.path[0])
+    socket_path = args.socket or default_socket_path(root)
+    if args.query:
+        return query(socket_path, args.query)
+    if args.watch:
+        return watch(root, socket_path, args.poll_interval, force_poll=args.poll)
+
     res = scan(root)
 
     if args.json:
         print(json.dumps(res, indent=2))
         return 0
 
-    s = res["scores"]
-    print(f"🔍 Project: {res['path']}")
-    print(f"📁 Files scanned: {res['details']['total_files_scanned']}")
-    print("\n📊 Security Scores (0-10):")
-    print(f"  🐳 Docker:     {s['docker']}/10")
-    print(f"  🔐 Secrets:    {s['secrets']}/10")
-    print(f"  🗄️  Database:   {s['database']}/10")
-    print(f"  🔄 CI/Scan:    {s['ci']}/10")
-    print(f"  🧹 Hygiene:    {s['hygiene']}/10")
-    print(f"\n🎯 Overall Score: {s['overall']}/10 (Grade: {s['grade']})")
-    print()
-    if res["recommendations"]:
-        print("Recommendations:")
-        for r in res["recommendations"]:
-            print(f"- {r}")
-    else:
-        print("No recommendations. Good job!")
-
-    # Show a small summary list of Dockerfiles analyzed
-    if res["details"]["dockerfile_paths"]:
-        print("\nDockerfiles analyzed:")
-        for p in res["details"]["dockerfile_paths"]:
-            print(f"- {p}")
-
+    print(format_text(res))
     return 0
 
 
@@ -103,17 +103,33 @@ echo "===================================="
 echo "⏳ Waiting for database to be ready..."
 sleep 5
 
-# Make migrations
-echo "📄 Making migrations..."
-python3 manage.py makemigrations
+# Make migrations (dev only: stage/prod images ship their migrations)
+if [ "${DJANGO_STAGE:-dev}" = "dev" ]; then
+    echo "📄 Making migrations..."
+    python3 manage.py makemigrations
+fi
+
+# Apply migrations, unless the stored fingerprint says nothing changed since
+# the last run (checked without starting Django; see Playground/migration_state.py)
+if python3 -m Playground.migration_state; then
+    echo "⚡ Migrations up to date"
+else
+    echo "⚡ Applying migrations..."
+    python3 manage.py migrate_if_needed --force
+fi
 
-# Apply migrations
-echo "⚡ Applying migrations..."
-python3 manage.py migrate
+# Pre-render static pages for stage/prod (served without template rendering)
+if [ "${DJANGO_STAGE:-dev}" = "stage" ] || [ "${DJANGO_STAGE:-dev}" = "prod" ]; then
+    echo "🖨️  Pre-rendering static pages..."
+    python3 manage.py prerender
+fi
 
-# Collect static files (optional, uncomment if needed)
-# echo "📦 Collecting static files..."
-# python3 manage.py collectstatic --noinput
+# Collect static files for stage/prod: their default "web" app profile leaves
+# out django.contrib.staticfiles, so /static/ is served from STATIC_ROOT.
+if [ "${DJANGO_STAGE:-dev}" = "stage" ] || [ "${DJANGO_STAGE:-dev}" = "prod" ]; then
+    echo "📦 Collecting static files..."
+    DJANGO_APP_PROFILE=full python3 manage.py collectstatic --noinput
+fi
 
 echo "===================================="
 echo "🌐 Starting Django development server..."
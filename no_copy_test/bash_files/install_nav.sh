@@ -62,6 +62,15 @@ install_nav() {
     # Clean up
     rm -f "$temp_script"
 
+    # Python tree renderer used by `nav -l` (falls back to the shell version without it)
+    if [ -f "nav_tree.py" ]; then
+        if sudo cp nav_tree.py /usr/local/bin/nav-tree && sudo chmod +x /usr/local/bin/nav-tree; then
+            echo -e "${GREEN}✓ nav-tree installed${NC}"
+        else
+            echo -e "${YELLOW}⚠ Could not install nav-tree; nav -l will use the shell renderer${NC}"
+        fi
+    fi
+
     # Add to shell config
     for rcfile in ~/.bashrc ~/.zshrc; do
         if [ -f "$rcfile" ] && ! grep -q "source /usr/local/bin/nav" "$rcfile"; then
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Tree listing for `nav -l`, same colours and icons as navigate.sh's
+_print_tree, without a subshell per entry.
+
+    nav-tree [dir] [-L DEPTH] [-I PATTERN ...] [--cache] [--no-color]
+
+- One os.scandir() per directory; file types come from the directory entry
+  itself, and only regular files are stat'ed (for the executable bit).
+- -I/--ignore takes fnmatch patterns matched against entry names
+  (repeatable; NAV_TREE_IGNORE adds comma separated defaults).
+- --cache keeps a snapshot in ~/.cache/nav (NAV_TREE_CACHE_DIR) and only
+  rescans directories whose mtime changed since. A chmod +x alone does
+  not change the directory mtime, so the executable colour can lag until
+  the next change in that directory.
+- Symlinked directories are followed once; loops are not re-entered.
+- Entries are ordered like `ls -A` under the current LC_COLLATE (plain
+  byte order in the C locale), as navigate.sh listed them.
+"""
+import argparse
+import fnmatch
+import hashlib
+import locale
+import os
+import pickle
+import sys
+
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+BLUE = '\033[0;34m'
+CYAN = '\033[0;36m'
+PURPLE = '\033[0;35m'
+RED = '\033[0;31m'
+ORANGE = '\033[38;5;208m'
+BRIGHT_BLUE = '\033[1;96m'
+NC = '\033[0m'
+
+ARCHIVES = ('.zip', '.tar', '.gz', '.bz2', '.xz', '.7z', '.rar')
+SUFFIX_COLORS = [
+    (ARCHIVES, RED),
+    (('.sh', '.bash', '.zsh'), GREEN),
+    (('.py',), CYAN),
+    (('.js', '.jsx', '.ts', '.tsx'), YELLOW),
+    (('.html', '.htm'), PURPLE),
+    (('.css', '.scss', '.sass'), BLUE),
+    (('.json', '.yaml', '.yml'), YELLOW),
+]
+
+DIR, EXECUTABLE, FILE = 'd', 'x', 'f'
+
+CACHE_VERSION = 2
+
+
+def style(name, kind, top_level):
+    """(colour, icon) exactly as navigate.sh picks them."""
+    if kind == DIR:
+        return (BRIGHT_BLUE if top_level else BLUE), '📁'
+    if kind == EXECUTABLE:
+        return ORANGE, '⚡'
+    for suffixes, color in SUFFIX_COLORS:
+        if name.endswith(suffixes):
+            return color, ('🗜️' if suffixes is ARCHIVES else '📄')
+    return NC, '📄'
+
+
+def collation_key(entry):
+    """Sort key for (name, kind): the locale's collation, as `ls` sorts."""
+    name = entry[0]
+    try:
+        return locale.strxfrm(name), name
+    except (ValueError, UnicodeError):
+        # Undecodable or NUL-containing names; `ls` falls back to bytes as well.
+        return name, name
+
+
+def scan_dir(path):
+    """[(name, kind)] for one directory, in collation order; unreadable directories are empty."""
+    entries = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        kind = DIR
+                    elif entry.is_file() and entry.stat().st_mode & 0o111:
+                        kind = EXECUTABLE
+                    else:
+                        kind = FILE
+                except OSError:
+                    kind = FILE
+                entries.append((entry.name, kind))
+    except OSError:
+        return []
+    entries.sort(key=collation_key)
+    return entries
+
+
+class Snapshot:
+    """Directory listings keyed by path, each stored with the directory's mtime."""
+
+    def __init__(self, dirs=None):
+        self.dirs = dirs or {}
+        self.rescanned = 0
+
+    def listing(self, path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return []
+        cached = self.dirs.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        entries = scan_dir(path)
+        self.dirs[path] = (mtime, entries)
+        self.rescanned += 1
+        return entries
+
+
+def cache_file(root):
+    """Snapshot path for `root`; listings are stored sorted, so the collation locale is part of the key."""
+    base = os.environ.get('NAV_TREE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'nav'))
+    key = f'{root}\0{locale.setlocale(locale.LC_COLLATE)}'
+    return os.path.join(base, hashlib.sha1(key.encode('utf-8', 'surrogateescape')).hexdigest() + '.pickle')
+
+
+def load_snapshot(root):
+    try:
+        with open(cache_file(root), 'rb') as fh:
+            version, dirs = pickle.load(fh)
+        if version == CACHE_VERSION:
+            return Snapshot(dirs)
+    except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+        pass
+    return Snapshot()
+
+
+def save_snapshot(root, snapshot, visited=None):
+    """Writes the snapshot; with `visited`, directories outside that walk (deleted ones) are dropped."""
+    dirs = snapshot.dirs
+    if visited is not None:
+        dirs = {path: value for path, value in dirs.items() if path in visited}
+    target = cache_file(root)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmp = f'{target}.{os.getpid()}'
+    with open(tmp, 'wb') as fh:
+        pickle.dump((CACHE_VERSION, dirs), fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, target)
+
+
+def render(root, listing, max_depth=None, ignore=(), color=True):
+    """Returns (lines, visited directory paths) for the tree under `root`."""
+    lines = []
+    visited = set()
+    seen_inodes = set()
+
+    def ignored(name):
+        return any(fnmatch.fnmatch(name, pattern) for pattern in ignore)
+
+    def walk(path, prefix, depth):
+        visited.add(path)
+        try:
+            st = os.stat(path)
+            key = (st.st_dev, st.st_ino)
+        except OSError:
+            return
+        if key in seen_inodes:
+            return
+        seen_inodes.add(key)
+        entries = [(n, k) for n, k in listing(path) if not (ignore and ignored(n))]
+        last = len(entries) - 1
+        for index, (name, kind) in enumerate(entries):
+            branch, extension = ('└── ', '    ') if index == last else ('├── ', '│   ')
+            if color:
+                col, icon = style(name, kind, depth == 1)
+                lines.append(f'{prefix}{branch}{col}{icon} {name}{NC}')
+            else:
+                lines.append(f'{prefix}{branch}{style(name, kind, False)[1]} {name}')
+            if kind == DIR and (max_depth is None or depth < max_depth):
+                walk(os.path.join(path, name), prefix + extension, depth + 1)
+
+    walk(root, '', 1)
+    return lines, visited
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='nav-tree', description='Print a directory tree.')
+    parser.add_argument('dir', nargs='?', default='.')
+    parser.add_argument('-L', '--depth', type=int, default=None, help='Descend at most DEPTH levels')
+    parser.add_argument('-I', '--ignore', action='append', default=[], metavar='PATTERN',
+                        help='Skip entries whose name matches this glob (repeatable)')
+    parser.add_argument('--cache', action='store_true', help='Reuse and update the cached snapshot')
+    parser.add_argument('--no-color', action='store_true', help='Plain output (also when NO_COLOR is set)')
+    args = parser.parse_args(argv)
+    try:
+        locale.setlocale(locale.LC_COLLATE, '')
+    except locale.Error:
+        pass  # An unknown LANG/LC_* value; ls falls back to the C locale too.
+
+    root = args.dir
+    if not os.path.isdir(root):
+        print(f'{YELLOW}Error: Directory does not exist{NC}', file=sys.stderr)
+        return 1
+    ignore = args.ignore + [p for p in os.environ.get('NAV_TREE_IGNORE', '').split(',') if p]
+    color = not (args.no_color or os.environ.get('NO_COLOR'))
+
+    abs_root = os.path.realpath(root)
+    snapshot = load_snapshot(abs_root) if args.cache else Snapshot()
+    # Walk with absolute paths when caching so the snapshot is cwd-independent.
+    lines, visited = render(abs_root if args.cache else root, snapshot.listing,
+                            max_depth=args.depth, ignore=ignore, color=color)
+    if args.cache and snapshot.rescanned:
+        # Only a full walk knows which cached directories no longer exist.
+        full_walk = args.depth is None and not ignore
+        save_snapshot(abs_root, snapshot, visited if full_walk else None)
+
+    header = f'{GREEN}{root}{NC}' if color else root
+    out = sys.stdout
+    try:
+        out.write(header + '\n')
+        if lines:
+            out.write('\n'.join(lines) + '\n')
+        out.flush()
+    except BrokenPipeError:
+        # `nav -l | head` closed the pipe; exit quietly.
+        sys.stdout = None
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -112,9 +112,32 @@ _print_tree() {
     done
 }
 
+# Python tree renderer (nav_tree.py, installed as nav-tree by install_nav.sh)
+_nav_tree_bin() {
+    if [ -n "$NAV_TREE_BIN" ] && [ -x "$NAV_TREE_BIN" ]; then
+        echo "$NAV_TREE_BIN"
+    elif command -v nav-tree >/dev/null 2>&1; then
+        command -v nav-tree
+    elif [ -f "$(dirname "${BASH_SOURCE[0]}")/nav_tree.py" ]; then
+        echo "$(dirname "${BASH_SOURCE[0]}")/nav_tree.py"
+    fi
+}
+
 # List directory contents in tree format
+# Extra options (-L DEPTH, -I PATTERN, --cache, --no-color) need nav-tree.
 list_tree() {
-    local dir="${1:-.}"
+    # The directory is optional: a leading option belongs to nav-tree.
+    local dir="."
+    if [ $# -gt 0 ] && [[ "$1" != -* ]]; then
+        dir="$1"
+        shift
+    fi
+    local tree_bin
+    tree_bin="$(_nav_tree_bin)"
+    if [ -n "$tree_bin" ] && command -v python3 >/dev/null 2>&1; then
+        python3 "$tree_bin" "$dir" "$@"
+        return $?
+    fi
     echo -e "${GREEN}${dir}${NC}"
     _print_tree "$dir" "" "top_level"
 }
@@ -126,6 +149,9 @@ show_help() {
     echo "  nav                     : Go to project root"
     echo "  nav set <directory>     : Set project root directory"
     echo "  nav -l, --list [dir]    : List directory tree"
+    echo "      -L <depth>          :   limit the depth"
+    echo "      -I <pattern>        :   skip names matching a glob (repeatable)"
+    echo "      --cache             :   reuse a cached snapshot of unchanged directories"
     echo "  nav -h, --help         : Show this help"
     echo -e "\n${YELLOW}Color Legend:${NC}"
     echo -e "\033[1;96m📁 Top-level Directory${NC}"
@@ -151,7 +177,13 @@ nav() {
         set_project "$2"
         return $?
     elif [ "$1" = "-l" ] || [ "$1" = "--list" ]; then
-        local target="${2:-.}"
+        shift
+        # Only a first word that is not an option names the directory (`nav -l -L 2` lists ".").
+        local target="."
+        if [ $# -gt 0 ] && [[ "$1" != -* ]]; then
+            target="$1"
+            shift
+        fi
         if [ -n "$NAV_PROJECT_ROOT" ]; then
             if [ "$target" != "." ]; then
                 target="$NAV_PROJECT_ROOT/$target"
@@ -159,8 +191,8 @@ nav() {
                 target="$NAV_PROJECT_ROOT"
             fi
         fi
-        list_tree "$target"
-        return 0
+        list_tree "$target" "$@"
+        return $?
     fi
     
     if [ -z "$NAV_PROJECT_ROOT" ]; then
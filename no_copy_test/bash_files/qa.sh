@@ -95,6 +95,8 @@ export DB_PASSWORD=""
 export DB_HOST=""
 export DB_PORT=""
 export DJANGO_DB_ENGINE="sqlite"
+export DJANGO_STAGE="test"
+export DJANGO_SECRET_KEY="${DJANGO_SECRET_KEY:-qa-only-secret-key}"
 
 echo "🔧 Overriding database for tests → using SQLite in-memory"
 
@@ -131,12 +133,51 @@ echo "🔧 Overriding database for tests → using SQLite in-memory"
     echo "📋 Step 6: Django Tests"
     echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 
-    echo "Running Django unit tests..."
-    if python manage.py test --verbosity=2 --no-input; then
+    echo "Running Django unit tests (parallel, cloned in-memory databases)..."
+    export TEST_TIMINGS_FILE="/tmp/test_timings.json"
+    if python manage.py test --parallel auto --verbosity=2 --no-input; then
         echo "✅ All tests passed"
     else
         echo "⚠️  Some tests failed or no tests found"
     fi
+    if [ -f "$TEST_TIMINGS_FILE" ]; then
+        echo "⏱️  Test timings:"
+        cat "$TEST_TIMINGS_FILE"
+    fi
+
+    echo ""
+    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+    echo "📋 Step 6b: Performance Benchmarks"
+    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+    BENCH_MODES="wsgi,asgi"
+    if python -c "import gunicorn" >/dev/null 2>&1; then
+        BENCH_MODES="$BENCH_MODES,gunicorn"
+    fi
+    echo "Running benchmarks ($BENCH_MODES)..."
+    if python -m benchmarks.run --modes "$BENCH_MODES" \
+        --output benchmarks/results.json \
+        --baseline benchmarks/baseline.json; then
+        echo "✅ No performance regressions"
+    else
+        echo "❌ Performance regressions detected or baseline missing (see benchmarks/results.json)"
+        exit 1
+    fi
+
+    echo ""
+    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+    echo "📋 Step 6c: Query Counts and EXPLAIN Plans"
+    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+
+    echo "Checking per-view query counts at several data sizes..."
+    if python -m benchmarks.querycount \
+        --output benchmarks/querycount.json \
+        --baseline benchmarks/querycount_baseline.json; then
+        echo "✅ No query regressions"
+    else
+        echo "❌ Query regressions detected (see benchmarks/querycount.json)"
+        exit 1
+    fi
 else
     echo "⚠️  No Django project found, skipping Django-specific tests"
 fi
@@ -170,6 +170,7 @@ DOCKER_CMD+=(
     "-e" "DB_PASSWORD=${DB_PASSWORD}"
     "-e" "DB_HOST=127.0.0.1"
     "-e" "DJANGO_SECRET_KEY=${DJANGO_SECRET_KEY}"
+    "-e" "DJANGO_STAGE=${DOCKER_STAGE}"
     "${DOCKER_IMAGE}"
 )
 
@@ -12,6 +12,8 @@ export DB_HOST=${DB_HOST:-127.0.0.1}
 export DB_PORT=${DB_PORT:-3306}
 export DJANGO_SETTINGS_MODULE=${DJANGO_SETTINGS_MODULE:-Playground.settings}
 export PORT=${PORT:-8000}
+# Serve pre-rendered pages from memory under gunicorn
+export DJANGO_PRERENDER=${DJANGO_PRERENDER:-1}
 
 # Try to activate virtual environment, but don't fail if not found
 VENV_ACTIVATE="$HOME/gitt_premises/lets_docker/no_copy_test/gunicorn/bin/activate"
@@ -45,7 +47,12 @@ fi
 
 # Ensure static files are collected (silence normal output)
 if [ "$QUIET" -ne 1 ]; then echo "Collecting static files..."; fi
-python3 manage.py collectstatic --noinput >/dev/null 2>&1 || { echo "collectstatic failed"; exit 1; }
+# (collectstatic needs django.contrib.staticfiles, which only the "full" app profile installs)
+DJANGO_APP_PROFILE=full python3 manage.py collectstatic --noinput >/dev/null 2>&1 || { echo "collectstatic failed"; exit 1; }
+
+# Pre-render DB-free pages; served from memory when DJANGO_PRERENDER=1
+if [ "$QUIET" -ne 1 ]; then echo "Pre-rendering static pages..."; fi
+python3 manage.py prerender >/dev/null 2>&1 || { echo "prerender failed"; exit 1; }
 
 # Optionally stop existing process on our port (best-effort)
 if command -v lsof >/dev/null 2>&1; then
@@ -60,53 +67,26 @@ fi
 # Create logs directory if it doesn't exist
 mkdir -p logs
 
-# Derive sensible concurrency defaults
-CPU_CORES=${CPU_CORES:-$(getconf _NPROCESSORS_ONLN 2>/dev/null || echo 1)}
-# classic rule of thumb: 2*cores+1, but cap to a safe default range to avoid over-provisioning
-DEFAULT_WORKERS=$(( 2 * CPU_CORES + 1 ))
-if [ "$DEFAULT_WORKERS" -lt 3 ]; then DEFAULT_WORKERS=3; fi
-if [ "$DEFAULT_WORKERS" -gt 8 ]; then DEFAULT_WORKERS=8; fi
-WORKERS=${WORKERS:-$DEFAULT_WORKERS}
-# threads can help for I/O heavy Django; modest default
-THREADS=${THREADS:-4}
-# tune logging and network knobs
-LOG_LEVEL=${LOG_LEVEL:-info}
+# Worker/thread sizing, preload, recycling and warm-up hooks live in
+# gunicorn.conf.py. It reads these variables when set:
+#   WORKERS, THREADS, CPU_CORES, GUNICORN_CPU_FRACTION, GUNICORN_MAX_RSS_MB,
+#   GUNICORN_MAX_REQUESTS, LOG_LEVEL, ACCESS_LOG, ERROR_LOG, BACKLOG,
+#   KEEPALIVE, TMPDIR, PORT, RELOAD=1 (auto-reload; disables preload),
+#   GUNICORN_CAPTURE_OUTPUT=1 (redirect stdout/stderr into ERROR_LOG),
+#   ACCESS_LOG_FORMAT (default ends in %(D)s; see benchmarks/access_log.py)
+# Django's JSON logs go to logs/django.jsonl (DJANGO_LOG_FILE, DJANGO_LOG_*).
+# DJANGO_APP_PROFILE / DJANGO_MIDDLEWARE_PROFILE / DJANGO_ADMIN=0 trim what a
+# worker loads at boot; `python3 manage.py startup_report` shows the cost.
 ACCESS_LOG=${ACCESS_LOG:-logs/access.log}
 ERROR_LOG=${ERROR_LOG:-logs/error.log}
-BACKLOG=${BACKLOG:-2048}
-KEEPALIVE=${KEEPALIVE:-5}
-TMPDIR=${TMPDIR:-/dev/shm}
-
-# Optional: enable auto-reload to mimic runserver behavior (set RELOAD=1)
-RELOAD_FLAG=""
-if [ "${RELOAD:-0}" = "1" ]; then
-  RELOAD_FLAG="--reload"
-fi
+export ACCESS_LOG ERROR_LOG
 
 # Build gunicorn command
 GUNICORN_CMD=(
-  gunicorn Playground.wsgi:application
-  --config ''
-  --bind 0.0.0.0:"$PORT"
-  --workers "$WORKERS"
-  --threads "$THREADS"
-  --worker-class gthread
-  --timeout 120
-  --graceful-timeout 30
-  --log-level "$LOG_LEVEL"
-  --backlog "$BACKLOG"
-  --keep-alive "$KEEPALIVE"
-  --worker-tmp-dir "$TMPDIR"
-  --access-logfile "$ACCESS_LOG"
-  --error-logfile "$ERROR_LOG"
-  --capture-output
-  --enable-stdio-inheritance
+  gunicorn
+  --config gunicorn.conf.py
 )
 
-if [ -n "$RELOAD_FLAG" ]; then
-  GUNICORN_CMD+=( "$RELOAD_FLAG" )
-fi
-
 # Start Gunicorn in background to allow printing a clean message
 nohup "${GUNICORN_CMD[@]}" >/dev/null 2>&1 &
 GUNICORN_PID=$!
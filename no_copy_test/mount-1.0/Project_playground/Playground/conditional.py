@@ -0,0 +1,89 @@
+"""
+Conditional GET (ETag) for pages that list a whole table.
+
+The ETag comes from one cheap aggregate per request (row count and max id)
+plus a per-model version counter that save/delete signals bump. Inserts
+and deletes change the aggregate, in-place edits change the counter, so a
+matching If-None-Match is answered with 304 before any template is
+rendered.
+
+No Last-Modified is sent: no column records when a row was last edited or
+deleted, and a date that misses those would answer If-Modified-Since with
+a stale 304.
+
+The counters are rows of accounts_mode.ContentVersion, bumped with an
+UPDATE ... SET version = version + 1 in the writer's transaction, so every
+worker process sees every bump once it commits, whatever the cache backend.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max
+from django.db.models.signals import post_delete, post_save
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from accounts_mode.models import ContentVersion
+
+
+def content_version(model):
+    """Current edit counter for `model` (0 until the first save/delete)."""
+    versions = ContentVersion.objects.filter(label=model._meta.label_lower).values_list('version', flat=True)
+    return next(iter(versions[:1]), 0)
+
+
+def bump_version(model):
+    """Invalidates validators for `model`; call after bulk writes that skip signals."""
+    label = model._meta.label_lower
+    if ContentVersion.objects.filter(label=label).update(version=F('version') + 1):
+        return
+    try:
+        with transaction.atomic():
+            ContentVersion.objects.create(label=label, version=1)
+    except IntegrityError:
+        # Another process created the row first.
+        ContentVersion.objects.filter(label=label).update(version=F('version') + 1)
+
+
+def _bump_on_signal(sender, **kwargs):
+    bump_version(sender)
+
+
+def track_versions(*models):
+    """Connects save/delete signals that bump each model's counter (call from AppConfig.ready)."""
+    for model in models:
+        uid = f'conditional:{model._meta.label_lower}'
+        post_save.connect(_bump_on_signal, sender=model, dispatch_uid=uid + ':save')
+        post_delete.connect(_bump_on_signal, sender=model, dispatch_uid=uid + ':delete')
+
+
+def _table_state(request, model):
+    """One aggregate per request and model."""
+    states = request.__dict__.setdefault('_conditional_state', {})
+    label = model._meta.label_lower
+    if label not in states:
+        state = model.objects.aggregate(rows=Count('pk'), last_pk=Max('pk'))
+        state['version'] = content_version(model)
+        states[label] = state
+    return states[label]
+
+
+def conditional_page(model, max_age=None):
+    """
+    Decorates a view that renders every row of `model`.
+
+    Adds an ETag validator with 304 handling and a public
+    Cache-Control header (settings.PUBLIC_CACHE_MAX_AGE unless `max_age`
+    is given) so a reverse proxy can serve repeats.
+    """
+    def etag_func(request, *args, **kwargs):
+        state = _table_state(request, model)
+        return f"{model._meta.model_name}-{state['rows']}-{state['last_pk'] or 0}-{state['version']}"
+
+    def decorator(view):
+        conditional_view = condition(etag_func=etag_func)(view)
+        age = settings.PUBLIC_CACHE_MAX_AGE if max_age is None else max_age
+        return wraps(view)(cache_control(public=True, max_age=age)(conditional_view))
+
+    return decorator
@@ -0,0 +1,187 @@
+"""
+Read-replica routing for Playground.
+
+Enabled when DB_REPLICAS is set (see settings.py): every entry becomes a
+`replicaN` alias with the same engine and credentials as `default`.
+
+- Reads go to a replica picked round-robin or by lowest measured latency
+  (DB_REPLICA_SELECTION=round_robin|least_latency).
+- Writes always go to `default`. After the first write in a request, and
+  inside any transaction on `default`, reads stay on `default` too, so a
+  request always sees its own writes (ReplicaPinningMiddleware scopes this
+  to one request). Outside a request (management commands, the grading
+  threads) a write pins reads for DB_REPLICA_PIN_SECONDS only, about the
+  replication lag, instead of for the rest of the process.
+- A replica that fails to connect is marked down for DB_REPLICA_RETRY_AFTER
+  seconds and skipped; with no healthy replica, reads fall back to `default`.
+  A read that fails on a replica that was up (it died mid-request) marks it
+  down the same way and is re-run on `default`, so the caller never sees
+  the error.
+- Only `default` is migrated; replicas get their schema through replication.
+
+Local check with two SQLite files standing in for primary and replica:
+
+    DJANGO_DB_ENGINE=sqlite DB_NAME=primary.sqlite3 python manage.py migrate
+    cp primary.sqlite3 replica.sqlite3
+    DJANGO_DB_ENGINE=sqlite DB_NAME=primary.sqlite3 DB_REPLICAS=replica.sqlite3 python manage.py runserver
+
+accounts_mode/tests.py exercises routing, fallback and read-your-writes
+against a second SQLite file the same way.
+"""
+import contextvars
+import itertools
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, InterfaceError, OperationalError, connections
+
+# monotonic() deadline until which reads go to `default`; math.inf inside a request.
+_pinned_until = contextvars.ContextVar('db_pinned_until', default=None)
+_in_request = contextvars.ContextVar('db_router_in_request', default=False)
+
+
+def pin_to_primary():
+    """Sends the remaining reads of this request (outside one: of the next DB_REPLICA_PIN_SECONDS) to `default`."""
+    _pinned_until.set(math.inf if _in_request.get() else time.monotonic() + settings.DB_REPLICA_PIN_SECONDS)
+
+
+def is_pinned():
+    until = _pinned_until.get()
+    return until is not None and time.monotonic() < until
+
+
+def _discard(connection):
+    try:
+        connection.close()
+    except DatabaseError:
+        pass
+
+
+class ReplicaPool:
+    """Health and latency bookkeeping for the replica aliases of one process."""
+
+    def __init__(self, aliases, selection='round_robin', retry_after=30, probe_interval=10):
+        self.aliases = list(aliases)
+        self.selection = selection
+        self.retry_after = retry_after
+        self.probe_interval = probe_interval
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._down_until = {}
+        self._latency = {}
+        self._probed_at = {}
+
+    def healthy(self):
+        now = time.monotonic()
+        return [alias for alias in self.aliases if self._down_until.get(alias, 0) <= now]
+
+    def mark_down(self, alias):
+        with self._lock:
+            self._down_until[alias] = time.monotonic() + self.retry_after
+
+    def probe(self, alias):
+        """Connects (if needed) and times a trivial query; marks the alias down on failure."""
+        start = time.perf_counter()
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except DatabaseError:
+            self.mark_down(alias)
+            # Reconnect from scratch on the next probe rather than reuse a broken handle.
+            _discard(connections[alias])
+            return False
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            previous = self._latency.get(alias)
+            # Exponentially weighted average smooths out single slow probes.
+            self._latency[alias] = elapsed if previous is None else 0.8 * previous + 0.2 * elapsed
+            self._probed_at[alias] = time.monotonic()
+        return True
+
+    def _needs_probe(self, alias):
+        if connections[alias].connection is None:
+            return True
+        return time.monotonic() - self._probed_at.get(alias, 0) > self.probe_interval
+
+    def _ordered(self, candidates):
+        if self.selection == 'least_latency':
+            return sorted(candidates, key=lambda alias: self._latency.get(alias, 0.0))
+        start = next(self._counter) % len(candidates)
+        return candidates[start:] + candidates[:start]
+
+    def choose(self):
+        """A healthy replica alias, or None when every replica is down."""
+        candidates = self.healthy()
+        if not candidates:
+            return None
+        for alias in self._ordered(candidates):
+            if not self._needs_probe(alias) or self.probe(alias):
+                # Connection objects are per thread; each gets the wrapper once and keeps it across reconnects.
+                wrappers = connections[alias].execute_wrappers
+                if self.fallback not in wrappers:
+                    wrappers.append(self.fallback)
+                return alias
+        return None
+
+    def fallback(self, execute, sql, params, many, context):
+        """execute_wrapper of replica connections: re-runs a read that failed there on `default`."""
+        try:
+            return execute(sql, params, many, context)
+        except (OperationalError, InterfaceError):
+            replica = context['connection']
+            if many or replica.in_atomic_block:
+                raise
+            self.mark_down(replica.alias)
+            primary = connections[DEFAULT_DB_ALIAS].cursor()
+            result = primary.execute(sql, params)
+            # The caller fetches through its replica cursor wrapper: hand it the primary's cursor.
+            context['cursor'].cursor = primary.cursor
+            _discard(replica)
+            return result
+
+
+class ReplicaRouter:
+    """DATABASE_ROUTERS entry that spreads reads over settings.DB_REPLICA_ALIASES."""
+
+    def __init__(self):
+        self.pool = ReplicaPool(
+            settings.DB_REPLICA_ALIASES,
+            selection=settings.DB_REPLICA_SELECTION,
+            retry_after=settings.DB_REPLICA_RETRY_AFTER,
+        )
+        self.databases = {DEFAULT_DB_ALIAS, *self.pool.aliases}
+
+    def db_for_read(self, model, **hints):
+        if is_pinned() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return self.pool.choose() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if obj1._state.db in self.databases and obj2._state.db in self.databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinningMiddleware:
+    """Starts every request unpinned so read-your-writes stickiness lasts one request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pinned = _pinned_until.set(None)
+        in_request = _in_request.set(True)
+        try:
+            return self.get_response(request)
+        finally:
+            _in_request.reset(in_request)
+            _pinned_until.reset(pinned)
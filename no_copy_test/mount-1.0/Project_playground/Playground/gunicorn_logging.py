@@ -0,0 +1,44 @@
+"""
+Gunicorn logger class that moves access/error log writes off request threads.
+
+Selected with `logger_class` in gunicorn.conf.py. Gunicorn builds its usual
+handlers (same files, same formats); this class then puts them behind a
+Playground.log queue listener, so a slow disk never stalls a worker thread.
+USR1 log reopening still works for the handlers behind the queue.
+"""
+import logging
+
+from gunicorn.glogging import Logger
+
+from Playground.log import StructuredQueueHandler, attach_queue, detach_queue, listener_handlers
+
+
+class QueueLogger(Logger):
+
+    def setup(self, cfg):
+        # A reload (HUP) runs setup() again: retire the previous listeners first.
+        for log in (self.error_log, self.access_log):
+            for handler in list(log.handlers):
+                if isinstance(handler, StructuredQueueHandler):
+                    log.removeHandler(handler)
+                    detach_queue(handler)
+        super().setup(cfg)
+        for log in (self.error_log, self.access_log):
+            direct = [h for h in log.handlers if getattr(h, '_gunicorn', False)]
+            if not direct:
+                continue
+            for handler in direct:
+                log.removeHandler(handler)
+            log.addHandler(attach_queue(direct))
+
+    def reopen_files(self):
+        super().reopen_files()
+        for handler in listener_handlers():
+            if isinstance(handler, logging.FileHandler):
+                handler.acquire()
+                try:
+                    if handler.stream:
+                        handler.close()
+                        handler.stream = handler._open()
+                finally:
+                    handler.release()
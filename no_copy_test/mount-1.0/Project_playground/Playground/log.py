@@ -0,0 +1,309 @@
+"""
+Non-blocking, structured logging for Playground.
+
+Request threads never touch a file: every handler configured through
+queue_handler() is a QueueHandler that only puts the record on an
+in-memory queue. One QueueListener thread per process drains it into the
+real handlers:
+
+- BatchingFileHandler writes JSON lines in batches (every `batch_size`
+  records or `flush_interval` seconds, whichever comes first). Several
+  gunicorn workers may share one file: each batch is a single O_APPEND
+  write. It never rotates the file itself, since workers racing to rename
+  a shared file lose records; rotate externally by renaming (logrotate
+  without copytruncate) and every worker, like WatchedFileHandler, reopens
+  the path on its next batch:
+
+      /app/logs/*.jsonl /app/logs/*.log {
+          daily
+          rotate 5
+          compress
+          delaycompress
+          postrotate
+              pkill -USR1 -o gunicorn || true
+          endscript
+      }
+
+  (USR1 makes gunicorn reopen its access/error logs; the JSON logs do not
+  need it.)
+- An optional console handler for local runs.
+
+Listener threads do not survive fork(), so os.register_at_fork() stops them
+(flushing pending records) before a fork and starts fresh ones in the
+parent and in every gunicorn worker afterwards. stop_listeners() flushes
+everything; it runs at exit and from gunicorn's worker_exit hook.
+
+RequestLogMiddleware assigns each request an id (X-Request-ID, echoed back)
+and logs one `playground.request` record with latency and query stats; the
+RequestContextFilter stamps that id on every other record of the request.
+"""
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from django.db import connections
+
+_request_id = contextvars.ContextVar('request_id', default=None)
+
+request_logger = logging.getLogger('playground.request')
+
+# Attributes every LogRecord has; anything else was passed through `extra`.
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: timestamp, level, logger, message, request id and any extras."""
+
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'pid': record.process,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exc'] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """Adds the current request id (or None) to every record."""
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            record.request_id = _request_id.get()
+        return True
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that keeps extras intact.
+
+    The stock prepare() formats the record in the calling thread and folds
+    the traceback into the message; this one only resolves the message and
+    traceback text, leaving the JSON formatting to the listener thread.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers whenever the queue has been idle for `flush_interval`."""
+
+    def __init__(self, queue_, *handlers, flush_interval=1.0):
+        super().__init__(queue_, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval)
+            except queue.Empty:
+                self.flush()
+
+    def flush(self):
+        for handler in self.handlers:
+            handler.flush()
+
+    def stop(self):
+        if self._thread is not None:
+            super().stop()
+        self.flush()
+
+
+class BatchingFileHandler(logging.handlers.WatchedFileHandler):
+    """WatchedFileHandler that writes `batch_size` formatted records at a time."""
+
+    def __init__(self, filename, batch_size=100, **kwargs):
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        super().__init__(filename, delay=True, **kwargs)
+        self.batch_size = batch_size
+        self.buffer = []
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if not self.buffer:
+                return
+            data = ''.join(self.buffer).encode(self.encoding or 'utf-8')
+            self.buffer = []
+            if self.stream is None:
+                self.stream = self._open()
+                self._statstream()
+            else:
+                # The path was renamed or removed (external rotation): write to the new file.
+                self.reopenIfNeeded()
+            os.write(self.stream.fileno(), data)
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+# --- Queue wiring ---
+
+_listeners = []
+_listeners_lock = threading.Lock()
+
+
+def attach_queue(handlers, flush_interval=1.0):
+    """Returns a StructuredQueueHandler feeding `handlers` from a listener thread."""
+    handler = StructuredQueueHandler(queue.SimpleQueue())
+    listener = BatchingQueueListener(handler.queue, *handlers, flush_interval=flush_interval)
+    with _listeners_lock:
+        _listeners.append((handler, listener))
+    listener.start()
+    return handler
+
+
+def detach_queue(handler):
+    """Stops the listener behind a handler returned by attach_queue() and closes its targets."""
+    with _listeners_lock:
+        for index, (queued, listener) in enumerate(_listeners):
+            if queued is handler:
+                del _listeners[index]
+                break
+        else:
+            return
+    listener.stop()
+    for target in listener.handlers:
+        target.close()
+
+
+def queue_handler(filename, batch_size=100, flush_interval=1.0, console=False, level=logging.NOTSET):
+    """LOGGING handler factory: JSON lines to a batched, externally rotated file, written off-thread."""
+    file_handler = BatchingFileHandler(filename, batch_size=batch_size)
+    file_handler.setFormatter(JsonFormatter())
+    targets = [file_handler]
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter('%(levelname)s %(name)s [%(request_id)s] %(message)s'))
+        targets.append(stream_handler)
+    handler = attach_queue(targets, flush_interval=flush_interval)
+    handler.setLevel(level)
+    handler.addFilter(RequestContextFilter())
+    return handler
+
+
+def listener_handlers():
+    """Every handler behind a queue listener in this process."""
+    with _listeners_lock:
+        return [h for _, listener in _listeners for h in listener.handlers]
+
+
+def stop_listeners():
+    """Drains every queue and flushes the files (safe to call more than once)."""
+    with _listeners_lock:
+        for _, listener in _listeners:
+            listener.stop()
+
+
+def _restart_listeners(fresh_queues):
+    with _listeners_lock:
+        for index, (handler, listener) in enumerate(_listeners):
+            if fresh_queues:
+                # Records a parent queued but never wrote belong to the parent.
+                handler.queue = queue.SimpleQueue()
+                listener = BatchingQueueListener(
+                    handler.queue, *listener.handlers, flush_interval=listener.flush_interval,
+                )
+                _listeners[index] = (handler, listener)
+            listener.start()
+
+
+os.register_at_fork(
+    before=stop_listeners,
+    after_in_parent=lambda: _restart_listeners(fresh_queues=False),
+    after_in_child=lambda: _restart_listeners(fresh_queues=True),
+)
+atexit.register(stop_listeners)
+
+
+# --- Request logging ---
+
+class _QueryStats:
+    """connection.execute_wrapper() callable counting statements and their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+class RequestLogMiddleware:
+    """Logs method, path, status, latency and DB query stats for every request."""
+
+    header = 'HTTP_X_REQUEST_ID'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.META.get(self.header) or uuid.uuid4().hex
+        request.request_id = request_id
+        token = _request_id.set(request_id)
+        stats = _QueryStats()
+        wrappers = [connections[alias].execute_wrapper(stats) for alias in connections]
+        start = time.perf_counter()
+        try:
+            for wrapper in wrappers:
+                wrapper.__enter__()
+            response = self.get_response(request)
+        finally:
+            for wrapper in reversed(wrappers):
+                wrapper.__exit__(None, None, None)
+            _request_id.reset(token)
+        response['X-Request-ID'] = request_id
+        request_logger.info(
+            '%s %s %s', request.method, request.path, response.status_code,
+            extra={
+                'request_id': request_id,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'latency_ms': round((time.perf_counter() - start) * 1000, 3),
+                'db_queries': stats.count,
+                'db_ms': round(stats.seconds * 1000, 3),
+            },
+        )
+        return response
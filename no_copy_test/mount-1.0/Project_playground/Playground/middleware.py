@@ -0,0 +1,48 @@
+"""
+Project-wide middleware for Playground.
+"""
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.utils.module_loading import import_string
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+class PublicReadOnlyMiddleware:
+    """
+    Runs settings.PUBLIC_BYPASS_MIDDLEWARE (sessions, auth, messages) only
+    for requests that may need them.
+
+    Anonymous GET/HEAD requests to PUBLIC_READONLY_PATHS or
+    PUBLIC_READONLY_PREFIXES go straight to the view with an AnonymousUser,
+    so they never load a session, resolve a user or set a cookie. A request
+    is anonymous when it carries no session cookie; signed-in visitors (and
+    anyone else with a session) run through the wrapped middleware exactly
+    as if it were listed in MIDDLEWARE, as does every other request.
+
+    Only the request/response half of the wrapped middleware runs;
+    process_view/process_exception hooks are not supported (sessions, auth
+    and messages do not define any).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        handler = get_response
+        for path in reversed(settings.PUBLIC_BYPASS_MIDDLEWARE):
+            handler = import_string(path)(handler)
+        self.full_chain = handler
+        self.public_paths = frozenset(settings.PUBLIC_READONLY_PATHS)
+        self.public_prefixes = tuple(settings.PUBLIC_READONLY_PREFIXES)
+        self.session_cookie = settings.SESSION_COOKIE_NAME
+
+    def is_public(self, request):
+        if request.method not in SAFE_METHODS or self.session_cookie in request.COOKIES:
+            return False
+        path = request.path_info
+        return path in self.public_paths or path.startswith(self.public_prefixes)
+
+    def __call__(self, request):
+        if self.is_public(request):
+            request.user = AnonymousUser()
+            return self.get_response(request)
+        return self.full_chain(request)
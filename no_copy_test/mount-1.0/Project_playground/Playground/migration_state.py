@@ -0,0 +1,120 @@
+"""
+Fingerprint of the migration state, so `migrate` can be skipped when there
+is nothing to apply.
+
+`migrate` has to import every migration file and render the whole graph
+before it can say "No migrations to apply", and entrypoint.sh runs it on
+every container start. Instead, after a successful migrate, record() stores two
+hashes in the playground_migration_state table of that database:
+
+- disk: the installed apps and the contents of their migration files,
+  found on disk without importing the apps;
+- applied: the rows of django_migrations.
+
+up_to_date() recomputes both (reading a few dozen small files and one
+table) and compares. Any changed, added or removed migration file, a
+different app list, or a migration applied or unapplied by other means
+makes them differ, and the caller runs the real migrate.
+
+Nothing here needs django.setup(), so entrypoint.sh can run the check
+without starting Django:
+
+    python -m Playground.migration_state [database]   # exit 0: up to date
+"""
+import hashlib
+import os
+import sys
+import warnings
+from importlib.machinery import PathFinder
+from pathlib import Path
+
+STATE_TABLE = 'playground_migration_state'
+
+
+def _package_dir(dotted):
+    """Directory of a package, located without importing it (or its parents), or None."""
+    path = None
+    for part in dotted.split('.'):
+        spec = PathFinder.find_spec(part, path)
+        if spec is None or not spec.submodule_search_locations:
+            return None
+        path = list(spec.submodule_search_locations)
+    return Path(path[0])
+
+
+def disk_fingerprint(installed_apps, migration_modules=None):
+    digest = hashlib.sha256()
+    for app in installed_apps:
+        label = app.rsplit('.', 1)[-1]
+        module = (migration_modules or {}).get(label, f'{app}.migrations')
+        digest.update(f'{app}\0{module}\0'.encode())
+        directory = _package_dir(module) if module else None
+        if directory is None:
+            continue
+        for path in sorted(directory.glob('*.py')):
+            digest.update(path.name.encode() + b'\0' + path.read_bytes() + b'\0')
+    return digest.hexdigest()
+
+
+def applied_fingerprint(connection):
+    """Hash of django_migrations; None when the table does not exist yet."""
+    from django.db import DatabaseError
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT app, name FROM django_migrations ORDER BY app, name')
+            rows = cursor.fetchall()
+    except DatabaseError:
+        return None
+    return hashlib.sha256('\n'.join(f'{app}.{name}' for app, name in rows).encode()).hexdigest()
+
+
+def current(alias='default'):
+    """(disk, applied) fingerprints of the database `alias` as they are now."""
+    from django.conf import settings
+    from django.db import connections
+
+    return (disk_fingerprint(settings.INSTALLED_APPS, settings.MIGRATION_MODULES),
+            applied_fingerprint(connections[alias]))
+
+
+def stored(alias='default'):
+    """(disk, applied) saved by the last record(), or None."""
+    from django.db import DatabaseError, connections
+
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(f'SELECT disk, applied FROM {STATE_TABLE} WHERE id = 1')
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    return tuple(row) if row else None
+
+
+def up_to_date(alias='default'):
+    saved = stored(alias)
+    return saved is not None and saved == current(alias)
+
+
+def record(alias='default'):
+    """Stores the current fingerprints; call after migrate has applied everything."""
+    from django.db import connections, transaction
+
+    disk, applied = current(alias)
+    connection = connections[alias]
+    with transaction.atomic(using=alias), connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS {STATE_TABLE} '
+            '(id INTEGER PRIMARY KEY, disk CHAR(64) NOT NULL, applied CHAR(64) NOT NULL)'
+        )
+        cursor.execute(f'DELETE FROM {STATE_TABLE}')
+        cursor.execute(f'INSERT INTO {STATE_TABLE} (id, disk, applied) VALUES (1, %s, %s)', [disk, applied])
+    return disk, applied
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.getcwd())
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Playground.settings')
+    # Querying without django.setup() is the point here.
+    warnings.filterwarnings('ignore', message='Accessing the database during app initialization')
+    sys.exit(0 if up_to_date(sys.argv[1] if len(sys.argv) > 1 else 'default') else 1)
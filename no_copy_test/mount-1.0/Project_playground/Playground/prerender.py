@@ -0,0 +1,102 @@
+"""
+Static pre-rendering for views that have no per-request data.
+
+Views decorated with @prerendered are rendered once by
+`python manage.py prerender` into settings.PRERENDER_ROOT:
+
+    prerendered/
+        manifest.json          {"/employer/": "pages/<sha1>.html", ...}
+        pages/<sha1>.html      one file per distinct page body
+
+Identical pages (employer/professional/hobby all render
+acc_mode/index.html) share one file. The directory can be served by any
+static file server; when settings.PRERENDER_ENABLED is on (stage/prod) the
+decorated views themselves answer from an in-memory bytes cache loaded on
+first use, with ETag/304 support and no template rendering.
+"""
+import hashlib
+import json
+import threading
+from functools import wraps
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+MANIFEST = 'manifest.json'
+
+_pages = None
+_pages_lock = threading.Lock()
+
+
+def prerendered(view):
+    """Marks a parameterless view for `manage.py prerender` and serves the stored copy when enabled."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if settings.PRERENDER_ENABLED and request.method in ('GET', 'HEAD'):
+            page = load_pages().get(request.path_info)
+            if page is not None:
+                return _page_response(request, *page)
+        return view(request, *args, **kwargs)
+
+    wrapper.prerender_source = view
+    return wrapper
+
+
+def _page_response(request, body, etag):
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='text/html; charset=utf-8')
+        response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=settings.PUBLIC_CACHE_MAX_AGE)
+    return response
+
+
+def load_pages(root=None):
+    """Returns {path: (body, etag)} from PRERENDER_ROOT, read once per process."""
+    global _pages
+    if _pages is None:
+        with _pages_lock:
+            if _pages is None:
+                _pages = read_pages(Path(root or settings.PRERENDER_ROOT))
+    return _pages
+
+
+def read_pages(root):
+    manifest_path = root / MANIFEST
+    if not manifest_path.exists():
+        return {}
+    bodies = {}
+    pages = {}
+    for path, rel in json.loads(manifest_path.read_text()).items():
+        if rel not in bodies:
+            bodies[rel] = (root / rel).read_bytes()
+        pages[path] = (bodies[rel], f'"{Path(rel).stem}"')
+    return pages
+
+
+def reset_pages():
+    """Drops the in-memory cache so the next request re-reads PRERENDER_ROOT."""
+    global _pages
+    with _pages_lock:
+        _pages = None
+
+
+def write_pages(root, rendered):
+    """Writes {path: body} under `root`, one file per distinct body; returns the manifest."""
+    pages_dir = root / 'pages'
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for path, body in sorted(rendered.items()):
+        digest = hashlib.sha1(body).hexdigest()
+        rel = f'pages/{digest}.html'
+        target = root / rel
+        if not target.exists():
+            target.write_bytes(body)
+        manifest[path] = rel
+    for stale in pages_dir.glob('*.html'):
+        if f'pages/{stale.name}' not in manifest.values():
+            stale.unlink()
+    (root / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+    return manifest
@@ -0,0 +1,189 @@
+"""
+Opt-in per-request CPU and memory profiling.
+
+ProfilingMiddleware is listed in every middleware profile but removes itself
+at startup (MiddlewareNotUsed) unless DJANGO_PROFILING=1, so a normal
+deployment pays nothing. When enabled, a request is profiled if it carries a
+valid signed X-Profile header (minted on the admin page and valid for
+PROFILING_TOKEN_MAX_AGE seconds) or is picked by PROFILING_SAMPLE_RATE.
+
+A profiled request runs under cProfile and tracemalloc; the top functions,
+the allocation growth by source line and the RSS/peak numbers are written
+as JSON (plus the raw .prof for snakeviz & co.) to PROFILING_ROOT, keeping
+the newest PROFILING_KEEP runs. tracemalloc is process-wide, so only one
+request per process is profiled at a time; others are served normally.
+Streaming responses are profiled up to the point the view returns.
+
+Staff can browse the store at /admin/profiles/ (Playground/profiling_views.py,
+kept apart so the middleware never imports the admin).
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signing import BadSignature, TimestampSigner
+
+SIGNER_SALT = 'Playground.profiling'
+TOP_N = 30
+
+_profile_lock = threading.Lock()
+
+
+def make_token():
+    """A header value that enables profiling for PROFILING_TOKEN_MAX_AGE seconds."""
+    return TimestampSigner(salt=SIGNER_SALT).sign('profile')
+
+
+def _valid_token(value):
+    try:
+        return TimestampSigner(salt=SIGNER_SALT).unsign(value, max_age=settings.PROFILING_TOKEN_MAX_AGE) == 'profile'
+    except BadSignature:
+        return False
+
+
+def _rss_mb():
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ProfileStore:
+    """Rolling directory of profile runs: <stamp>.json summaries and <stamp>.prof stats."""
+
+    NAME_RE = re.compile(r'^[\w.-]+$')
+
+    def __init__(self, root, keep):
+        self.root = Path(root)
+        self.keep = keep
+
+    def save(self, summary, profiler):
+        self.root.mkdir(parents=True, exist_ok=True)
+        name = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S.%f}-{os.getpid()}"
+        profiler.dump_stats(self.root / f'{name}.prof')
+        (self.root / f'{name}.json').write_text(json.dumps(summary, indent=2))
+        self.prune()
+        return name
+
+    def prune(self):
+        for stale in self.names()[self.keep:]:
+            for suffix in ('.json', '.prof'):
+                (self.root / f'{stale}{suffix}').unlink(missing_ok=True)
+
+    def names(self):
+        """Stored run names, newest first."""
+        if not self.root.is_dir():
+            return []
+        return sorted((p.stem for p in self.root.glob('*.json')), reverse=True)
+
+    def load(self, name):
+        if not self.NAME_RE.match(name):
+            return None
+        path = self.root / f'{name}.json'
+        return json.loads(path.read_text()) if path.exists() else None
+
+
+def default_store():
+    return ProfileStore(settings.PROFILING_ROOT, settings.PROFILING_KEEP)
+
+
+def top_functions(profiler, limit=TOP_N):
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({
+            'function': f'{func} ({filename}:{line})',
+            'calls': nc,
+            'tottime_ms': round(tt * 1000, 3),
+            'cumtime_ms': round(ct * 1000, 3),
+        })
+    rows.sort(key=lambda r: r['cumtime_ms'], reverse=True)
+    return rows[:limit]
+
+
+def top_allocations(before, after, limit=TOP_N):
+    rows = []
+    for stat in after.compare_to(before, 'lineno')[:limit]:
+        frame = stat.traceback[0]
+        rows.append({
+            'location': f'{frame.filename}:{frame.lineno}',
+            'size_kb': round(stat.size / 1024, 1),
+            'size_diff_kb': round(stat.size_diff / 1024, 1),
+            'count_diff': stat.count_diff,
+        })
+    return rows
+
+
+class ProfilingMiddleware:
+    """Profiles requests that carry a signed X-Profile header or fall in the sample."""
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.header = 'HTTP_' + settings.PROFILING_HEADER.upper().replace('-', '_')
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.store = default_store()
+
+    def wanted(self, request):
+        token = request.META.get(self.header)
+        if token:
+            return _valid_token(token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if not self.wanted(request) or not _profile_lock.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            return self.profile(request)
+        finally:
+            _profile_lock.release()
+
+    def profile(self, request):
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(settings.PROFILING_TRACEBACK_DEPTH)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        rss_before = _rss_mb()
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            response = profiler.runcall(self.get_response, request)
+        finally:
+            elapsed = time.perf_counter() - start
+            after = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+        rss_after = _rss_mb()
+        summary = {
+            'path': request.path,
+            'method': request.method,
+            'request_id': getattr(request, 'request_id', None),
+            'status': response.status_code,
+            'pid': os.getpid(),
+            'at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'wall_ms': round(elapsed * 1000, 3),
+            'rss_before_mb': rss_before and round(rss_before, 1),
+            'rss_after_mb': rss_after and round(rss_after, 1),
+            'traced_peak_kb': round(peak / 1024, 1),
+            'traced_current_kb': round(current / 1024, 1),
+            'functions': top_functions(profiler),
+            'allocations': top_allocations(before, after),
+        }
+        response['X-Profile-Id'] = self.store.save(summary, profiler)
+        return response
+
@@ -0,0 +1,47 @@
+"""
+Admin pages for the profile store of Playground/profiling.py.
+
+Imported only by the admin block of Playground/urls.py, so app profiles
+without django.contrib.admin never load it.
+"""
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404
+from django.shortcuts import render
+
+from .profiling import default_store, make_token
+
+
+@staff_member_required
+def profile_list(request):
+    """Stored runs, newest first, and a fresh X-Profile token."""
+    store = default_store()
+    runs = []
+    for name in store.names():
+        summary = store.load(name) or {}
+        runs.append({'name': name, **{k: summary.get(k) for k in (
+            'at', 'method', 'path', 'status', 'wall_ms', 'traced_peak_kb', 'rss_after_mb')}})
+    return render(request, 'profiling/list.html', {
+        **admin.site.each_context(request),
+        'title': 'Request profiles',
+        'runs': runs,
+        'enabled': settings.PROFILING_ENABLED,
+        'header': settings.PROFILING_HEADER,
+        'token': make_token(),
+        'token_max_age': settings.PROFILING_TOKEN_MAX_AGE,
+    })
+
+
+@staff_member_required
+def profile_detail(request, name):
+    """Top functions and allocations of one stored run."""
+    summary = default_store().load(name)
+    if summary is None:
+        raise Http404('No such profile')
+    return render(request, 'profiling/detail.html', {
+        **admin.site.each_context(request),
+        'title': f"{summary['method']} {summary['path']}",
+        'name': name,
+        'summary': summary,
+    })
@@ -23,6 +23,9 @@ TEMPLATE_DIR = Path.joinpath(BASE_DIR,'template')
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
 
+# Deployment stage: dev | test | stage | prod (set by the Docker images).
+DJANGO_STAGE = os.environ.get('DJANGO_STAGE', 'dev')
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
@@ -31,13 +34,14 @@ ALLOWED_HOSTS = ['localhost', '127.0.0.1', '0.0.0.0', 'host.docker.internal']
 
 # Application definition
 
-INSTALLED_APPS = [
-    "django.contrib.admin",
-    "django.contrib.auth",
-    "django.contrib.contenttypes",
-    "django.contrib.sessions",
-    "django.contrib.messages",
-    "django.contrib.staticfiles",
+# App profiles (DJANGO_APP_PROFILE=full|web|cli), chosen per stage by default.
+# "full" is everything (dev and test: runserver, collectstatic). "web" is what
+# gunicorn serves: no staticfiles (nginx serves STATIC_ROOT), and no admin or
+# messages either with DJANGO_ADMIN=0. "cli" is for the management commands
+# that serve no pages (run_graders, check_images, ...; manage.py selects it),
+# so they skip importing the admin and every app's admin.py.
+ADMIN_ENABLED = os.environ.get('DJANGO_ADMIN', '1') == '1'
+PROJECT_APPS = [
     'accounts_mode',
     'domain',
     'interface_profile',
@@ -45,17 +49,76 @@ INSTALLED_APPS = [
     'prob_statements',
     'solution'
 ]
+CORE_APPS = [
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+]
+ADMIN_APPS = ["django.contrib.admin", "django.contrib.messages"] if ADMIN_ENABLED else []
+APP_PROFILES = {
+    'full': ADMIN_APPS + CORE_APPS + ["django.contrib.staticfiles"] + PROJECT_APPS,
+    'web': ADMIN_APPS + CORE_APPS + PROJECT_APPS,
+    'cli': CORE_APPS + PROJECT_APPS,
+}
+APP_PROFILE = os.environ.get(
+    'DJANGO_APP_PROFILE', 'full' if DJANGO_STAGE in ('dev', 'test') else 'web'
+)
+INSTALLED_APPS = list(APP_PROFILES[APP_PROFILE])
+
+# Middleware profiles (DJANGO_MIDDLEWARE_PROFILE=default|lean; stage and prod
+# default to lean). "lean" skips sessions, auth and messages only for GET/HEAD
+# requests without a session cookie to the public read-only URLs below, so
+# signed-in visitors keep their user there; see Playground/middleware.py and
+# the tests in accounts_mode/tests.py.
+MIDDLEWARE_PROFILES = {
+    'default': [
+        "Playground.log.RequestLogMiddleware",
+        "Playground.profiling.ProfilingMiddleware",
+        "django.middleware.security.SecurityMiddleware",
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    ],
+    'lean': [
+        "Playground.log.RequestLogMiddleware",
+        "Playground.profiling.ProfilingMiddleware",
+        "django.middleware.security.SecurityMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "Playground.middleware.PublicReadOnlyMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    ],
+}
+MIDDLEWARE_PROFILE = os.environ.get(
+    'DJANGO_MIDDLEWARE_PROFILE', 'default' if DJANGO_STAGE in ('dev', 'test') else 'lean'
+)
+MIDDLEWARE = list(MIDDLEWARE_PROFILES[MIDDLEWARE_PROFILE])
 
-MIDDLEWARE = [
-    "django.middleware.security.SecurityMiddleware",
+# Wrapped by PublicReadOnlyMiddleware in the lean profile, in this order.
+PUBLIC_BYPASS_MIDDLEWARE = [
     "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+# GET/HEAD requests to these paths skip the bypass middleware entirely.
+PUBLIC_READONLY_PATHS = ['/']
+PUBLIC_READONLY_PREFIXES = [
+    p for p in os.environ.get(
+        'DJANGO_PUBLIC_PREFIXES',
+        '/employer/,/professional/,/hobby/,/images/gallery/,/difficulty/,'
+        '/frontend-questions/frontend-questions/,/frontend-questions/export/,'
+        '/frontend-questions/summary/,/static/',
+    ).split(',') if p
 ]
 
+if MIDDLEWARE_PROFILE == 'lean':
+    # The admin checks look for these classes in MIDDLEWARE directly; they
+    # still run for every admin request through PublicReadOnlyMiddleware.
+    SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
+
 ROOT_URLCONF = "Playground.urls"
 
 TEMPLATES = [
@@ -80,18 +143,114 @@ WSGI_APPLICATION = "Playground.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
+# DJANGO_DB_ENGINE selects the backend: mysql (default) or sqlite. With
+# sqlite, DB_NAME is the database file (":memory:" for throwaway runs).
+DB_ENGINES = {
+    'mysql': 'django.db.backends.mysql',
+    'sqlite': 'django.db.backends.sqlite3',
+}
+DB_ENGINE = os.environ.get('DJANGO_DB_ENGINE', 'mysql')
+
+if DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINES['sqlite'],
+            'NAME': os.environ.get('DB_NAME') or BASE_DIR / 'db.sqlite3',
+            # No TEST NAME: the test database is in memory, and
+            # `manage.py test --parallel` clones it once per worker.
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINES[DB_ENGINE],
+            'NAME': os.environ.get('DB_NAME'),
+            'USER': os.environ.get('DB_USER'),
+            'PASSWORD': os.environ.get('DB_PASSWORD'),
+            'HOST': os.environ.get('DB_HOST'),
+            'PORT': os.environ.get('DB_PORT'),
+            # Persistent connections let gunicorn workers warm one per thread at boot.
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+
+# Read replicas: DB_REPLICAS is a comma separated list of host[:port]
+# (mysql) or database files (sqlite). Each becomes a `replicaN` alias that
+# Playground.db_router.ReplicaRouter sends read queries to.
+DB_REPLICA_ALIASES = []
+for _i, _replica in enumerate(filter(None, os.environ.get('DB_REPLICAS', '').split(',')), start=1):
+    _alias = f'replica{_i}'
+    DATABASES[_alias] = dict(DATABASES['default'], TEST={'MIRROR': 'default'})
+    if DB_ENGINE == 'sqlite':
+        DATABASES[_alias]['NAME'] = _replica
+    else:
+        _host, _, _port = _replica.partition(':')
+        DATABASES[_alias].update(HOST=_host, PORT=_port or DATABASES['default']['PORT'])
+    DB_REPLICA_ALIASES.append(_alias)
+DB_REPLICA_SELECTION = os.environ.get('DB_REPLICA_SELECTION', 'round_robin')
+DB_REPLICA_RETRY_AFTER = int(os.environ.get('DB_REPLICA_RETRY_AFTER', 30))
+# Outside a request, how long a write keeps this thread's reads on the primary.
+DB_REPLICA_PIN_SECONDS = float(os.environ.get('DB_REPLICA_PIN_SECONDS', 5))
+
+if DB_REPLICA_ALIASES:
+    DATABASE_ROUTERS = ['Playground.db_router.ReplicaRouter']
+    MIDDLEWARE.insert(0, 'Playground.db_router.ReplicaPinningMiddleware')
+
+# Reports test database setup/teardown time (see Playground/test_runner.py).
+TEST_RUNNER = 'Playground.test_runner.TimedDiscoverRunner'
+
+if DJANGO_STAGE == 'test':
+    # QA profile: hashing strength is irrelevant for test users and costs
+    # seconds across a suite.
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# DJANGO_CACHE_BACKEND=locmem|file|redis|memcached (+ DJANGO_CACHE_LOCATION).
+# locmem is per process; use a shared backend with several gunicorn workers.
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+}
+CACHE_BACKEND = os.environ.get('DJANGO_CACHE_BACKEND', 'locmem')
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': os.environ.get('DB_NAME'),
-        'USER': os.environ.get('DB_USER'),
-        'PASSWORD': os.environ.get('DB_PASSWORD'),
-        'HOST': os.environ.get('DB_HOST'),
-        'PORT': os.environ.get('DB_PORT'),
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.environ.get(
+            'DJANGO_CACHE_LOCATION',
+            '/tmp/playground_cache' if CACHE_BACKEND == 'file' else 'playground',
+        ),
     }
 }
 
 
+# Public pages send Cache-Control: public, max-age=<this> along with their
+# ETag validators (see Playground/conditional.py).
+PUBLIC_CACHE_MAX_AGE = int(os.environ.get('DJANGO_PUBLIC_CACHE_MAX_AGE', 60))
+
+
+# Sessions and messages
+# DJANGO_SESSION_BACKEND=db|cache|cached_db|signed_cookies. signed_cookies
+# and cache keep anonymous traffic off the database entirely.
+
+SESSION_BACKENDS = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_BACKEND = os.environ.get('DJANGO_SESSION_BACKEND', 'db')
+SESSION_ENGINE = SESSION_BACKENDS[SESSION_BACKEND]
+if SESSION_BACKEND != 'db':
+    # Cookie-only messages never fall back to (and touch) the session store.
+    MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -129,11 +288,76 @@ USE_TZ = True
 STATIC_URL = "/static/"
 STATIC_DIR = Path.joinpath(BASE_DIR, 'static')
 STATICFILES_DIRS = [STATIC_DIR]
-STATIC_ROOT = Path.joinpath(BASE_DIR, 'staticfiles')  # For production
+# For production; created by collectstatic, not on every settings import.
+STATIC_ROOT = Path.joinpath(BASE_DIR, 'staticfiles')
+
+# Pre-rendered pages (python manage.py prerender; see Playground/prerender.py)
+PRERENDER_ROOT = Path(os.environ.get('DJANGO_PRERENDER_ROOT', BASE_DIR / 'prerendered'))
+PRERENDER_ENABLED = os.environ.get(
+    'DJANGO_PRERENDER', '1' if DJANGO_STAGE in ('stage', 'prod') else '0'
+) == '1'
+
+# Rows per keyset batch in the streaming question export (prob_statements/export.py)
+QUESTION_EXPORT_CHUNK_SIZE = int(os.environ.get('QUESTION_EXPORT_CHUNK_SIZE', 2000))
+
+# Practice-mode sampler (prob_statements/sampling.py): lifetime of the cached
+# id arrays, and how many served ids a session remembers for ?no_repeat=1.
+SAMPLER_IDS_TTL = int(os.environ.get('SAMPLER_IDS_TTL', 300))
+SAMPLER_MAX_SEEN = int(os.environ.get('SAMPLER_MAX_SEEN', 200))
+
+# Logging
+# https://docs.djangoproject.com/en/5.1/topics/logging/
+# JSON lines written by a per-process queue listener thread in batches; request
+# threads only enqueue. The file is rotated externally (logrotate renaming it,
+# see Playground/log.py), never by the workers sharing it.
+
+LOG_DIR = Path(os.environ.get('DJANGO_LOG_DIR', BASE_DIR / 'logs'))
+LOG_LEVEL = os.environ.get('DJANGO_LOG_LEVEL', 'INFO')
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'queue': {
+            '()': 'Playground.log.queue_handler',
+            'filename': os.environ.get('DJANGO_LOG_FILE', str(LOG_DIR / 'django.jsonl')),
+            'batch_size': int(os.environ.get('DJANGO_LOG_BATCH_SIZE', 100)),
+            'flush_interval': float(os.environ.get('DJANGO_LOG_FLUSH_INTERVAL', 1.0)),
+            'console': DJANGO_STAGE == 'dev',
+        },
+    },
+    'root': {'handlers': ['queue'], 'level': LOG_LEVEL},
+    'loggers': {
+        'django': {'handlers': ['queue'], 'level': LOG_LEVEL, 'propagate': False},
+        'playground.request': {'handlers': ['queue'], 'level': 'INFO', 'propagate': False},
+    },
+}
 
-# Ensure the staticfiles directory exists
-if not os.path.exists(STATIC_ROOT):
-    os.makedirs(STATIC_ROOT)
+# Per-request profiling (Playground/profiling.py). Off unless DJANGO_PROFILING=1;
+# then requests with a signed X-Profile header, or a PROFILING_SAMPLE_RATE
+# share of all requests, are profiled into PROFILING_ROOT.
+PROFILING_ENABLED = os.environ.get('DJANGO_PROFILING', '0') == '1'
+PROFILING_SAMPLE_RATE = float(os.environ.get('DJANGO_PROFILING_SAMPLE_RATE', 0.0))
+PROFILING_HEADER = 'X-Profile'
+PROFILING_TOKEN_MAX_AGE = int(os.environ.get('DJANGO_PROFILING_TOKEN_MAX_AGE', 3600))
+PROFILING_ROOT = Path(os.environ.get('DJANGO_PROFILING_ROOT', BASE_DIR / 'profiles'))
+PROFILING_KEEP = int(os.environ.get('DJANGO_PROFILING_KEEP', 200))
+PROFILING_TRACEBACK_DEPTH = int(os.environ.get('DJANGO_PROFILING_TRACEBACK_DEPTH', 1))
+
+# Per-user progress (interface_profile/progress.py): views and attempts are
+# buffered per worker and upserted every PROGRESS_FLUSH_SIZE events or
+# PROGRESS_FLUSH_INTERVAL seconds, whichever comes first.
+PROGRESS_FLUSH_SIZE = int(os.environ.get('PROGRESS_FLUSH_SIZE', 500))
+PROGRESS_FLUSH_INTERVAL = float(os.environ.get('PROGRESS_FLUSH_INTERVAL', 10))
+PROGRESS_MAX_PENDING = int(os.environ.get('PROGRESS_MAX_PENDING', 50000))
+
+# Grading queue (solution/jobs.py): submissions are graded by
+# `manage.py run_graders`, not in the request. Failed jobs are retried with
+# exponential backoff (seconds, capped) up to SOLUTION_MAX_ATTEMPTS times.
+SOLUTION_GRADER = os.environ.get('SOLUTION_GRADER', 'solution.graders.keyword_grader')
+SOLUTION_MAX_ATTEMPTS = int(os.environ.get('SOLUTION_MAX_ATTEMPTS', 3))
+SOLUTION_RETRY_BACKOFF = float(os.environ.get('SOLUTION_RETRY_BACKOFF', 5))
+SOLUTION_RETRY_BACKOFF_MAX = float(os.environ.get('SOLUTION_RETRY_BACKOFF_MAX', 300))
+SOLUTION_JOB_TIMEOUT = float(os.environ.get('SOLUTION_JOB_TIMEOUT', 10))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
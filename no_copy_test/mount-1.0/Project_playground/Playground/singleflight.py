@@ -0,0 +1,145 @@
+"""
+Single-flight recomputation for cached values.
+
+get_or_compute() stores values in the default cache wrapped with their
+logical expiry and how long they took to build. When a value expires (or
+is picked for early refresh), exactly one caller per key wins a cache
+lock and rebuilds it; everyone else keeps serving the stale copy for up to
+`stale_ttl` seconds instead of stampeding the database. With nothing
+cached yet, losers poll for the winner's result rather than building it
+themselves; a loser only builds after taking over the lock (the winner
+failed or its lock expired). One that still has no value and no lock
+after `wait_timeout` raises BuildTimeout rather than building unlocked,
+so sustained contention never turns into a stampede.
+
+Early refresh uses probabilistic early expiration ("XFetch"): a caller
+refreshes ahead of expiry with a probability that rises as expiry nears
+and with the value's build time, which spreads rebuilds out.
+
+The lock lives in the cache too, so coalescing spans gunicorn workers only
+with a shared backend (DJANGO_CACHE_BACKEND); with locmem it is per
+process.
+"""
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.core.cache import cache
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+METRIC_NAMES = (
+    'hits', 'misses', 'stale_served', 'early_refreshes', 'builds',
+    'build_errors', 'coalesced_waits', 'wait_timeouts',
+)
+
+
+class BuildTimeout(Exception):
+    """Nothing cached and another caller still holds the build lock after wait_timeout."""
+
+
+def _count(name):
+    with _metrics_lock:
+        _metrics[name] += 1
+
+
+def metrics():
+    """Snapshot of this process's counters."""
+    with _metrics_lock:
+        return {name: _metrics[name] for name in METRIC_NAMES}
+
+
+def reset_metrics():
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def _should_refresh_early(expires_at, build_seconds, beta):
+    if beta <= 0 or build_seconds <= 0:
+        return False
+    return time.time() - build_seconds * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+def _build(key, builder, ttl, stale_ttl):
+    start = time.perf_counter()
+    value = builder()
+    build_seconds = time.perf_counter() - start
+    cache.set(key, (value, time.time() + ttl, build_seconds), timeout=ttl + stale_ttl)
+    _count('builds')
+    return value
+
+
+def _try_lock(lock_key, lock_timeout):
+    token = uuid.uuid4().hex
+    return token if cache.add(lock_key, token, timeout=lock_timeout) else None
+
+
+def _release(lock_key, token):
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def get_or_compute(key, builder, ttl, stale_ttl=None, beta=1.0, lock_timeout=30, wait_timeout=5.0):
+    """
+    Returns the cached value for `key`, building it with builder() when needed.
+
+    ttl: seconds a value is fresh. stale_ttl: extra seconds a stale value may
+    be served while one caller rebuilds it (default: ttl). beta: early
+    refresh aggressiveness (0 disables). lock_timeout: upper bound on one
+    rebuild. wait_timeout: how long a caller with nothing to serve waits
+    for another caller's build before raising BuildTimeout.
+    """
+    stale_ttl = ttl if stale_ttl is None else stale_ttl
+    lock_key = f'{key}:singleflight-lock'
+
+    entry = cache.get(key)
+    if entry is not None:
+        value, expires_at, build_seconds = entry
+        expired = time.time() >= expires_at
+        if not expired and not _should_refresh_early(expires_at, build_seconds, beta):
+            _count('hits')
+            return value
+        token = _try_lock(lock_key, lock_timeout)
+        if token is None:
+            # Someone else is rebuilding: serve what we have.
+            _count('stale_served' if expired else 'hits')
+            return value
+        _count('misses' if expired else 'early_refreshes')
+        try:
+            return _build(key, builder, ttl, stale_ttl)
+        except Exception:
+            _count('build_errors')
+            _count('stale_served')
+            return value
+        finally:
+            _release(lock_key, token)
+
+    _count('misses')
+    token = _try_lock(lock_key, lock_timeout)
+    if token is None:
+        _count('coalesced_waits')
+        deadline = time.monotonic() + wait_timeout
+        delay = 0.01
+        while token is None:
+            if time.monotonic() >= deadline:
+                _count('wait_timeouts')
+                raise BuildTimeout(f'{key}: still being built by another caller after {wait_timeout}s')
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry[0]
+            if cache.get(lock_key) is None:
+                # The builder failed or its lock expired: take over, but only holding the lock ourselves.
+                token = _try_lock(lock_key, lock_timeout)
+    try:
+        return _build(key, builder, ttl, stale_ttl)
+    except Exception:
+        _count('build_errors')
+        raise
+    finally:
+        _release(lock_key, token)
@@ -0,0 +1,116 @@
+"""
+Start-up probe behind `manage.py startup_report`.
+
+Run as `python -X importtime -m Playground.startup`: it times the phases of
+django.setup() (settings import, logging, and for every app the import of
+its package, its models and its ready()), then building the WSGI handler
+(middleware) and loading the URLconf, and prints them as one JSON line.
+The per-module import times come from -X importtime on stderr and are
+parsed by parse_importtime().
+
+App timings are taken by wrapping AppConfig.create() and, on each config it
+returns, import_models() and ready(); imports shared between apps are
+charged to whichever app imported them first.
+"""
+import json
+import os
+import re
+import sys
+import time
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(text):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output, in import order."""
+    rows = []
+    for line in text.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            rows.append((module, int(own), int(cumulative), len(indent) // 2))
+    return rows
+
+
+def package_of(module):
+    """Grouping key for the import report: django.contrib apps separately, the rest of Django as one."""
+    parts = module.split('.')
+    if parts[0] == 'django':
+        return '.'.join(parts[:3]) if parts[1:2] == ['contrib'] and len(parts) > 2 else 'django'
+    return parts[0]
+
+
+def _ms(start):
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+def probe():
+    started = time.perf_counter()
+    import django
+    from django.apps import config as app_config
+    from django.utils import log as django_log
+
+    phases = {'import_django': _ms(started)}
+    apps = []
+    original_create = app_config.AppConfig.create.__func__
+
+    def timed(name, entry, func):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                entry[name] = _ms(start)
+        return wrapper
+
+    def create(cls, entry_name):
+        entry = {'app': entry_name, 'import': 0.0, 'models': 0.0, 'ready': 0.0}
+        start = time.perf_counter()
+        instance = original_create(cls, entry_name)
+        entry['import'] = _ms(start)
+        entry['label'] = instance.label
+        instance.import_models = timed('models', entry, instance.import_models)
+        instance.ready = timed('ready', entry, instance.ready)
+        apps.append(entry)
+        return instance
+
+    app_config.AppConfig.create = classmethod(create)
+    original_logging = django_log.configure_logging
+    django_log.configure_logging = timed('logging', phases, original_logging)
+
+    from django.conf import settings
+    start = time.perf_counter()
+    settings.INSTALLED_APPS  # imports the settings module
+    phases['settings'] = _ms(start)
+
+    start = time.perf_counter()
+    django.setup()
+    phases['setup'] = _ms(start)
+
+    start = time.perf_counter()
+    from django.core.wsgi import get_wsgi_application
+    get_wsgi_application()
+    phases['wsgi_handler'] = _ms(start)
+
+    start = time.perf_counter()
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+    phases['urlconf'] = _ms(start)
+    phases['total'] = _ms(started)
+
+    return {
+        'settings_module': os.environ.get('DJANGO_SETTINGS_MODULE'),
+        'stage': getattr(settings, 'DJANGO_STAGE', None),
+        'app_profile': getattr(settings, 'APP_PROFILE', None),
+        'middleware_profile': getattr(settings, 'MIDDLEWARE_PROFILE', None),
+        'installed_apps': list(settings.INSTALLED_APPS),
+        'middleware': list(settings.MIDDLEWARE),
+        'phases': phases,
+        'apps': apps,
+    }
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.getcwd())
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Playground.settings')
+    print(json.dumps(probe()))
@@ -0,0 +1,52 @@
+"""
+Test runner that measures and reports test database setup time.
+
+With `manage.py test --parallel N` Django builds the test database once
+and clones it for every worker; the clone cost is part of setup and shows
+up here. Set TEST_TIMINGS_FILE to also write the numbers as JSON (qa.sh
+does this for the test-qa image).
+"""
+import json
+import os
+import time
+
+from django.db import connections
+from django.test.runner import DiscoverRunner
+
+
+class TimedDiscoverRunner(DiscoverRunner):
+    """DiscoverRunner that logs how long database setup and teardown take."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings = {}
+
+    def setup_databases(self, **kwargs):
+        start = time.perf_counter()
+        old_config = super().setup_databases(**kwargs)
+        self.timings['db_setup_seconds'] = round(time.perf_counter() - start, 3)
+        self.timings['engines'] = sorted({conn.vendor for conn in connections.all()})
+        self.timings['parallel'] = self.parallel
+        self.log(
+            f"Test database setup: {self.timings['db_setup_seconds']}s "
+            f"({', '.join(self.timings['engines'])}, parallel={self.parallel})"
+        )
+        return old_config
+
+    def teardown_databases(self, old_config, **kwargs):
+        start = time.perf_counter()
+        super().teardown_databases(old_config, **kwargs)
+        self.timings['db_teardown_seconds'] = round(time.perf_counter() - start, 3)
+
+    def run_tests(self, test_labels, **kwargs):
+        start = time.perf_counter()
+        failures = super().run_tests(test_labels, **kwargs)
+        self.timings['total_seconds'] = round(time.perf_counter() - start, 3)
+        self.timings['failures'] = failures
+        self.log(f"Test run: {self.timings['total_seconds']}s total")
+        report = os.environ.get('TEST_TIMINGS_FILE')
+        if report:
+            with open(report, 'w') as fh:
+                json.dump(self.timings, fh, indent=2)
+                fh.write('\n')
+        return failures
@@ -15,17 +15,29 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from accounts_mode.views import modes
 urlpatterns = [
-    path("admin/", admin.site.urls),
     path('', include('accounts_mode.urls')),
     path('images/',include('domain.urls')),
     path('difficulty/', include('level.urls')),
-    path('frontend-questions/',include('prob_statements.urls'))
+    path('frontend-questions/',include('prob_statements.urls')),
+    path('solutions/', include('solution.urls')),
+    path('profile/', include('interface_profile.urls')),
 
     #path('',modes)
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+
+# The admin (and the profile browser built on it) only exists in app profiles
+# that install it; see APP_PROFILES in settings.
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+    from Playground import profiling_views
+    urlpatterns = [
+        path("admin/profiles/", profiling_views.profile_list, name='profile_list'),
+        path("admin/profiles/<str:name>/", profiling_views.profile_detail, name='profile_detail'),
+        path("admin/", admin.site.urls),
+    ] + urlpatterns
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from Playground import migration_state
+
+
+class Command(BaseCommand):
+    help = ("Runs migrate only when the migration files or the applied migrations changed since the last run "
+            "(see Playground/migration_state.py).")
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Database to migrate (default: "default")')
+        parser.add_argument('--check', action='store_true', help='Exit with status 1 if migrate would run, without running it')
+        parser.add_argument('--force', action='store_true', help='Run migrate even when the fingerprints match')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        start = time.perf_counter()
+        if not options['force'] and migration_state.up_to_date(alias):
+            self.stdout.write(f'Migrations up to date ({(time.perf_counter() - start) * 1000:.1f} ms)')
+            return
+        if options['check']:
+            raise CommandError('Migration state changed; migrate would run', returncode=1)
+        call_command('migrate', database=alias, interactive=False, verbosity=options['verbosity'])
+        migration_state.record(alias)
+        self.stdout.write(self.style.SUCCESS(f'Migrated and recorded the fingerprint ({time.perf_counter() - start:.1f}s)'))
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.urls.resolvers import RoutePattern
+
+from Playground.prerender import reset_pages, write_pages
+
+
+def prerender_routes(patterns=None, prefix='/'):
+    """Yields (path, view) for every parameterless URL whose view is @prerendered."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    for entry in patterns:
+        pattern = entry.pattern
+        if not isinstance(pattern, RoutePattern) or pattern.converters:
+            continue
+        path = prefix + str(pattern)
+        if isinstance(entry, URLResolver):
+            yield from prerender_routes(entry.url_patterns, path)
+        elif isinstance(entry, URLPattern) and hasattr(entry.callback, 'prerender_source'):
+            yield path, entry.callback.prerender_source
+
+
+class Command(BaseCommand):
+    help = "Renders every @prerendered view to static HTML under PRERENDER_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Target directory (default: settings.PRERENDER_ROOT)')
+
+    def handle(self, *args, **options):
+        root = Path(options['output'] or settings.PRERENDER_ROOT)
+        factory = RequestFactory(HTTP_HOST=(settings.ALLOWED_HOSTS or ['localhost'])[0])
+
+        rendered = {}
+        for path, view in prerender_routes():
+            response = view(factory.get(path))
+            if response.status_code != 200:
+                raise CommandError(f'{path} returned HTTP {response.status_code}')
+            body = response.content
+            if b'csrfmiddlewaretoken' in body:
+                raise CommandError(f'{path} renders a CSRF token and cannot be pre-rendered')
+            rendered[path] = body
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  {path} ({len(body)} bytes)')
+
+        manifest = write_pages(root, rendered)
+        reset_pages()
+        self.stdout.write(self.style.SUCCESS(
+            f'Pre-rendered {len(manifest)} route(s) into {len(set(manifest.values()))} file(s) at {root}'
+        ))
@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from Playground.startup import package_of, parse_importtime
+
+
+class Command(BaseCommand):
+    help = ("Breaks down start-up time of a fresh process: settings, each app's import/models/ready(), "
+            "WSGI handler and URLconf, plus per-module import times (python -X importtime).")
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', help='DJANGO_APP_PROFILE of the measured process (default: as configured)')
+        parser.add_argument('--middleware-profile', help='DJANGO_MIDDLEWARE_PROFILE of the measured process')
+        parser.add_argument('--stage', help='DJANGO_STAGE of the measured process')
+        parser.add_argument('--runs', type=int, default=3, help='Processes to start; the fastest is reported (default: 3)')
+        parser.add_argument('--top', type=int, default=20, help='Slowest modules to list (default: 20)')
+        parser.add_argument('--json', action='store_true', help='Print the fastest run as JSON')
+
+    def measure(self, env):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-m', 'Playground.startup'],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode:
+            raise CommandError(f'Start-up probe failed:\n{result.stderr[-4000:]}')
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        report['imports'] = parse_importtime(result.stderr)
+        return report
+
+    def handle(self, *args, **options):
+        if options['profile'] and options['profile'] not in settings.APP_PROFILES:
+            raise CommandError(f"--profile must be one of: {', '.join(settings.APP_PROFILES)}")
+        env = dict(os.environ)
+        for option, variable in (('profile', 'DJANGO_APP_PROFILE'), ('middleware_profile', 'DJANGO_MIDDLEWARE_PROFILE'),
+                                 ('stage', 'DJANGO_STAGE')):
+            if options[option]:
+                env[variable] = options[option]
+        runs = [self.measure(env) for _ in range(max(options['runs'], 1))]
+        report = min(runs, key=lambda run: run['phases']['total'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        phases = report['phases']
+        write = self.stdout.write
+        write(self.style.MIGRATE_HEADING(
+            f"Stage {report['stage']}, app profile {report['app_profile']}, "
+            f"middleware profile {report['middleware_profile']} "
+            f"({len(report['installed_apps'])} apps, {len(report['middleware'])} middleware)"
+        ))
+        write(f"  {'import django':<20}{phases['import_django']:>9.1f} ms")
+        write(f"  {'settings':<20}{phases['settings']:>9.1f} ms")
+        write(f"  {'django.setup()':<20}{phases['setup']:>9.1f} ms  (logging {phases.get('logging', 0):.1f} ms)")
+        write(f"  {'WSGI handler':<20}{phases['wsgi_handler']:>9.1f} ms")
+        write(f"  {'URLconf':<20}{phases['urlconf']:>9.1f} ms")
+        write(f"  {'total':<20}{phases['total']:>9.1f} ms  (fastest of {len(runs)})")
+
+        write(self.style.MIGRATE_HEADING('Apps (ms)'))
+        write(f"  {'app':<32}{'import':>9}{'models':>9}{'ready':>9}")
+        for app in report['apps']:
+            write(f"  {app['app']:<32}{app['import']:>9.1f}{app['models']:>9.1f}{app['ready']:>9.1f}")
+
+        imports = report['imports']
+        by_package = defaultdict(lambda: [0, 0])
+        for module, own, _, _ in imports:
+            entry = by_package[package_of(module)]
+            entry[0] += own
+            entry[1] += 1
+        write(self.style.MIGRATE_HEADING(
+            f"Imports by package ({len(imports)} modules, {sum(own for _, own, _, _ in imports) / 1000:.1f} ms)"
+        ))
+        for package, (own, count) in sorted(by_package.items(), key=lambda item: -item[1][0])[:options['top']]:
+            write(f"  {package:<40}{own / 1000:>9.1f} ms  {count:>5} modules")
+
+        write(self.style.MIGRATE_HEADING('Slowest modules (self / cumulative ms)'))
+        for module, own, cumulative, _ in sorted(imports, key=lambda row: -row[1])[:options['top']]:
+            write(f"  {module:<56}{own / 1000:>8.1f}{cumulative / 1000:>9.1f}")
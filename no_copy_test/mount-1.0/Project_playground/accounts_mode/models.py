@@ -2,3 +2,15 @@ from django.db import models
 
 
 # Create your models here.
+
+class ContentVersion(models.Model):
+    """Edit counter of one model, behind the ETags of Playground.conditional.
+
+    Kept in the database rather than the cache so a bump made by one worker
+    process is seen by all of them, whatever the cache backend.
+    """
+    label = models.CharField(max_length=100, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.label} v{self.version}"
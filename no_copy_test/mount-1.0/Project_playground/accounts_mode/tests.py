@@ -1,3 +1,277 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from Playground.db_router import ReplicaPinningMiddleware, pin_to_primary
+from Playground import singleflight
+from Playground.middleware import PublicReadOnlyMiddleware
+from prob_statements.models import Frontend
 
 # Create your tests here.
+
+
+class AppProfileTests(SimpleTestCase):
+    """What a production worker imports, checked in a fresh interpreter."""
+
+    PROBE = (
+        'import json, sys\n'
+        'from django.core.wsgi import get_wsgi_application\n'
+        'from django.urls import get_resolver\n'
+        'get_wsgi_application()\n'
+        '# Workers import the URLconf on their first request.\n'
+        'get_resolver().url_patterns\n'
+        'print(json.dumps(sorted(m for m in sys.modules if m.startswith("django.contrib.admin"))))\n'
+    )
+
+    def test_web_profile_without_admin_never_imports_it(self):
+        with tempfile.TemporaryDirectory() as logs:
+            env = dict(
+                os.environ, DJANGO_SETTINGS_MODULE='Playground.settings', DJANGO_STAGE='prod',
+                DJANGO_APP_PROFILE='web', DJANGO_MIDDLEWARE_PROFILE='lean', DJANGO_ADMIN='0',
+                DJANGO_PROFILING='0', DJANGO_DB_ENGINE='sqlite', DJANGO_LOG_DIR=logs,
+                DJANGO_SECRET_KEY=settings.SECRET_KEY,
+            )
+            probe = subprocess.run([sys.executable, '-c', self.PROBE], cwd=settings.BASE_DIR, env=env,
+                                   capture_output=True, text=True, timeout=60)
+        self.assertEqual(probe.returncode, 0, probe.stderr)
+        self.assertEqual(json.loads(probe.stdout.splitlines()[-1]), [])
+
+
+class SingleFlightTests(SimpleTestCase):
+    """Playground/singleflight.py against the process-local cache."""
+
+    key = 'singleflight-test'
+    lock_key = f'{key}:singleflight-lock'
+
+    def setUp(self):
+        cache.clear()
+        singleflight.reset_metrics()
+        self.builds = 0
+
+    def builder(self, value='fresh', delay=0.0):
+        def build():
+            self.builds += 1
+            time.sleep(delay)
+            return value
+        return build
+
+    def test_concurrent_misses_build_once(self):
+        results = []
+        barrier = threading.Barrier(8)
+
+        def call():
+            barrier.wait()
+            results.append(singleflight.get_or_compute(self.key, self.builder(delay=0.2), ttl=60))
+
+        threads = [threading.Thread(target=call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['fresh'] * 8)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(singleflight.metrics()['coalesced_waits'], 7)
+
+    def test_wait_timeout_raises_instead_of_building_unlocked(self):
+        cache.add(self.lock_key, 'someone else', timeout=60)
+        with self.assertRaises(singleflight.BuildTimeout):
+            singleflight.get_or_compute(self.key, self.builder(), ttl=60, wait_timeout=0.1)
+        self.assertEqual(self.builds, 0)
+        self.assertEqual(singleflight.metrics()['wait_timeouts'], 1)
+
+    def test_waiter_takes_over_when_the_lock_is_released(self):
+        cache.add(self.lock_key, 'someone else', timeout=60)
+        threading.Timer(0.05, cache.delete, [self.lock_key]).start()
+        self.assertEqual(singleflight.get_or_compute(self.key, self.builder(), ttl=60, wait_timeout=2), 'fresh')
+        self.assertEqual(self.builds, 1)
+        self.assertIsNone(cache.get(self.lock_key))
+
+    def test_expired_value_is_served_stale_while_another_caller_rebuilds(self):
+        cache.set(self.key, ('stale', time.time() - 1, 0.0), timeout=60)
+        cache.add(self.lock_key, 'someone else', timeout=60)
+        self.assertEqual(singleflight.get_or_compute(self.key, self.builder(), ttl=60), 'stale')
+        self.assertEqual(self.builds, 0)
+        cache.delete(self.lock_key)
+        self.assertEqual(singleflight.get_or_compute(self.key, self.builder(), ttl=60), 'fresh')
+
+    def test_failed_rebuild_serves_the_stale_value(self):
+        cache.set(self.key, ('stale', time.time() - 1, 0.0), timeout=60)
+
+        def broken():
+            raise RuntimeError('database down')
+
+        self.assertEqual(singleflight.get_or_compute(self.key, broken, ttl=60), 'stale')
+        self.assertEqual(singleflight.metrics()['build_errors'], 1)
+        self.assertIsNone(cache.get(self.lock_key))
+
+
+class PublicReadOnlyMiddlewareTests(TestCase):
+    """The lean middleware profile (stage/prod default) must not log signed-in visitors out of public pages."""
+
+    def setUp(self):
+        self.seen = {}
+        self.middleware = PublicReadOnlyMiddleware(self.view)
+        self.user = get_user_model().objects.create_user('lean', password='x')
+
+    def view(self, request):
+        self.seen = {'user': request.user, 'session': hasattr(request, 'session')}
+        return HttpResponse()
+
+    def session_cookie(self):
+        self.client.force_login(self.user)
+        return {settings.SESSION_COOKIE_NAME: self.client.cookies[settings.SESSION_COOKIE_NAME].value}
+
+    def call(self, method, path, cookies=None):
+        request = getattr(RequestFactory(), method)(path)
+        request.COOKIES.update(cookies or {})
+        return self.middleware(request)
+
+    def test_anonymous_public_read_skips_sessions(self):
+        response = self.call('get', '/hobby/')
+        self.assertFalse(self.seen['session'])
+        self.assertFalse(self.seen['user'].is_authenticated)
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+
+    def test_signed_in_public_read_keeps_the_user(self):
+        self.call('get', '/hobby/', self.session_cookie())
+        self.assertTrue(self.seen['session'])
+        self.assertEqual(self.seen['user'], self.user)
+
+    def test_writes_and_private_paths_run_the_full_chain(self):
+        self.call('post', '/hobby/')
+        self.assertTrue(self.seen['session'])
+        self.call('get', '/profile/progress/', self.session_cookie())
+        self.assertEqual(self.seen['user'], self.user)
+
+    def test_lean_profile_keeps_the_user_end_to_end(self):
+        with self.settings(MIDDLEWARE=settings.MIDDLEWARE_PROFILES['lean']):
+            self.client.force_login(self.user)
+            response = self.client.get('/profile/progress/', HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user'], 'lean')
+
+
+REPLICA = 'replica_test'
+
+
+class ReplicaRouterTests(TransactionTestCase):
+    """Primary = the test database, replica = a second SQLite file copied from it.
+
+    A TransactionTestCase, since inside TestCase's transaction every read
+    stays on the primary.
+    """
+
+    def setUp(self):
+        if connections['default'].vendor != 'sqlite':
+            self.skipTest('needs the SQLite backend (DJANGO_DB_ENGINE=sqlite)')
+        self.tmp = Path(tempfile.mkdtemp())
+        self.replica_path = self.tmp / 'replica.sqlite3'
+        with sqlite3.connect(self.replica_path) as target:
+            connections['default'].ensure_connection()
+            connections['default'].connection.backup(target)
+        self.add_replica(self.replica_path)
+        # Rows only one side has tell which database answered a read. The primary's is written
+        # before the router is installed, so it does not pin the reads of the test itself.
+        Frontend.objects.create(question='on primary', difficulty='Easy')
+        self.replica_sql("INSERT INTO prob_statements_frontend (question, difficulty, created_at) "
+                         "VALUES ('on replica', 'Easy', '2024-01-01')")
+        # The alias is created per test, after TransactionTestCase decided which databases the class may use.
+        self.enterContext(mock.patch.object(type(self), 'databases', self.databases | {REPLICA}))
+        # Per test, so every test gets a new router and replica health starts clean.
+        self.enterContext(override_settings(
+            DB_REPLICA_ALIASES=[REPLICA], DB_REPLICA_SELECTION='round_robin', DB_REPLICA_RETRY_AFTER=30,
+            DB_REPLICA_PIN_SECONDS=0.2, DATABASE_ROUTERS=['Playground.db_router.ReplicaRouter'],
+        ))
+
+    def tearDown(self):
+        self.remove_replica()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def add_replica(self, path):
+        connections.settings[REPLICA] = dict(connections.settings['default'], NAME=str(path), TEST={})
+
+    def remove_replica(self):
+        if REPLICA in connections.settings:
+            connections[REPLICA].close()
+            del connections[REPLICA]
+            del connections.settings[REPLICA]
+
+    def replica_sql(self, sql):
+        with sqlite3.connect(self.replica_path) as conn:
+            conn.execute(sql)
+
+    @property
+    def pool(self):
+        return router.routers[0].pool
+
+    def questions(self):
+        return set(Frontend.objects.values_list('question', flat=True))
+
+    def in_request(self, view):
+        return ReplicaPinningMiddleware(view)(RequestFactory().get('/'))
+
+    def test_reads_go_to_the_replica(self):
+        seen = {}
+
+        def view(request):
+            seen['questions'] = self.questions()
+            return HttpResponse()
+
+        self.in_request(view)
+        self.assertEqual(seen['questions'], {'on replica'})
+
+    def test_read_your_writes_within_a_request(self):
+        seen = {}
+
+        def view(request):
+            Frontend.objects.create(question='just written', difficulty='Hard')
+            seen['questions'] = self.questions()
+            return HttpResponse()
+
+        self.in_request(view)
+        self.assertEqual(seen['questions'], {'on primary', 'just written'})
+        # The next request starts unpinned.
+        self.in_request(lambda request: seen.update(questions=self.questions()) or HttpResponse())
+        self.assertEqual(seen['questions'], {'on replica'})
+
+    def test_pin_outside_a_request_expires(self):
+        pin_to_primary()
+        self.assertEqual(self.questions(), {'on primary'})
+        time.sleep(0.25)
+        self.assertEqual(self.questions(), {'on replica'})
+
+    def test_replica_failing_mid_request_falls_back_to_primary(self):
+        seen = {}
+
+        def view(request):
+            seen['before'] = self.questions()
+            # The replica breaks under an open connection.
+            self.replica_sql('DROP TABLE prob_statements_frontend')
+            seen['after'] = self.questions()
+            return HttpResponse()
+
+        self.in_request(view)
+        self.assertEqual(seen['before'], {'on replica'})
+        self.assertEqual(seen['after'], {'on primary'})
+        self.assertEqual(self.pool.healthy(), [])
+
+    def test_unreachable_replica_falls_back_to_primary(self):
+        self.remove_replica()
+        self.add_replica(self.tmp / 'missing' / 'replica.sqlite3')
+        self.assertEqual(self.questions(), {'on primary'})
+        self.assertEqual(self.pool.healthy(), [])
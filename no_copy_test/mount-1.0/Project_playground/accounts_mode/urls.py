@@ -1,4 +1,3 @@
-from django.contrib import admin
 from django.urls import path
 from .views import modes
 from .views import employer_page, professional_page, hobby_page  # Import your views
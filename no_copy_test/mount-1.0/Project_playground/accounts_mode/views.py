@@ -1,14 +1,21 @@
 from django.shortcuts import render
 from django.http import HttpResponse
+
+from Playground.prerender import prerendered
+
 # Create your views here.
+@prerendered
 def modes(req):
     return render(req , 'acc_mode/trymodes.html')
 # views.py
+@prerendered
 def employer_page(request):
     return render(request, 'acc_mode/index.html')  # Render employer page template
 
+@prerendered
 def professional_page(request):
     return render(request, 'acc_mode/index.html')  # Render professional page template
 
+@prerendered
 def hobby_page(request):
     return render(request, 'acc_mode/index.html')  # Render hobby page template
\ No newline at end of file
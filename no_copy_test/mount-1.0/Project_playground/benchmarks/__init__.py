@@ -0,0 +1,13 @@
+"""
+Load-test and micro-benchmark suite for the Playground views.
+
+Run from the Django project root (the directory holding manage.py):
+
+    python -m benchmarks.run --modes wsgi,asgi,gunicorn --concurrency 1,4,16
+
+See benchmarks/run.py for all options. Per-view query counts and EXPLAIN
+plans are guarded by `python -m benchmarks.querycount`; gunicorn access
+logs are summarised by `python -m benchmarks.access_log`, and
+`python -m benchmarks.image_server` is a local image host for exercising
+`manage.py check_images`.
+"""
@@ -0,0 +1,303 @@
+"""
+Streaming analyzer for gunicorn access logs.
+
+Usage (from the directory holding manage.py):
+
+  python -m benchmarks.access_log logs/access.log* [--top 20] [--sort p95]
+                                  [--jobs 4] [--json]
+  python -m benchmarks.access_log logs/access.log --follow [--interval 5]
+
+- Reads plain or gzip-compressed (rotated) files line by line; memory is
+  bounded by the number of distinct paths (capped by --max-paths), not by
+  log size.
+- Several files are parsed in parallel, one process each, and their
+  summaries merged.
+- Latency comes from the trailing %(D)s (microseconds) field that
+  gunicorn.conf.py appends to access_log_format. Lines written without it
+  still count towards request rates.
+- Percentiles come from a log-bucketed histogram with ~1% relative error
+  that merges by adding bucket counts.
+- With --follow the file is tailed (surviving rotation) and the table is
+  reprinted every --interval seconds.
+"""
+import argparse
+import gzip
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+LINE_RE = re.compile(
+    r'^(?P<host>\S+) \S+ \S+ \[(?P<time>[^\]]+)\] '
+    r'"(?P<method>[A-Z]+) (?P<path>\S+)[^"]*" (?P<status>\d{3}) \S+ '
+    r'"[^"]*" "(?:[^"\\]|\\.)*"(?: (?P<micros>\d+))?\s*$'
+)
+TIME_FORMAT = '%d/%b/%Y:%H:%M:%S %z'
+
+# Numeric and hex-id path segments collapse so /x/17/ and /x/18/ share a row.
+ID_SEGMENT_RE = re.compile(r'/(?:\d+|[0-9a-f]{16,})(?=/|$)')
+
+OTHER_PATHS = '<other>'
+
+
+class LogHistogram:
+    """Mergeable latency histogram with logarithmic buckets (relative error ~alpha)."""
+
+    def __init__(self, alpha=0.01):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value, count=1):
+        value = max(value, 1e-3)
+        self.buckets[math.ceil(math.log(value) / self.log_gamma)] += count
+        self.count += count
+        self.total += value * count
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        self.buckets.update(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Midpoint of the bucket in relative terms.
+                return min(2 * self.gamma ** index / (self.gamma + 1), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+
+class PathStats:
+    """Counts, status classes, time span and latency histogram for one path."""
+
+    def __init__(self):
+        self.requests = 0
+        self.statuses = Counter()
+        self.first = None
+        self.last = None
+        self.latency = LogHistogram()
+
+    def add(self, status, timestamp, latency_ms):
+        self.requests += 1
+        self.statuses[f'{status[0]}xx'] += 1
+        if timestamp is not None:
+            self.first = timestamp if self.first is None else min(self.first, timestamp)
+            self.last = timestamp if self.last is None else max(self.last, timestamp)
+        if latency_ms is not None:
+            self.latency.add(latency_ms)
+
+    def merge(self, other):
+        self.requests += other.requests
+        self.statuses.update(other.statuses)
+        for bound in (other.first, other.last):
+            if bound is not None:
+                self.first = bound if self.first is None else min(self.first, bound)
+                self.last = bound if self.last is None else max(self.last, bound)
+        self.latency.merge(other.latency)
+        return self
+
+
+class Summary:
+    """Per-path statistics for one or more log files."""
+
+    def __init__(self, max_paths=500):
+        self.max_paths = max_paths
+        self.paths = {}
+        self.lines = 0
+        self.unparsed = 0
+
+    def _stats(self, path):
+        stats = self.paths.get(path)
+        if stats is None:
+            if len(self.paths) >= self.max_paths:
+                path = OTHER_PATHS
+                stats = self.paths.get(path)
+            if stats is None:
+                stats = self.paths[path] = PathStats()
+        return stats
+
+    def feed(self, line):
+        self.lines += 1
+        match = LINE_RE.match(line)
+        if match is None:
+            self.unparsed += 1
+            return
+        path = normalize_path(match['path'])
+        try:
+            timestamp = datetime.strptime(match['time'], TIME_FORMAT).timestamp()
+        except ValueError:
+            timestamp = None
+        latency_ms = int(match['micros']) / 1000 if match['micros'] else None
+        self._stats(f"{match['method']} {path}").add(match['status'], timestamp, latency_ms)
+
+    def merge(self, other):
+        self.lines += other.lines
+        self.unparsed += other.unparsed
+        for path, stats in other.paths.items():
+            if path in self.paths:
+                self.paths[path].merge(stats)
+            else:
+                self._stats(path).merge(stats)
+        return self
+
+    def rows(self):
+        rows = []
+        for path, stats in self.paths.items():
+            span = (stats.last - stats.first) if stats.first is not None else 0
+            hist = stats.latency
+            rows.append({
+                'path': path,
+                'requests': stats.requests,
+                'rps': round(stats.requests / span, 2) if span > 0 else None,
+                'errors_5xx': stats.statuses.get('5xx', 0),
+                'mean_ms': _round(hist.mean),
+                'p50_ms': _round(hist.quantile(0.50)),
+                'p95_ms': _round(hist.quantile(0.95)),
+                'p99_ms': _round(hist.quantile(0.99)),
+                'max_ms': _round(hist.max if hist.count else None),
+            })
+        return rows
+
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+
+def normalize_path(path):
+    path = path.split('?', 1)[0]
+    return ID_SEGMENT_RE.sub('/<id>', path)
+
+
+def open_log(filename):
+    if filename.endswith('.gz'):
+        return gzip.open(filename, 'rt', encoding='utf-8', errors='replace')
+    return open(filename, encoding='utf-8', errors='replace')
+
+
+def summarize_file(filename, max_paths=500):
+    summary = Summary(max_paths)
+    with open_log(filename) as fh:
+        for line in fh:
+            summary.feed(line)
+    return summary
+
+
+def summarize_files(filenames, jobs=None, max_paths=500):
+    """Parses every file (in parallel when there are several) and merges the results."""
+    total = Summary(max_paths)
+    if len(filenames) == 1 or jobs == 1:
+        for filename in filenames:
+            total.merge(summarize_file(filename, max_paths))
+        return total
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for summary in pool.map(summarize_file, filenames, [max_paths] * len(filenames)):
+            total.merge(summary)
+    return total
+
+
+def follow(filename, summary, interval, report):
+    """Tails `filename`, reopening it after rotation or truncation, and calls report() every interval."""
+    fh = None
+    inode = None
+    next_report = time.monotonic() + interval
+    partial = ''
+    try:
+        while True:
+            if time.monotonic() >= next_report:
+                report(summary)
+                next_report = time.monotonic() + interval
+            if fh is None:
+                try:
+                    fh = open(filename, encoding='utf-8', errors='replace')
+                    inode = os.fstat(fh.fileno()).st_ino
+                except FileNotFoundError:
+                    fh = None
+            if fh is not None:
+                chunk = fh.readline()
+                if chunk:
+                    partial += chunk
+                    if partial.endswith('\n'):
+                        summary.feed(partial)
+                        partial = ''
+                    continue
+                try:
+                    current = os.stat(filename)
+                    if current.st_ino != inode or current.st_size < fh.tell():
+                        fh.close()
+                        fh = None
+                        continue
+                except FileNotFoundError:
+                    pass
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        report(summary)
+    finally:
+        if fh is not None:
+            fh.close()
+
+
+def format_table(summary, sort, top):
+    rows = sorted(summary.rows(), key=lambda r: (r[sort] is not None, r[sort] or 0), reverse=True)[:top]
+    header = f"{'path':<52} {'reqs':>8} {'rps':>8} {'5xx':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    lines = [header, '-' * len(header)]
+    for r in rows:
+        cells = [r['rps'], r['p50_ms'], r['p95_ms'], r['p99_ms'], r['max_ms']]
+        rps, p50, p95, p99, peak = ('-' if c is None else c for c in cells)
+        lines.append(f"{r['path'][:52]:<52} {r['requests']:>8} {rps:>8} {r['errors_5xx']:>5} "
+                     f"{p50:>8} {p95:>8} {p99:>8} {peak:>8}")
+    lines.append(f'{summary.lines} lines, {summary.unparsed} unparsed (latencies in ms)')
+    return '\n'.join(lines)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Per-path request rates and latency percentiles from access logs.')
+    parser.add_argument('files', nargs='+', help='Access log files; .gz and rotated files are fine')
+    parser.add_argument('--top', type=int, default=20, help='Rows to show (default: 20)')
+    parser.add_argument('--sort', default='p95_ms',
+                        choices=['requests', 'rps', 'errors_5xx', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'])
+    parser.add_argument('--jobs', type=int, default=None, help='Parallel parser processes (default: CPU count)')
+    parser.add_argument('--max-paths', type=int, default=500,
+                        help='Distinct paths tracked before the rest are folded into <other>')
+    parser.add_argument('--json', action='store_true', help='Print rows as JSON instead of a table')
+    parser.add_argument('--follow', action='store_true', help='Tail the first file and report periodically')
+    parser.add_argument('--interval', type=float, default=5.0, help='Seconds between reports with --follow')
+    args = parser.parse_args(argv)
+
+    def report(summary):
+        if args.json:
+            print(json.dumps({'lines': summary.lines, 'unparsed': summary.unparsed, 'paths': summary.rows()},
+                             indent=2, sort_keys=True))
+        else:
+            print(format_table(summary, args.sort, args.top))
+        sys.stdout.flush()
+
+    if args.follow:
+        follow(args.files[0], Summary(args.max_paths), args.interval, report)
+        return 0
+    report(summarize_files(args.files, jobs=args.jobs, max_paths=args.max_paths))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
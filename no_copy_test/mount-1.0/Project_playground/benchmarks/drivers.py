@@ -0,0 +1,232 @@
+"""
+Request drivers: in-process WSGI, in-process ASGI and a local gunicorn.
+
+Every driver takes a path, a request count and a concurrency level and
+returns the record built by stats.summarize().
+"""
+import asyncio
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+
+from .stats import summarize
+
+HOST = 'localhost'
+
+
+def _split(total, parts):
+    """Splits `total` requests as evenly as possible over `parts` clients."""
+    base, extra = divmod(total, parts)
+    return [base + (1 if i < extra else 0) for i in range(parts)]
+
+
+# --- WSGI (in-process) ---
+
+def _wsgi_request(application, path):
+    status_holder = {}
+
+    def start_response(status, headers, exc_info=None):
+        status_holder['status'] = int(status.split(' ', 1)[0])
+        return lambda data: None
+
+    environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET', 'HTTP_HOST': HOST}
+    setup_testing_defaults(environ)
+    body = application(environ, start_response)
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return status_holder.get('status', 500)
+
+
+def run_wsgi(application, path, requests, concurrency):
+    """Calls the WSGI callable directly from `concurrency` threads."""
+    def client(count):
+        latencies, errors, cpu = [], 0, 0.0
+        for _ in range(count):
+            start, cpu_start = time.perf_counter(), time.thread_time()
+            status = _wsgi_request(application, path)
+            cpu += time.thread_time() - cpu_start
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors += 1
+        return latencies, errors, cpu
+
+    return _collect(client, requests, concurrency)
+
+
+# --- ASGI (in-process) ---
+
+async def _asgi_request(application, path):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'root_path': '',
+        'query_string': b'',
+        'headers': [(b'host', HOST.encode())],
+        'client': ('127.0.0.1', 0),
+        'server': ('127.0.0.1', 80),
+    }
+    status_holder = {}
+    request_sent = False
+    response_done = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Django listens for a client disconnect until the response is sent.
+        await response_done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status_holder['status'] = message['status']
+        elif message['type'] == 'http.response.body' and not message.get('more_body', False):
+            response_done.set()
+
+    await application(scope, receive, send)
+    return status_holder.get('status', 500)
+
+
+def run_asgi(application, path, requests, concurrency):
+    """Drives the ASGI callable with `concurrency` concurrent tasks."""
+    async def client(count, latencies, counters):
+        for _ in range(count):
+            start = time.perf_counter()
+            status = await _asgi_request(application, path)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                counters['errors'] += 1
+
+    async def main():
+        latencies, counters = [], {'errors': 0}
+        start = time.perf_counter()
+        await asyncio.gather(*(client(n, latencies, counters) for n in _split(requests, concurrency)))
+        return latencies, counters['errors'], time.perf_counter() - start
+
+    latencies, errors, wall = asyncio.run(main())
+    return summarize(latencies, wall, errors)
+
+
+# --- gunicorn (local HTTP) ---
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class GunicornServer:
+    """Starts gunicorn on a free local port for the lifetime of a `with` block."""
+
+    def __init__(self, project_dir, settings_module, workers=2, threads=4, extra_args=()):
+        self.project_dir = project_dir
+        self.settings_module = settings_module
+        self.workers = workers
+        self.threads = threads
+        self.extra_args = list(extra_args)
+        self.port = _free_port()
+        self.process = None
+
+    def __enter__(self):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=self.settings_module)
+        # Use the real gunicorn.conf.py (preload, hooks, recycling) with
+        # logs kept out of the project's logs/ directory.
+        command = [
+            sys.executable, '-m', 'gunicorn', 'Playground.wsgi:application',
+            '--config', os.path.join(self.project_dir, 'gunicorn.conf.py'),
+            '--bind', f'127.0.0.1:{self.port}',
+            '--access-logfile', os.devnull,
+            '--error-logfile', '-',
+            '--workers', str(self.workers),
+            '--threads', str(self.threads),
+            '--worker-class', 'gthread',
+            '--log-level', 'warning',
+            *self.extra_args,
+        ]
+        self.process = subprocess.Popen(command, cwd=self.project_dir, env=env,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError('gunicorn exited early:\n' + self.process.stderr.read().decode(errors='replace'))
+            try:
+                with socket.create_connection(('127.0.0.1', self.port), timeout=0.2):
+                    return self
+            except OSError:
+                time.sleep(0.1)
+        self.__exit__(None, None, None)
+        raise RuntimeError('gunicorn did not start listening within 30s')
+
+    def __exit__(self, *exc):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def run_http(port, path, requests, concurrency):
+    """Sends GET requests over keep-alive connections from `concurrency` threads."""
+    def client(count):
+        latencies, errors = [], 0
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        try:
+            reused = False
+            for _ in range(count):
+                start = time.perf_counter()
+                for attempt in range(2):
+                    try:
+                        conn.request('GET', path, headers={'Host': HOST})
+                        response = conn.getresponse()
+                        response.read()
+                        status = response.status
+                        reused = True
+                        break
+                    except (OSError, http.client.HTTPException):
+                        conn.close()
+                        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                        status = 599
+                        # The server may have closed an idle keep-alive connection
+                        # just as it was reused: retry once on a fresh one.
+                        if not reused:
+                            break
+                        reused = False
+                latencies.append(time.perf_counter() - start)
+                if status >= 400:
+                    errors += 1
+        finally:
+            conn.close()
+        return latencies, errors, None
+
+    return _collect(client, requests, concurrency)
+
+
+def _collect(client, requests, concurrency):
+    """Runs `client` on a thread pool and merges the per-thread results."""
+    latencies, errors, cpu = [], 0, 0.0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for lat, err, cpu_part in pool.map(client, _split(requests, concurrency)):
+            latencies.extend(lat)
+            errors += err
+            if cpu_part is None:
+                cpu = None
+            elif cpu is not None:
+                cpu += cpu_part
+    return summarize(latencies, time.perf_counter() - start, errors, cpu)
@@ -0,0 +1,139 @@
+"""
+Local HTTP stand-in for the image hosts behind domain.Image, for exercising
+`manage.py check_images` without touching the internet.
+
+    DJANGO_SETTINGS_MODULE=benchmarks.settings \\
+        python -m benchmarks.image_server --port 8099 --seed 100000 &
+    DJANGO_SETTINGS_MODULE=benchmarks.settings python manage.py check_images
+
+--seed replaces the Image rows of the benchmark database with N links to
+this server, spread over the paths below; without it the server only
+serves. HTTP/1.1 keep-alive, HEAD, Range and If-None-Match are supported.
+
+    /img/<name>       200 with an ETag, 304 when If-None-Match matches
+    /gone/<name>      404
+    /nohead/<name>    405 for HEAD, 206 for a GET with Range
+    /redirect/<name>  301 to /img/<name>
+    /flaky/<name>     503
+    /slow/<name>      200 after --slow-ms milliseconds
+
+Request and connection totals are printed on exit (Ctrl-C or SIGTERM).
+"""
+import argparse
+import asyncio
+import os
+import signal
+import sys
+from collections import Counter
+
+MIX = [('img', 90), ('gone', 4), ('nohead', 2), ('redirect', 2), ('flaky', 1), ('slow', 1)]
+BODY = b'\x89PNG\r\n\x1a\n' + b'\0' * 56
+
+
+class ImageServer:
+    def __init__(self, slow_ms=200):
+        self.slow_ms = slow_ms
+        self.stats = Counter()
+
+    async def handle(self, reader, writer):
+        self.stats['connections'] += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                self.stats['requests'] += 1
+                status, extra, body = await self.respond(method, target, headers)
+                self.stats[status] += 1
+                head = [f'HTTP/1.1 {status} X', f'Content-Length: {len(body)}', 'Content-Type: image/png']
+                head += [f'{k}: {v}' for k, v in extra.items()]
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    return
+        except (ConnectionError, ValueError):
+            return
+        finally:
+            writer.close()
+
+    async def respond(self, method, target, headers):
+        kind, _, name = target.lstrip('/').partition('/')
+        etag = f'"{name}-v1"'
+        if kind == 'gone':
+            return 404, {}, b''
+        if kind == 'flaky':
+            return 503, {}, b''
+        if kind == 'redirect':
+            return 301, {'Location': f'/img/{name}'}, b''
+        if kind == 'nohead' and method == 'HEAD':
+            return 405, {'Allow': 'GET'}, b''
+        if kind == 'slow':
+            await asyncio.sleep(self.slow_ms / 1000)
+        if kind not in ('img', 'nohead', 'slow'):
+            return 404, {}, b''
+        if headers.get('if-none-match') == etag:
+            return 304, {'ETag': etag}, b''
+        if headers.get('range') == 'bytes=0-0':
+            return 206, {'ETag': etag, 'Content-Range': f'bytes 0-0/{len(BODY)}'}, BODY[:1]
+        return 200, {'ETag': etag}, BODY
+
+
+def seed_images(base_url, count):
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    django.setup()
+    from django.core.management import call_command
+    from domain.models import Image
+
+    call_command('migrate', verbosity=0, interactive=False)
+    kinds = [kind for kind, weight in MIX for _ in range(weight)]
+    Image.objects.all().delete()
+    Image.objects.bulk_create(
+        [Image(title=f'Image {i}', image_url=f'{base_url}/{kinds[i % len(kinds)]}/{i}.png', idd=i)
+         for i in range(count)],
+        batch_size=1000,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--slow-ms', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0, metavar='N', help='Point N Image rows at this server first')
+    args = parser.parse_args(argv)
+
+    if args.seed:
+        seed_images(f'http://{args.host}:{args.port}', args.seed)
+        print(f'Seeded {args.seed} images', file=sys.stderr)
+
+    server = ImageServer(args.slow_ms)
+
+    async def serve():
+        srv = await asyncio.start_server(server.handle, args.host, args.port, backlog=1024)
+        print(f'Serving on http://{args.host}:{args.port}', file=sys.stderr)
+        stop = asyncio.Event()
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+        async with srv:
+            await stop.wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    print(dict(server.stats), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Per-request middleware overhead, before and after the lean profile.
+
+Usage (from the directory holding manage.py):
+
+  python -m benchmarks.middleware [--requests 2000] [--output middleware.json]
+
+Every endpoint is served in-process through three stacks: no middleware at
+all, settings.MIDDLEWARE_PROFILES['default'] with database sessions, and
+settings.MIDDLEWARE_PROFILES['lean'] with signed-cookie sessions. The
+overhead of a stack is its median latency minus the bare stack's median.
+"""
+import argparse
+import json
+import sys
+
+from .run import DEFAULT_ENDPOINTS, _csv, setup_django
+
+PROFILES = {
+    'none': {'MIDDLEWARE': []},
+    'default': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.fallback.FallbackStorage',
+    },
+    'lean': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.signed_cookies',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.cookie.CookieStorage',
+    },
+}
+
+
+def measure(endpoints, requests):
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test.utils import override_settings
+
+    from .drivers import run_wsgi
+
+    results = {}
+    for profile, overrides in PROFILES.items():
+        overrides = dict(overrides)
+        if 'MIDDLEWARE' not in overrides:
+            overrides['MIDDLEWARE'] = settings.MIDDLEWARE_PROFILES[profile]
+        with override_settings(**overrides):
+            handler = WSGIHandler()
+            for path in endpoints:
+                run_wsgi(handler, path, 20, 1)
+                results[(profile, path)] = run_wsgi(handler, path, requests, 1)
+
+    report = {}
+    for path in endpoints:
+        bare = results[('none', path)]['p50_ms']
+        report[path] = {
+            profile: {
+                'p50_ms': results[(profile, path)]['p50_ms'],
+                'overhead_us': round((results[(profile, path)]['p50_ms'] - bare) * 1000, 1),
+            }
+            for profile in PROFILES
+        }
+    return report
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Measure middleware overhead per request.')
+    parser.add_argument('--requests', type=int, default=2000, help='Requests per endpoint and profile')
+    parser.add_argument('--questions', type=int, default=50, help='Questions seeded per domain')
+    parser.add_argument('--endpoints', type=_csv, default=DEFAULT_ENDPOINTS, help='Comma separated paths')
+    parser.add_argument('--output', help='Write the JSON report here (default: stdout)')
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from .seed import seed
+    seed(questions=args.questions, images=args.questions)
+
+    payload = json.dumps(measure(args.endpoints, args.requests), indent=2)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            fh.write(payload + '\n')
+    else:
+        print(payload)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
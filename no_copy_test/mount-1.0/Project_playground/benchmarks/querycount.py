@@ -0,0 +1,259 @@
+"""
+Query-count regression guard and EXPLAIN capture for every routed view.
+
+Usage (from the directory holding manage.py):
+
+  python -m benchmarks.querycount [--sizes 10,100,500] [--output querycount.json]
+                                  [--baseline benchmarks/querycount_baseline.json]
+                                  [--update-baseline]
+
+- Walks every pattern in Playground/urls.py (admin and static excluded) and
+  fills route converters from SAMPLE_KWARGS, which point at seeded rows.
+- Seeds the benchmark database at each size and requests every path once
+  with a cold cache, recording each SQL statement it runs.
+- Runs EXPLAIN (EXPLAIN QUERY PLAN on SQLite) for every SELECT and flags
+  full table scans.
+
+A path fails when its query count changes between sizes (an N+1), when it
+runs more queries than the baseline, or when it does a full scan the
+baseline does not have. A route it cannot fill (a converter with no
+SAMPLE_KWARGS entry, or a regex pattern) fails by name. A routed path missing from the baseline, or a
+baseline path that is no longer routed, fails too: record new views with
+--update-baseline so the baseline keeps covering every path. Exit status
+is 1 on any failure, 2 when --baseline names a file that does not exist. The streaming
+export adds one query per QUESTION_EXPORT_CHUNK_SIZE rows, so keep the
+largest size below that setting.
+"""
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from .run import _csv, setup_django
+
+DEFAULT_SIZES = [10, 100, 500]
+
+# Values used for route converters, by keyword argument name. seed() gives every domain
+# questions with ids from 1 and stores submission 1.
+SAMPLE_KWARGS = {
+    'domain': 'frontend',
+    'difficulty': 'Easy',
+    'fmt': 'ndjson',
+    'pk': '1',
+    'question_id': '1',
+}
+
+SKIPPED_PREFIXES = ('admin/',)
+
+
+def walk_patterns(patterns=None, prefix=''):
+    """
+    Yields (path, name, missing) for every routable URL, filling converters
+    from SAMPLE_KWARGS. For a route that cannot be filled, path is the raw
+    route and missing lists what stopped it.
+    """
+    from django.conf import settings
+    from django.urls import URLPattern, URLResolver, get_resolver
+
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+    static_prefix = settings.STATIC_URL.lstrip('/')
+    for entry in patterns:
+        route = prefix + _route(entry.pattern)
+        if route.startswith(SKIPPED_PREFIXES) or (static_prefix and route.startswith(static_prefix)):
+            continue
+        if isinstance(entry, URLResolver):
+            yield from walk_patterns(entry.url_patterns, route)
+        elif isinstance(entry, URLPattern):
+            path, missing = _fill(route)
+            yield '/' + path, entry.name or entry.lookup_str, tuple(missing)
+
+
+def _route(pattern):
+    return str(getattr(pattern, '_route', pattern))
+
+
+def _fill(route):
+    """Replaces `<conv:name>` segments with sample values; returns (path, kwargs it had no sample for)."""
+    if route.startswith('^'):
+        return route, ['regex pattern']
+    missing = []
+
+    def replace(match):
+        name = match.group('name')
+        if name not in SAMPLE_KWARGS:
+            missing.append(name)
+            return match.group(0)
+        return SAMPLE_KWARGS[name]
+
+    return re.sub(r'<(?:(?P<conv>[^>:]+):)?(?P<name>[^>]+)>', replace, route), missing
+
+
+class QueryRecorder:
+    """connection.execute_wrapper() callable that keeps (sql, params) of every statement."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def explain(connection, sql, params):
+    """Returns (plan lines, full_scan) for a SELECT, or (None, False) for anything else."""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None, False
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        columns = [col[0] for col in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    if connection.vendor == 'sqlite':
+        plan = [row['detail'] for row in rows]
+        # "SCAN t" is a full scan; "SCAN t USING (COVERING) INDEX i" walks an index.
+        full_scan = any(line.startswith('SCAN ') and ' USING ' not in line for line in plan)
+    else:
+        plan = [json.dumps(row, default=str, sort_keys=True) for row in rows]
+        full_scan = any(str(row.get('type', '')).upper() == 'ALL' for row in rows)
+    return plan, full_scan
+
+
+def measure(path, client):
+    """Requests `path` once with a cold cache; returns its status and statements."""
+    from django.core.cache import cache
+    from django.db import connection
+
+    cache.clear()
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        response = client.get(path)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        response.close()
+
+    statements = []
+    for sql, params in recorder.statements:
+        plan, full_scan = explain(connection, sql, params)
+        statements.append({'sql': sql, 'plan': plan, 'full_scan': full_scan})
+    return {'status': response.status_code, 'queries': len(statements), 'statements': statements}
+
+
+def run(sizes):
+    from django.db import connection
+    from django.test import Client
+
+    from .seed import seed
+
+    setup_django()
+    client = Client(HTTP_HOST='localhost', raise_request_exception=False)
+    routes = sorted(set(walk_patterns()))
+    paths = [(path, name) for path, name, missing in routes if not missing]
+    report = {'vendor': None, 'sizes': sizes, 'paths': {},
+              'unfilled': {path: list(missing) for path, _, missing in routes if missing}}
+
+    for size in sizes:
+        seed(questions=size, images=size)
+        report['vendor'] = connection.vendor
+        for path, name in paths:
+            entry = report['paths'].setdefault(path, {'name': name, 'by_size': {}})
+            entry['by_size'][str(size)] = measure(path, client)
+            result = entry['by_size'][str(size)]
+            print(f'size={size} {path}: {result["queries"]} queries, status {result["status"]}', file=sys.stderr)
+
+    for entry in report['paths'].values():
+        results = list(entry['by_size'].values())
+        entry['queries'] = max(r['queries'] for r in results)
+        entry['full_scans'] = sorted({s['sql'] for r in results for s in r['statements'] if s['full_scan']})
+    return report
+
+
+def check(report, baseline=None):
+    """Returns a list of human readable failures."""
+    failures = [
+        f'{route}: no sample value for {", ".join(missing)} (add it to SAMPLE_KWARGS)'
+        for route, missing in sorted(report.get('unfilled', {}).items())
+    ]
+    for path, entry in report['paths'].items():
+        counts = {size: r['queries'] for size, r in entry['by_size'].items()}
+        if len(set(counts.values())) > 1:
+            failures.append(f'{path}: query count grows with data size {counts}')
+        errors = {size: r['status'] for size, r in entry['by_size'].items() if r['status'] >= 500}
+        if errors:
+            failures.append(f'{path}: server errors {errors}')
+
+        if baseline is None:
+            continue
+        base = baseline['paths'].get(path)
+        if base is None:
+            failures.append(f'{path}: not in the baseline (record it with --update-baseline)')
+            continue
+        if entry['queries'] > base['queries']:
+            failures.append(f'{path}: {entry["queries"]} queries (baseline {base["queries"]})')
+        if baseline.get('vendor') == report['vendor']:
+            for sql in sorted(set(entry['full_scans']) - set(base['full_scans'])):
+                failures.append(f'{path}: new full table scan: {sql}')
+    if baseline is not None:
+        for path in sorted(set(baseline['paths']) - set(report['paths'])):
+            failures.append(f'{path}: in the baseline but no longer routed (update the baseline)')
+    return failures
+
+
+def baseline_view(report):
+    """The parts of a report worth keeping as a baseline."""
+    return {
+        'vendor': report['vendor'],
+        'paths': {
+            path: {'queries': entry['queries'], 'full_scans': entry['full_scans']}
+            for path, entry in report['paths'].items()
+        },
+    }
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Guard per-view query counts and capture EXPLAIN plans.')
+    parser.add_argument('--sizes', type=lambda v: [int(s) for s in _csv(v)], default=DEFAULT_SIZES,
+                        help='Comma separated questions/images seeded per run (default: 10,100,500)')
+    parser.add_argument('--output', help='Write the full JSON report, plans included, here (default: stdout)')
+    parser.add_argument('--baseline', help='Baseline JSON to compare query counts and full scans against')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Store this run as the new baseline instead of comparing')
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes)
+    payload = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(payload + '\n')
+    else:
+        print(payload)
+
+    baseline = None
+    if args.baseline:
+        baseline_path = Path(args.baseline)
+        if args.update_baseline:
+            baseline_path.write_text(json.dumps(baseline_view(report), indent=2, sort_keys=True) + '\n')
+            print(f'Baseline written to {baseline_path}', file=sys.stderr)
+        elif not baseline_path.exists():
+            print(f'Baseline {baseline_path} not found; nothing was compared. '
+                  f'Record one with --update-baseline.', file=sys.stderr)
+            return 2
+        else:
+            baseline = json.loads(baseline_path.read_text())
+
+    failures = check(report, baseline)
+    for entry_path, entry in sorted(report['paths'].items()):
+        for sql in entry['full_scans']:
+            print(f'full scan {entry_path}: {sql}', file=sys.stderr)
+    if failures:
+        print('Query regressions:', file=sys.stderr)
+        for line in failures:
+            print(f'- {line}', file=sys.stderr)
+        return 1
+    print('No query regressions.', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,249 @@
+"""
+Benchmark runner for the Playground views.
+
+Usage (from the directory holding manage.py):
+
+  python -m benchmarks.run [--modes wsgi,asgi,gunicorn] [--concurrency 1,4,16]
+                           [--requests 200] [--questions 200] [--images 50]
+                           [--output benchmarks/results.json]
+                           [--baseline benchmarks/baseline.json] [--update-baseline]
+
+- Seeds a throwaway SQLite database (benchmarks.settings) with N questions
+  per domain and M images.
+- Drives every endpoint through the chosen modes and concurrency levels and
+  reports p50/p95/p99 latency and requests/second as JSON.
+- With --baseline, compares against the stored results and exits with
+  status 1 when any endpoint regresses beyond --tolerance (after up to
+  --confirm re-measurements of just those endpoints), or with status 2
+  when the baseline file is missing (create it with --update-baseline).
+
+Every report also records `calibration_ms`, the time a fixed pure-Python
+workload takes on the same machine in the same run. Baseline latencies and
+throughput are scaled by the ratio of the two calibrations before they are
+compared, so a baseline recorded on a faster or slower machine (or the
+committed benchmarks/baseline.json) still gates on relative changes.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_ENDPOINTS = [
+    '/',
+    '/employer/',
+    '/images/gallery/',
+    '/difficulty/difficulty/',
+    '/frontend-questions/frontend-questions/',
+    '/frontend-questions/summary/',
+]
+
+
+def _csv(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Benchmark the Playground views.')
+    parser.add_argument('--modes', type=_csv, default=['wsgi', 'asgi'],
+                        help='Comma separated drivers: wsgi, asgi, gunicorn (default: wsgi,asgi)')
+    parser.add_argument('--concurrency', type=lambda v: [int(c) for c in _csv(v)], default=[1, 4, 16],
+                        help='Comma separated concurrency levels (default: 1,4,16)')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint and level')
+    parser.add_argument('--warmup', type=int, default=10, help='Untimed requests per endpoint before measuring')
+    parser.add_argument('--questions', type=int, default=200, help='Questions seeded per domain')
+    parser.add_argument('--images', type=int, default=50, help='Images seeded')
+    parser.add_argument('--endpoints', type=_csv, default=DEFAULT_ENDPOINTS, help='Comma separated paths')
+    parser.add_argument('--gunicorn-workers', type=int, default=2)
+    parser.add_argument('--gunicorn-threads', type=int, default=4)
+    parser.add_argument('--output', help='Write the JSON report here (default: stdout)')
+    parser.add_argument('--baseline', help='Baseline JSON to compare against')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Store this run as the new baseline instead of comparing')
+    parser.add_argument('--tolerance', type=float, default=1.0,
+                        help='Allowed slowdown factor minus one, after calibration: p95 may grow and rps shrink '
+                             'by up to 1 + tolerance (default: 1.0, i.e. 2x; concurrent p95 is noisy)')
+    parser.add_argument('--confirm', type=int, default=2,
+                        help='Re-measure regressed endpoints up to this many times, keeping the best '
+                             'result, before reporting them (default: 2)')
+    parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                        help='Ignore p95 increases smaller than this many milliseconds (default: 2.0)')
+    return parser.parse_args(argv)
+
+
+def setup_django():
+    """Points Django at the benchmark settings and returns the WSGI/ASGI apps."""
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings'
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+    wsgi_app = get_wsgi_application()
+    return wsgi_app, get_asgi_application()
+
+
+def calibrate(rounds=7):
+    """Best-of-N milliseconds for a fixed CPU workload (dicts, strings, JSON), a yardstick for this machine."""
+    payload = [{'id': i, 'question': f'Question {i}', 'tags': ['a', 'b', 'c']} for i in range(2000)]
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(5):
+            decoded = json.loads(json.dumps(payload))
+            sorted(decoded, key=lambda row: row['question'])
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 3)
+
+
+def run(args, keys=None):
+    """Measures every endpoint/mode/level, or only the result `keys` given."""
+    from . import drivers
+    from .seed import seed
+
+    wsgi_app, asgi_app = setup_django()
+    seed(questions=args.questions, images=args.images)
+    # Drop the seeding connection so other processes see a quiet database.
+    from django.db import connections
+    connections.close_all()
+
+    report = {
+        'config': {
+            'questions_per_domain': args.questions,
+            'images': args.images,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'modes': args.modes,
+        },
+        'calibration_ms': calibrate(),
+        'results': {},
+    }
+
+    def wanted(mode, path=None):
+        return keys is None or any(key.startswith(f'{mode} ') and (path is None or key.endswith(f' {path}'))
+                                   for key in keys)
+
+    def measure(mode, call):
+        for path in args.endpoints:
+            if not wanted(mode, path):
+                continue
+            call(path, args.warmup, 1)
+            for level in args.concurrency:
+                key = f'{mode} c={level} {path}'
+                if keys is not None and key not in keys:
+                    continue
+                report['results'][key] = call(path, args.requests, level)
+                print(f'{key}: p95={report["results"][key]["p95_ms"]}ms '
+                      f'rps={report["results"][key]["rps"]}', file=sys.stderr)
+
+    if 'wsgi' in args.modes and wanted('wsgi'):
+        measure('wsgi', lambda p, n, c: drivers.run_wsgi(wsgi_app, p, n, c))
+    if 'asgi' in args.modes and wanted('asgi'):
+        measure('asgi', lambda p, n, c: drivers.run_asgi(asgi_app, p, n, c))
+    if 'gunicorn' in args.modes and wanted('gunicorn'):
+        with drivers.GunicornServer(PROJECT_DIR, 'benchmarks.settings',
+                                    workers=args.gunicorn_workers,
+                                    threads=args.gunicorn_threads) as server:
+            measure('gunicorn', lambda p, n, c: drivers.run_http(server.port, p, n, c))
+
+    report['profile'] = cpu_profile(report['results'])
+    return report
+
+
+def cpu_profile(results):
+    """Averages the single-client WSGI cpu_fraction into a CPU vs I/O profile."""
+    fractions = [r['cpu_fraction'] for key, r in results.items()
+                 if key.startswith('wsgi c=1 ') and 'cpu_fraction' in r]
+    if not fractions:
+        return {}
+    cpu_fraction = round(sum(fractions) / len(fractions), 3)
+    return {'cpu_fraction': cpu_fraction, 'io_fraction': round(1 - cpu_fraction, 3)}
+
+
+def compare(report, baseline, tolerance, min_delta_ms):
+    """Returns a list of human readable regressions against `baseline`, scaled by the calibration ratio."""
+    regressions = []
+    # > 1 when this machine (or run) is slower than the one that recorded the baseline.
+    speed = 1.0
+    if report.get('calibration_ms') and baseline.get('calibration_ms'):
+        speed = report['calibration_ms'] / baseline['calibration_ms']
+    for key, base in baseline.get('results', {}).items():
+        current = report['results'].get(key)
+        if current is None:
+            continue
+        base_p95 = base['p95_ms'] * speed
+        p95_limit = max(base_p95 * (1 + tolerance), base_p95 + min_delta_ms)
+        if current['p95_ms'] > p95_limit:
+            regressions.append(f'{key}: p95 {current["p95_ms"]}ms > {round(p95_limit, 3)}ms '
+                               f'(baseline {base["p95_ms"]}ms x{speed:.2f} calibration)')
+        base_rps = base['rps'] / speed
+        if base_rps and current['rps'] < base_rps / (1 + tolerance):
+            regressions.append(f'{key}: rps {current["rps"]} < {round(base_rps / (1 + tolerance), 2)} '
+                               f'(baseline {base["rps"]} /{speed:.2f} calibration)')
+        if current['errors'] > base.get('errors', 0):
+            regressions.append(f'{key}: {current["errors"]} errors (baseline {base.get("errors", 0)})')
+    return regressions
+
+
+def regressed_keys(regressions):
+    return {line.split(':', 1)[0] for line in regressions}
+
+
+def confirm(args, report, baseline):
+    """Re-measures regressed endpoints, keeping each one's best result; returns the remaining regressions."""
+    regressions = compare(report, baseline, args.tolerance, args.min_delta_ms)
+    for attempt in range(args.confirm):
+        if not regressions:
+            break
+        keys = regressed_keys(regressions)
+        print(f'Re-measuring {len(keys)} regressed result(s), attempt {attempt + 1}...', file=sys.stderr)
+        rerun = run(args, keys)
+        for key, result in rerun['results'].items():
+            best = report['results'][key]
+            best.update({
+                'p95_ms': min(best['p95_ms'], result['p95_ms']),
+                'rps': max(best['rps'], result['rps']),
+                'errors': min(best['errors'], result['errors']),
+            })
+        regressions = compare(report, baseline, args.tolerance, args.min_delta_ms)
+    return regressions
+
+
+def main(argv):
+    args = parse_args(argv)
+    report = run(args)
+    baseline_path = Path(args.baseline) if args.baseline else None
+    regressions = None
+    if baseline_path and not args.update_baseline and baseline_path.exists():
+        regressions = confirm(args, report, json.loads(baseline_path.read_text()))
+    payload = json.dumps(report, indent=2, sort_keys=True)
+
+    if args.output:
+        Path(args.output).write_text(payload + '\n')
+    else:
+        print(payload)
+
+    if baseline_path is None:
+        return 0
+    if args.update_baseline:
+        baseline_path.write_text(payload + '\n')
+        print(f'Baseline written to {baseline_path}', file=sys.stderr)
+        return 0
+    if regressions is None:
+        print(f'Baseline {baseline_path} not found; nothing was compared. '
+              f'Record one with --update-baseline.', file=sys.stderr)
+        return 2
+    if regressions:
+        print('Performance regressions:', file=sys.stderr)
+        for line in regressions:
+            print(f'- {line}', file=sys.stderr)
+        return 1
+    print('No performance regressions against baseline.', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,61 @@
+"""
+Seeds the benchmark database with N questions per domain, M images and one
+graded submission.
+
+Ids are set explicitly (questions and images from 1, submission 1), so the
+URLs benchmarks/querycount.py builds from them stay the same across reseeds.
+"""
+import random
+
+from django.core.management import call_command
+from django.utils import timezone
+
+DIFFICULTIES = ('Easy', 'Medium', 'Hard')
+
+
+def question_models():
+    """Returns the ten prob_statements question models."""
+    from prob_statements import models as pm
+    return [pm.Frontend, pm.Backend, pm.AI_ML, pm.Blockchain, pm.Data_science,
+            pm.Web_developement, pm.Mobile_app_dev, pm.Cybersecurity,
+            pm.Cloud_computing, pm.Dev_ops]
+
+
+def seed(questions=200, images=50, seed_value=1234):
+    """Migrates the database and replaces its rows with a deterministic data set."""
+    from domain.models import Image
+    from prob_statements.stats import reconcile
+    from solution.models import Submission
+
+    call_command('migrate', verbosity=0, interactive=False)
+    rng = random.Random(seed_value)
+
+    for model in question_models():
+        model.objects.all().delete()
+        model.objects.bulk_create(
+            [
+                model(
+                    pk=i + 1,
+                    question=f"{model.__name__} question {i}",
+                    description=f"Explain topic {rng.randint(0, 10_000)} in detail. " * rng.randint(1, 6),
+                    difficulty=DIFFICULTIES[i % len(DIFFICULTIES)],
+                )
+                for i in range(questions)
+            ],
+            batch_size=500,
+        )
+    # bulk_create skips the signals that maintain QuestionStats.
+    reconcile()
+
+    Image.objects.all().delete()
+    Image.objects.bulk_create(
+        [
+            Image(pk=i + 1, title=f"Domain {i}", image_url=f"https://example.com/img/{i}.png", idd=i)
+            for i in range(images)
+        ],
+        batch_size=500,
+    )
+
+    Submission.objects.all().delete()
+    Submission.objects.create(pk=1, domain='frontend', question_id=1, answer='Seeded answer',
+                              status=Submission.GRADED, score=1.0, graded_at=timezone.now())
@@ -0,0 +1,26 @@
+"""
+Settings used by the benchmark suite.
+
+Imports the real Playground settings and only swaps what is needed to run
+without the MySQL server: a throwaway SQLite file shared by every process
+(in-process drivers and gunicorn workers alike).
+"""
+import os
+
+from Playground.settings import *  # noqa: F401,F403
+from Playground.settings import BASE_DIR
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY') or 'benchmark-only-secret-key'
+
+# Benchmarks should measure what stage/prod serve, not the debug toolbar path.
+DEBUG = False
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('BENCH_DB', str(BASE_DIR / 'benchmarks' / 'bench.sqlite3')),
+    }
+}
+
+# Keep benchmark output clean: JSON logs only, no console echo.
+LOGGING['handlers']['queue']['console'] = False  # noqa: F405
@@ -0,0 +1,30 @@
+"""Latency statistics helpers shared by the benchmark drivers."""
+import math
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies, wall_seconds, errors=0, cpu_seconds=None):
+    """Builds the per-endpoint JSON record from raw latencies (seconds)."""
+    values = sorted(latencies)
+    count = len(values)
+    summary = {
+        'requests': count,
+        'errors': errors,
+        'rps': round(count / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        'mean_ms': round(sum(values) / count * 1000, 3) if count else 0.0,
+        'p50_ms': round(percentile(values, 50) * 1000, 3),
+        'p95_ms': round(percentile(values, 95) * 1000, 3),
+        'p99_ms': round(percentile(values, 99) * 1000, 3),
+        'max_ms': round(values[-1] * 1000, 3) if count else 0.0,
+    }
+    if cpu_seconds is not None and sum(values) > 0:
+        # Share of request time spent on-CPU; the rest is waiting on I/O.
+        summary['cpu_fraction'] = round(min(1.0, cpu_seconds / sum(values)), 3)
+    return summary
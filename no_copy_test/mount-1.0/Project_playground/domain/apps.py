@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class DomainConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "domain"
+
+    def ready(self):
+        from Playground.conditional import track_versions
+        from .models import Image
+
+        track_versions(Image)
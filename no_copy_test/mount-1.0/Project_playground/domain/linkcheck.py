@@ -0,0 +1,347 @@
+"""
+Concurrent health check of Image.image_url links.
+
+Every URL is checked by one coroutine, with at most `concurrency` in
+flight overall and `per_host` open connections per host. The client is a
+small HTTP/1.1 implementation on asyncio streams that keeps connections
+alive and reuses them per (scheme, host, port), so checking thousands of
+images on one CDN costs a handful of TCP/TLS handshakes rather than one
+per image.
+
+A check sends HEAD, and falls back to `GET` with `Range: bytes=0-0` when
+the server rejects HEAD (405/501 and friends). When an ETag is stored
+from an earlier run it is sent as If-None-Match, so an unchanged image
+answers 304 without a body. Redirects are followed up to MAX_REDIRECTS.
+
+404 and 410 mark a link broken at once; other failures (timeouts,
+connection errors, 5xx, 429) only after `failures_to_hide` consecutive
+runs, so a flaky host does not empty the gallery.
+"""
+import asyncio
+import ssl
+import time
+from collections import Counter
+from dataclasses import dataclass
+from urllib.parse import urljoin, urlsplit
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from Playground.conditional import bump_version
+
+from .models import Image
+
+MAX_REDIRECTS = 5
+MAX_HEADER_BYTES = 64 * 1024
+# Bodies up to this size are drained so the connection can be reused; larger ones close it.
+MAX_DRAIN_BYTES = 64 * 1024
+USER_AGENT = 'Playground-linkcheck/1.0'
+GONE = (404, 410)
+HEAD_REJECTED = (400, 403, 405, 406, 501)
+SAVE_BATCH = 500
+
+
+class HTTPError(Exception):
+    pass
+
+
+class InvalidURL(Exception):
+    pass
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict
+    reusable: bool
+
+
+@dataclass
+class Result:
+    pk: int
+    ok: bool
+    status: int = None
+    etag: str = ''
+    error: str = ''
+    definitive: bool = False  # a 404/410 (or a bad URL) rather than a possibly transient failure
+    unchanged: bool = False
+
+
+class Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def usable(self):
+        return not (self.writer.is_closing() or self.reader.at_eof())
+
+    def close(self):
+        self.writer.close()
+
+
+class HostPool:
+    """Keep-alive connections of one (scheme, host, port), at most `limit` open at a time."""
+
+    def __init__(self, scheme, host, port, limit, ssl_context, connect_timeout):
+        self.scheme, self.host, self.port = scheme, host, port
+        self.ssl_context = ssl_context
+        self.connect_timeout = connect_timeout
+        self.slots = asyncio.Semaphore(limit)
+        self.idle = []
+        self.opened = 0
+
+    async def acquire(self):
+        await self.slots.acquire()
+        while self.idle:
+            conn = self.idle.pop()
+            if conn.usable():
+                conn.reused = True
+                return conn
+            conn.close()
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(
+                self.host, self.port,
+                ssl=self.ssl_context if self.scheme == 'https' else None,
+                server_hostname=self.host if self.scheme == 'https' else None,
+                limit=MAX_HEADER_BYTES,
+            ), self.connect_timeout)
+        except BaseException:
+            self.slots.release()
+            raise
+        self.opened += 1
+        return Connection(reader, writer)
+
+    def release(self, conn, reusable):
+        if reusable and conn.usable():
+            self.idle.append(conn)
+        else:
+            conn.close()
+        self.slots.release()
+
+    def close(self):
+        for conn in self.idle:
+            conn.close()
+        self.idle.clear()
+
+
+class Client:
+    """Minimal HTTP/1.1 client: one HostPool per origin, HEAD and small GETs only."""
+
+    def __init__(self, per_host=4, timeout=10.0, verify_tls=True):
+        self.per_host = per_host
+        self.timeout = timeout
+        self.ssl_context = ssl.create_default_context()
+        if not verify_tls:
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+        self.pools = {}
+
+    def pool(self, scheme, host, port):
+        key = (scheme, host, port)
+        if key not in self.pools:
+            self.pools[key] = HostPool(scheme, host, port, self.per_host, self.ssl_context, self.timeout)
+        return self.pools[key]
+
+    async def request(self, method, url, headers=None):
+        try:
+            parts = urlsplit(url)
+            port = parts.port or (443 if parts.scheme == 'https' else 80)
+        except ValueError as exc:
+            raise InvalidURL(str(exc))
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise InvalidURL(f'Unsupported URL: {url}')
+        pool = self.pool(parts.scheme, parts.hostname, port)
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        host_header = parts.hostname if parts.port is None else f'{parts.hostname}:{parts.port}'
+        lines = [f'{method} {target} HTTP/1.1', f'Host: {host_header}', f'User-Agent: {USER_AGENT}',
+                 'Accept: image/*,*/*;q=0.5', 'Connection: keep-alive']
+        lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+        payload = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+        for attempt in range(2):
+            conn = await pool.acquire()
+            reusable = False
+            try:
+                response = await asyncio.wait_for(self._exchange(conn, method, payload), self.timeout)
+                reusable = response.reusable
+                return response
+            except (ConnectionError, asyncio.IncompleteReadError) as exc:
+                # The server may have closed an idle keep-alive connection; retry once on a fresh one.
+                if not conn.reused or attempt:
+                    raise HTTPError(f'{type(exc).__name__}: {exc}') from exc
+            except (asyncio.LimitOverrunError, ValueError) as exc:
+                raise HTTPError(f'Malformed response: {exc}') from exc
+            finally:
+                pool.release(conn, reusable)
+
+    async def _exchange(self, conn, method, payload):
+        conn.writer.write(payload)
+        await conn.writer.drain()
+        status_line = await conn.reader.readuntil(b'\r\n')
+        try:
+            version, status = status_line.decode('latin-1').split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise HTTPError(f'Malformed status line: {status_line[:80]!r}') from None
+        headers = {}
+        while True:
+            line = await conn.reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        reusable = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            return Response(status, headers, reusable)
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            reusable = reusable and await self._drain_chunked(conn.reader)
+        elif 'content-length' in headers:
+            length = int(headers['content-length'])
+            if length <= MAX_DRAIN_BYTES:
+                await conn.reader.readexactly(length)
+            else:
+                reusable = False
+        else:
+            reusable = False  # body runs until the server closes the connection
+        return Response(status, headers, reusable)
+
+    async def _drain_chunked(self, reader):
+        drained = 0
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            if size == 0:
+                while await reader.readuntil(b'\r\n') != b'\r\n':
+                    pass
+                return True
+            drained += size
+            if drained > MAX_DRAIN_BYTES:
+                return False
+            await reader.readexactly(size + 2)
+
+    async def fetch(self, url, etag=''):
+        """HEAD (or a one-byte GET when HEAD is refused), following redirects; returns (status, headers)."""
+        conditional = {'If-None-Match': etag} if etag else {}
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await self.request('HEAD', url, conditional)
+            if response.status in HEAD_REJECTED:
+                response = await self.request('GET', url, {'Range': 'bytes=0-0', **conditional})
+            location = response.headers.get('location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            return response.status, response.headers
+        raise HTTPError(f'More than {MAX_REDIRECTS} redirects')
+
+    def close(self):
+        for pool in self.pools.values():
+            pool.close()
+
+    @property
+    def connections_opened(self):
+        return sum(pool.opened for pool in self.pools.values())
+
+
+async def check_one(client, pk, url, etag):
+    try:
+        status, headers = await client.fetch(url, etag)
+    except InvalidURL as exc:
+        return Result(pk, ok=False, error=str(exc)[:255], definitive=True)
+    except asyncio.TimeoutError:
+        return Result(pk, ok=False, error=f'Timed out after {client.timeout}s')
+    except (OSError, HTTPError) as exc:
+        return Result(pk, ok=False, error=(str(exc) or type(exc).__name__)[:255])
+    if status == 304:
+        return Result(pk, ok=True, status=status, etag=etag, unchanged=True)
+    if 200 <= status < 300:
+        return Result(pk, ok=True, status=status, etag=headers.get('etag', '')[:255])
+    return Result(pk, ok=False, status=status, error=f'HTTP {status}', definitive=status in GONE)
+
+
+def _save(results, images, failures_to_hide):
+    """Writes one batch of results; returns how many images changed between shown and hidden."""
+    now = timezone.now()
+    flipped = 0
+    objs = []
+    for result in results:
+        image = images[result.pk]
+        image.link_checked_at = now
+        image.link_status = result.status
+        image.link_error = result.error
+        was_ok = image.link_ok
+        if result.ok:
+            image.link_ok = True
+            image.link_failures = 0
+            image.link_etag = result.etag
+        else:
+            image.link_failures = min(image.link_failures + 1, 32767)
+            if result.definitive or image.link_failures >= failures_to_hide:
+                image.link_ok = False
+                image.link_etag = ''
+        flipped += (was_ok is False) != (image.link_ok is False)
+        objs.append(image)
+    Image.objects.bulk_update(
+        objs, ['link_ok', 'link_status', 'link_etag', 'link_error', 'link_failures', 'link_checked_at'],
+    )
+    return flipped
+
+
+async def _check_all(images, concurrency, per_host, timeout, conditional, failures_to_hide, verify_tls, on_result):
+    client = Client(per_host=per_host, timeout=timeout, verify_tls=verify_tls)
+    counts = Counter()
+    pending = []
+    save = sync_to_async(_save, thread_sensitive=True)
+    queue = asyncio.Queue()
+    for image in images.values():
+        queue.put_nowait(image)
+
+    async def worker():
+        while True:
+            try:
+                image = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            result = await check_one(client, image.pk, image.image_url, image.link_etag if conditional else '')
+            counts['ok' if result.ok else 'failed'] += 1
+            counts['unchanged'] += result.unchanged
+            if on_result:
+                on_result(image, result)
+            pending.append(result)
+            if len(pending) >= SAVE_BATCH:
+                batch = pending[:]
+                pending.clear()
+                flipped = await save(batch, images, failures_to_hide)
+                counts['flipped'] += flipped  # not `+= await ...`: other workers update counts meanwhile
+
+    try:
+        # A fixed set of workers pulling from a queue keeps memory flat however many URLs there are.
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, len(images)) or 1)))
+        if pending:
+            counts['flipped'] += await save(pending, images, failures_to_hide)
+    finally:
+        client.close()
+        await sync_to_async(connections.close_all, thread_sensitive=True)()
+    counts['connections'] = client.connections_opened
+    return counts
+
+
+def check_images(concurrency=200, per_host=6, timeout=10.0, stale_after=None, limit=None, conditional=True,
+                 failures_to_hide=2, verify_tls=True, on_result=None):
+    """Checks image links and stores the results; returns a Counter of outcomes."""
+    queryset = Image.objects.only('image_url', 'link_ok', 'link_etag', 'link_failures').order_by('pk')
+    if stale_after is not None:
+        cutoff = timezone.now() - stale_after
+        queryset = queryset.filter(Q(link_checked_at__isnull=True) | Q(link_checked_at__lt=cutoff))
+    if limit:
+        queryset = queryset[:limit]
+    images = {image.pk: image for image in queryset.iterator(chunk_size=5000)}
+    start = time.perf_counter()
+    counts = asyncio.run(_check_all(images, concurrency, per_host, timeout, conditional, failures_to_hide,
+                                    verify_tls, on_result))
+    counts['checked'] = len(images)
+    counts['seconds'] = round(time.perf_counter() - start, 2)
+    if counts['flipped']:
+        bump_version(Image)
+    return counts
@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from domain.linkcheck import check_images
+
+
+class Command(BaseCommand):
+    help = "Checks every Image.image_url concurrently and records which links are broken (see domain/linkcheck.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=200, help='Checks in flight at once (default: 200)')
+        parser.add_argument('--per-host', type=int, default=6, help='Open connections per host (default: 6)')
+        parser.add_argument('--timeout', type=float, default=10.0, help='Seconds per request (default: 10)')
+        parser.add_argument('--stale-hours', type=float, default=None,
+                            help='Only check images not checked within this many hours')
+        parser.add_argument('--limit', type=int, default=0, help='Check at most this many images')
+        parser.add_argument('--failures-to-hide', type=int, default=2,
+                            help='Consecutive transient failures before an image is hidden (404/410 hide at once)')
+        parser.add_argument('--no-conditional', action='store_true', help='Do not send stored ETags')
+        parser.add_argument('--insecure', action='store_true', help='Do not verify TLS certificates')
+        parser.add_argument('--show-broken', action='store_true', help='Print every failed link')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['per_host'] < 1:
+            raise CommandError('--concurrency and --per-host must be at least 1')
+
+        def report(image, result):
+            if not result.ok:
+                self.stdout.write(f'  #{image.pk} {image.image_url}: {result.error}')
+
+        counts = check_images(
+            concurrency=options['concurrency'],
+            per_host=options['per_host'],
+            timeout=options['timeout'],
+            stale_after=timedelta(hours=options['stale_hours']) if options['stale_hours'] is not None else None,
+            limit=options['limit'] or None,
+            conditional=not options['no_conditional'],
+            failures_to_hide=options['failures_to_hide'],
+            verify_tls=not options['insecure'],
+            on_result=report if options['show_broken'] else None,
+        )
+        rate = counts['checked'] / counts['seconds'] if counts['seconds'] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {counts['checked']} image(s) in {counts['seconds']}s ({rate:.0f}/s): "
+            f"{counts['ok']} ok ({counts['unchanged']} unchanged), {counts['failed']} failed, "
+            f"{counts['flipped']} shown/hidden change(s), {counts['connections']} connection(s) opened"
+        ))
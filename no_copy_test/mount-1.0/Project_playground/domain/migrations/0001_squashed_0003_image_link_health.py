@@ -0,0 +1,48 @@
+# Generated by Django 5.1.15 on 2026-10-19 14:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    replaces = [
+        ("domain", "0001_initial"),
+        ("domain", "0002_image_idd"),
+        ("domain", "0003_image_link_health"),
+    ]
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Image",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("title", models.CharField(max_length=100)),
+                ("image_url", models.URLField()),
+                ("idd", models.IntegerField()),
+                (
+                    "link_checked_at",
+                    models.DateTimeField(blank=True, db_index=True, null=True),
+                ),
+                ("link_error", models.CharField(blank=True, max_length=255)),
+                ("link_etag", models.CharField(blank=True, max_length=255)),
+                ("link_failures", models.PositiveSmallIntegerField(default=0)),
+                ("link_ok", models.BooleanField(blank=True, null=True)),
+                (
+                    "link_status",
+                    models.PositiveSmallIntegerField(blank=True, null=True),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.15 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("domain", "0002_image_idd"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="image",
+            name="link_checked_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="image",
+            name="link_error",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="image",
+            name="link_etag",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="image",
+            name="link_failures",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="image",
+            name="link_ok",
+            field=models.BooleanField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="image",
+            name="link_status",
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
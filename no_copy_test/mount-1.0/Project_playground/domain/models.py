@@ -7,5 +7,14 @@ class Image(models.Model):
     title = models.CharField(max_length=100)  # Optional: Add a title for the image
     image_url = models.URLField()  # Store the image URL
     idd = models.IntegerField()
+    # Link health, written by `manage.py check_images` (domain/linkcheck.py).
+    # link_ok is None until the first check; the gallery hides link_ok=False.
+    link_ok = models.BooleanField(null=True, blank=True)
+    link_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    link_etag = models.CharField(max_length=255, blank=True)
+    link_error = models.CharField(max_length=255, blank=True)
+    link_failures = models.PositiveSmallIntegerField(default=0)
+    link_checked_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
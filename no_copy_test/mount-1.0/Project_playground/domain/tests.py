@@ -1,3 +1,106 @@
-from django.test import TestCase
+import asyncio
+import threading
+
+from django.test import TransactionTestCase
+
+from benchmarks.image_server import ImageServer
+
+from .linkcheck import check_images
+from .models import Image
 
 # Create your tests here.
+
+
+class ImageServerThread(threading.Thread):
+    """benchmarks/image_server.py on an ephemeral port, in a thread with its own event loop."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.server = ImageServer(slow_ms=0)
+        self.loop = asyncio.new_event_loop()
+        self.started = threading.Event()
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.srv = self.loop.run_until_complete(asyncio.start_server(self.server.handle, '127.0.0.1', 0))
+        self.port = self.srv.sockets[0].getsockname()[1]
+        self.started.set()
+        self.loop.run_forever()
+        self.srv.close()
+        self.loop.run_until_complete(self.srv.wait_closed())
+        self.loop.close()
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.join(timeout=5)
+
+
+class CheckImagesTests(TransactionTestCase):
+    """
+    check_images against the local image server.
+
+    A TransactionTestCase: results are saved from sync_to_async's thread, on
+    a connection of its own, which could not see rows of TestCase's open
+    transaction.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.http = ImageServerThread()
+        cls.http.start()
+        cls.http.started.wait(5)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.http.stop()
+        super().tearDownClass()
+
+    def setUp(self):
+        base = f'http://127.0.0.1:{self.http.port}'
+        for idd, kind in enumerate(['img', 'gone', 'nohead', 'redirect', 'flaky']):
+            Image.objects.create(title=kind, image_url=f'{base}/{kind}/{idd}.png', idd=idd)
+
+    def check(self):
+        return check_images(concurrency=4, per_host=2, timeout=5, failures_to_hide=2)
+
+    def image(self, title):
+        return Image.objects.get(title=title)
+
+    def test_first_run_stores_each_outcome(self):
+        counts = self.check()
+        self.assertEqual((counts['checked'], counts['ok'], counts['failed']), (5, 3, 2))
+
+        img = self.image('img')
+        self.assertEqual((img.link_ok, img.link_status, img.link_etag), (True, 200, '"0.png-v1"'))
+        gone = self.image('gone')
+        self.assertEqual((gone.link_ok, gone.link_status, gone.link_error), (False, 404, 'HTTP 404'))
+        # HEAD is refused with 405; the one-byte GET fallback answers 206.
+        nohead = self.image('nohead')
+        self.assertEqual((nohead.link_ok, nohead.link_status, nohead.link_etag), (True, 206, '"2.png-v1"'))
+        # The 301 is followed to /img/.
+        redirect = self.image('redirect')
+        self.assertEqual((redirect.link_ok, redirect.link_status, redirect.link_etag), (True, 200, '"3.png-v1"'))
+        # One 503 is not enough to hide an image.
+        flaky = self.image('flaky')
+        self.assertEqual((flaky.link_ok, flaky.link_status, flaky.link_failures), (None, 503, 1))
+        for image in (img, gone, nohead, redirect, flaky):
+            self.assertIsNotNone(image.link_checked_at)
+
+    def test_second_run_revalidates_with_stored_etags(self):
+        self.check()
+        counts = self.check()
+        self.assertEqual(counts['unchanged'], 3)
+        for title in ('img', 'nohead', 'redirect'):
+            image = self.image(title)
+            self.assertEqual((image.link_ok, image.link_status), (True, 304), title)
+            self.assertTrue(image.link_etag)
+        # The second consecutive 503 hides the flaky image.
+        flaky = self.image('flaky')
+        self.assertEqual((flaky.link_ok, flaky.link_failures), (False, 2))
+
+    def test_gallery_hides_broken_links(self):
+        self.check()
+        response = self.client.get('/images/gallery/', HTTP_HOST='localhost')
+        titles = [image.title for image in response.context['images']]
+        self.assertEqual(sorted(titles), ['flaky', 'img', 'nohead', 'redirect'])
@@ -3,9 +3,12 @@ from django.shortcuts import render
 # Create your views here.
 # views.py
 from django.shortcuts import render
+from Playground.conditional import conditional_page
 from .models import Image
 
+@conditional_page(Image)
 def image_gallery(request):
-    # Fetch all image links from the database
-    images = Image.objects.all()
+    # Fetch all image links from the database, minus ones check_images found broken.
+    # Nearly every row matches, so this is a table scan whatever the indexes; only read what the page shows.
+    images = Image.objects.exclude(link_ok=False).only('title', 'image_url')
     return render(request, 'domain/gallery.html', {'images': images})
\ No newline at end of file
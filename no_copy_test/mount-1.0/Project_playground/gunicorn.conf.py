@@ -0,0 +1,247 @@
+"""
+Gunicorn configuration for Playground.
+
+Loaded automatically when gunicorn is started from this directory, or
+explicitly with `gunicorn --config gunicorn.conf.py`. Every knob can be
+overridden from the environment (see EnvironmentConfiguration.sh).
+
+- preload_app: the Django app is imported once in the master, so workers
+  share its memory copy-on-write.
+- Workers/threads are sized from a measured CPU vs I/O profile (the
+  "profile" block written by `python -m benchmarks.run`), falling back to
+  the CPU count when no profile exists.
+- Workers are recycled after max_requests (with jitter) or as soon as their
+  resident memory crosses GUNICORN_MAX_RSS_MB.
+- With preload_app the master also loads the URLconf (importing every view)
+  and compiles the templates once, so new and recycled workers inherit
+  them; post_worker_init opens one DB connection per thread (and compiles
+  templates itself when not preloading) before the worker accepts traffic.
+- Access/error log writes happen on a queue listener thread
+  (Playground.gunicorn_logging.QueueLogger), and worker_exit flushes the
+  Django log queues before a worker goes away.
+"""
+import json
+import multiprocessing
+import os
+import threading
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def _env_flag(name, default):
+    value = os.environ.get(name)
+    if value in (None, ''):
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+# --- CPU vs I/O profile ---
+
+def load_cpu_fraction():
+    """Share of request time spent on-CPU, from GUNICORN_CPU_FRACTION or the benchmark report."""
+    if os.environ.get('GUNICORN_CPU_FRACTION'):
+        return float(os.environ['GUNICORN_CPU_FRACTION'])
+    profile_path = os.environ.get('GUNICORN_PROFILE', os.path.join(BASE_DIR, 'benchmarks', 'results.json'))
+    try:
+        with open(profile_path) as fh:
+            return float(json.load(fh)['profile']['cpu_fraction'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def size_pool(cpu_cores, cpu_fraction, max_workers, max_threads):
+    """
+    Returns (workers, threads) for a gthread pool.
+
+    CPU-bound requests gain nothing from extra threads under the GIL, so they
+    get ~one process per core. I/O-bound requests keep a thread busy for only
+    `cpu_fraction` of their lifetime, so each worker can overlap ~1/fraction
+    requests.
+    """
+    if cpu_fraction is None:
+        # Unmeasured: the classic 2*cores+1 with a modest thread count.
+        return max(2, min(max_workers, 2 * cpu_cores + 1)), min(max_threads, 4)
+    cpu_fraction = min(1.0, max(cpu_fraction, 1.0 / max_threads))
+    threads = max(1, min(max_threads, int(round(1.0 / cpu_fraction))))
+    workers = cpu_cores + 1 if cpu_fraction >= 0.5 else 2 * cpu_cores + 1
+    return max(2, min(max_workers, workers)), threads
+
+
+CPU_CORES = _env_int('CPU_CORES', multiprocessing.cpu_count())
+CPU_FRACTION = load_cpu_fraction()
+_auto_workers, _auto_threads = size_pool(
+    CPU_CORES,
+    CPU_FRACTION,
+    max_workers=_env_int('GUNICORN_MAX_WORKERS', 8),
+    max_threads=_env_int('GUNICORN_MAX_THREADS', 16),
+)
+
+# --- Server ---
+
+wsgi_app = 'Playground.wsgi:application'
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+backlog = _env_int('BACKLOG', 2048)
+worker_class = 'gthread'
+workers = _env_int('WORKERS', _auto_workers)
+threads = _env_int('THREADS', _auto_threads)
+keepalive = _env_int('KEEPALIVE', 5)
+timeout = _env_int('GUNICORN_TIMEOUT', 120)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+_tmp_dir = os.environ.get('TMPDIR', '/dev/shm')
+worker_tmp_dir = _tmp_dir if os.path.isdir(_tmp_dir) else None
+
+reload = _env_flag('RELOAD', False)
+# The reloader re-imports code in the worker, which defeats preloading.
+preload_app = _env_flag('GUNICORN_PRELOAD', True) and not reload
+
+# --- Recycling ---
+
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 2000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10)
+MAX_RSS_MB = _env_int('GUNICORN_MAX_RSS_MB', 512)
+RSS_CHECK_EVERY = _env_int('GUNICORN_RSS_CHECK_EVERY', 20)
+
+# --- Logging ---
+
+loglevel = os.environ.get('LOG_LEVEL', 'info')
+accesslog = os.environ.get('ACCESS_LOG', os.path.join('logs', 'access.log'))
+errorlog = os.environ.get('ERROR_LOG', os.path.join('logs', 'error.log'))
+# gunicorn's default format plus the request time in microseconds, which
+# `python -m benchmarks.access_log` turns into per-path percentiles.
+access_log_format = os.environ.get(
+    'ACCESS_LOG_FORMAT',
+    '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" %(D)s',
+)
+logger_class = 'Playground.gunicorn_logging.QueueLogger'
+# Application logs go through Django LOGGING (Playground/log.py); stray
+# print()s are only redirected into errorlog when asked for, since those
+# writes are synchronous.
+capture_output = _env_flag('GUNICORN_CAPTURE_OUTPUT', False)
+enable_stdio_inheritance = True
+
+for _log in (accesslog, errorlog):
+    if _log and _log != '-' and os.path.dirname(_log):
+        os.makedirs(os.path.dirname(_log), exist_ok=True)
+
+
+# --- Memory helpers ---
+
+def current_rss_mb():
+    """Resident set size of this process in MiB (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and KiB on Linux.
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# --- Warm-up ---
+
+def warm_templates():
+    """Compiles every template once so the cached loader is populated before traffic."""
+    from django.template import engines
+    from django.template.exceptions import TemplateDoesNotExist, TemplateSyntaxError
+
+    count = 0
+    for engine in engines.all():
+        dirs = list(getattr(engine, 'template_dirs', ()))
+        for root in dirs:
+            for base, _, names in os.walk(root):
+                for name in names:
+                    if not name.endswith(('.html', '.txt')):
+                        continue
+                    template_name = os.path.relpath(os.path.join(base, name), root)
+                    try:
+                        engine.get_template(template_name)
+                        count += 1
+                    except (TemplateDoesNotExist, TemplateSyntaxError):
+                        pass
+    return count
+
+
+def warm_db_connections(thread_pool, thread_count):
+    """
+    Opens a DB connection inside each request thread of the worker.
+
+    Django connections are per-thread, so the tasks wait on a barrier to make
+    sure every pool thread runs exactly one of them.
+    """
+    from django.db import connections
+
+    barrier = threading.Barrier(thread_count)
+
+    def open_connections():
+        for conn in connections.all():
+            conn.ensure_connection()
+        try:
+            barrier.wait(timeout=10)
+        except threading.BrokenBarrierError:
+            pass
+
+    futures = [thread_pool.submit(open_connections) for _ in range(thread_count)]
+    for future in futures:
+        future.result(timeout=30)
+
+
+# --- Server hooks ---
+
+def when_ready(server):
+    profile = f'cpu_fraction={CPU_FRACTION}' if CPU_FRACTION is not None else 'unmeasured'
+    server.log.info('Pool: %s workers x %s threads (%s cores, profile %s, preload=%s)',
+                    server.cfg.workers, server.cfg.threads, CPU_CORES, profile, server.cfg.preload_app)
+    if server.cfg.preload_app:
+        from django.urls import get_resolver
+        resolver = get_resolver()
+        resolver.url_patterns
+        resolver.reverse_dict
+        server.log.info('Preloaded URLconf and %s templates', warm_templates())
+
+
+def pre_fork(server, worker):
+    # Never hand a socket opened in the preloaded master to a child.
+    if server.cfg.preload_app:
+        from django.db import connections
+        connections.close_all()
+
+
+def post_worker_init(worker):
+    try:
+        # Preloaded workers inherit the master's compiled templates (see when_ready).
+        templates = 0 if worker.cfg.preload_app else warm_templates()
+        tpool = getattr(worker, 'tpool', None)
+        if tpool is not None:
+            warm_db_connections(tpool, worker.cfg.threads)
+        worker.log.info('Worker %s warmed %s templates and %s DB thread(s)',
+                        worker.pid, templates, worker.cfg.threads if tpool is not None else 0)
+    except Exception as exc:  # warm-up must never stop a worker from serving
+        worker.log.warning('Worker %s warm-up failed: %s', worker.pid, exc)
+
+
+def post_request(worker, req, environ, resp):
+    worker._rss_requests = getattr(worker, '_rss_requests', 0) + 1
+    if worker._rss_requests % RSS_CHECK_EVERY:
+        return
+    rss = current_rss_mb()
+    if rss > MAX_RSS_MB and worker.alive:
+        worker.log.info('Worker %s RSS %.0f MiB exceeds %s MiB; recycling after in-flight requests',
+                        worker.pid, rss, MAX_RSS_MB)
+        worker.alive = False
+
+
+def worker_exit(server, worker):
+    # Write out buffered progress counters, then whatever the log listener
+    # threads still hold (the flush may log).
+    from interface_profile import progress
+    progress.stop()
+    from Playground.log import stop_listeners
+    stop_listeners()
@@ -1,3 +1,11 @@
 from django.contrib import admin
 
 # Register your models here.
+from .models import ProgressCounter
+
+
+@admin.register(ProgressCounter)
+class ProgressCounterAdmin(admin.ModelAdmin):
+    list_display = ('user', 'domain', 'difficulty', 'viewed', 'attempted', 'last_seen')
+    list_filter = ('domain', 'difficulty')
+    search_fields = ('user__username',)
@@ -1,3 +1,24 @@
+from django.conf import settings
 from django.db import models
 
 # Create your models here.
+
+class ProgressCounter(models.Model):
+    """How many questions one user viewed and attempted in one domain and difficulty.
+
+    Written in batches by interface_profile.progress, never per request.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='progress_counters')
+    domain = models.CharField(max_length=20)
+    difficulty = models.CharField(max_length=10)
+    viewed = models.PositiveIntegerField(default=0)
+    attempted = models.PositiveIntegerField(default=0)
+    last_seen = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'domain', 'difficulty'], name='progress_counter_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.domain}/{self.difficulty}: {self.viewed} viewed, {self.attempted} attempted"
@@ -0,0 +1,240 @@
+"""
+Write-behind per-user progress counters.
+
+record_view() / record_attempt() only add to an in-memory buffer of this
+worker process, keyed by (user, domain, difficulty), so a page view costs a
+dict update rather than a database write. The buffer is written out as one
+multi-row upsert that increments ProgressCounter rows:
+
+- when it holds PROGRESS_FLUSH_SIZE events (in the recording thread),
+- every PROGRESS_FLUSH_INTERVAL seconds (by a daemon flusher thread),
+- at interpreter exit and from gunicorn's worker_exit hook (flush()).
+
+MySQL uses INSERT ... ON DUPLICATE KEY UPDATE, SQLite and PostgreSQL
+INSERT ... ON CONFLICT DO UPDATE; other backends fall back to
+bulk_create(ignore_conflicts=True) plus one UPDATE per key. A failed flush
+puts its events back and is retried, up to PROGRESS_MAX_PENDING keys.
+
+summary() reads ProgressCounter plus the buffer of the worker serving
+the request, so a user sees their own activity from that worker at once.
+Counts still buffered in *other* workers are not visible until those
+flush: with several gunicorn workers a summary can lag by up to
+PROGRESS_FLUSH_INTERVAL seconds (or PROGRESS_FLUSH_SIZE events) of
+activity served elsewhere. It is eventually exact, never double counted.
+
+A worker that is killed outright (SIGKILL, OOM) loses at most one
+interval's worth of counts; these are activity statistics, not a ledger.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from prob_statements.domains import DIFFICULTIES, DOMAIN_MODELS
+
+from .models import ProgressCounter
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressBuffer:
+    """Pending counter increments of one process, flushed in batches."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._events = 0
+        self._last_flush = time.monotonic()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def add(self, user_id, domain, difficulty, viewed=0, attempted=0):
+        now = timezone.now()
+        with self._lock:
+            entry = self._pending.setdefault((user_id, domain, difficulty), [0, 0, now])
+            entry[0] += viewed
+            entry[1] += attempted
+            entry[2] = now
+            self._events += 1
+            due = self._events >= settings.PROGRESS_FLUSH_SIZE
+        self._ensure_thread()
+        if due:
+            self.flush()
+
+    def pending_for(self, user_id):
+        """{(domain, difficulty): (viewed, attempted)} buffered for this user in this process only."""
+        with self._lock:
+            return {(d, lvl): (v, a) for (uid, d, lvl), (v, a, _) in self._pending.items() if uid == user_id}
+
+    def _take(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._events = 0
+            self._last_flush = time.monotonic()
+        return pending
+
+    def _put_back(self, pending):
+        with self._lock:
+            for key, (viewed, attempted, seen) in pending.items():
+                if key not in self._pending and len(self._pending) >= settings.PROGRESS_MAX_PENDING:
+                    logger.warning('Progress buffer full; dropping counts for %s', key)
+                    continue
+                entry = self._pending.setdefault(key, [0, 0, seen])
+                entry[0] += viewed
+                entry[1] += attempted
+                entry[2] = max(entry[2], seen)
+                self._events += 1
+
+    def flush(self):
+        """Writes everything buffered so far; returns how many counter rows were upserted."""
+        with self._flush_lock:
+            pending = self._take()
+            if not pending:
+                return 0
+            try:
+                write_counters(pending)
+            except Exception:
+                logger.exception('Could not flush %s progress counter(s); will retry', len(pending))
+                self._put_back(pending)
+                return 0
+            return len(pending)
+
+    # --- Time-based flushing ---
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='progress-flusher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        interval = settings.PROGRESS_FLUSH_INTERVAL
+        while not self._stop.wait(interval / 2):
+            if self._pending and time.monotonic() - self._last_flush >= interval:
+                self.flush()
+        connection.close()
+
+    def stop(self):
+        """Stops the flusher thread and writes what is left."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+        connection.close()
+
+
+def write_counters(pending):
+    """Adds {(user_id, domain, difficulty): [viewed, attempted, last_seen]} to ProgressCounter."""
+    rows = sorted(pending.items())  # a fixed order keeps concurrent upserts from deadlocking
+    vendor = connection.vendor
+    if vendor not in ('mysql', 'sqlite', 'postgresql'):
+        _write_portable(rows)
+        return
+    qn = connection.ops.quote_name
+    table = qn(ProgressCounter._meta.db_table)
+    columns = ['user_id', 'domain', 'difficulty', 'viewed', 'attempted', 'last_seen']
+    values = ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(rows))
+    if vendor == 'mysql':
+        conflict = (
+            ' ON DUPLICATE KEY UPDATE {v} = {v} + VALUES({v}), {a} = {a} + VALUES({a}), {s} = VALUES({s})'
+        )
+    else:
+        conflict = (
+            ' ON CONFLICT ({u}, {d}, {lvl}) DO UPDATE SET'
+            ' {v} = {t}.{v} + excluded.{v}, {a} = {t}.{a} + excluded.{a}, {s} = excluded.{s}'
+        )
+    sql = f"INSERT INTO {table} ({', '.join(qn(c) for c in columns)}) VALUES {values}" + conflict.format(
+        t=table, u=qn('user_id'), d=qn('domain'), lvl=qn('difficulty'),
+        v=qn('viewed'), a=qn('attempted'), s=qn('last_seen'),
+    )
+    params = []
+    for (user_id, domain, difficulty), (viewed, attempted, seen) in rows:
+        params += [user_id, domain, difficulty, viewed, attempted,
+                   connection.ops.adapt_datetimefield_value(seen)]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def _write_portable(rows):
+    with transaction.atomic():
+        ProgressCounter.objects.bulk_create(
+            [ProgressCounter(user_id=u, domain=d, difficulty=lvl) for (u, d, lvl), _ in rows],
+            ignore_conflicts=True,
+        )
+        for (user_id, domain, difficulty), (viewed, attempted, seen) in rows:
+            ProgressCounter.objects.filter(user_id=user_id, domain=domain, difficulty=difficulty).update(
+                viewed=F('viewed') + viewed, attempted=F('attempted') + attempted, last_seen=seen,
+            )
+
+
+_buffer = ProgressBuffer()
+
+
+def record_view(user, domain, difficulty, count=1):
+    if user.is_authenticated and count:
+        _buffer.add(user.pk, domain, difficulty, viewed=count)
+
+
+def record_attempt(user, domain, difficulty):
+    if user.is_authenticated:
+        _buffer.add(user.pk, domain, difficulty, attempted=1)
+
+
+def flush():
+    return _buffer.flush()
+
+
+def stop():
+    _buffer.stop()
+
+
+def summary(user):
+    """
+    {domain: {difficulty: {'viewed', 'attempted'}, 'total': {...}}} from one query plus this worker's buffer.
+
+    Other workers' unflushed counts are missing (see the module docstring).
+    """
+    result = {
+        domain: {difficulty: {'viewed': 0, 'attempted': 0} for difficulty in DIFFICULTIES}
+        for domain in DOMAIN_MODELS
+    }
+    # No flush of this worker may land between the two reads, or its counts would show twice or not at all.
+    with _buffer._flush_lock:
+        stored = list(
+            ProgressCounter.objects.filter(user=user).values_list('domain', 'difficulty', 'viewed', 'attempted')
+        )
+        pending = _buffer.pending_for(user.pk)
+    for domain, difficulty, viewed, attempted in stored:
+        extra_viewed, extra_attempted = pending.pop((domain, difficulty), (0, 0))
+        counts = result.setdefault(domain, {}).setdefault(difficulty, {'viewed': 0, 'attempted': 0})
+        counts['viewed'] = viewed + extra_viewed
+        counts['attempted'] = attempted + extra_attempted
+    for (domain, difficulty), (viewed, attempted) in pending.items():
+        counts = result.setdefault(domain, {}).setdefault(difficulty, {'viewed': 0, 'attempted': 0})
+        counts['viewed'] += viewed
+        counts['attempted'] += attempted
+    for counts in result.values():
+        counts['total'] = {
+            'viewed': sum(counts[d]['viewed'] for d in counts),
+            'attempted': sum(counts[d]['attempted'] for d in counts),
+        }
+    return result
+
+
+def _reset_after_fork():
+    # The parent's buffer, locks and flusher thread are not ours to use.
+    global _buffer
+    _buffer = ProgressBuffer()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+atexit.register(stop)
@@ -0,0 +1,6 @@
+from . import views
+from django.urls import path
+
+urlpatterns = [
+    path('progress/', views.progress_summary, name='progress_summary'),
+]
@@ -1,3 +1,17 @@
+from django.http import JsonResponse
 from django.shortcuts import render
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET
+
+from . import progress
 
 # Create your views here.
+
+# views.py
+@require_GET
+@never_cache
+def progress_summary(request):
+    """The signed-in user's viewed/attempted counts per domain and difficulty."""
+    if not request.user.is_authenticated:
+        return JsonResponse({'error': 'authentication required'}, status=401)
+    return JsonResponse({'user': request.user.get_username(), 'progress': progress.summary(request.user)})
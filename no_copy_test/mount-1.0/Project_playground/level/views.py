@@ -4,25 +4,36 @@ from django.shortcuts import render
 # views.py
 from django.shortcuts import render
 
+from Playground.prerender import prerendered
 
 
+@prerendered
 def difficulty1(request):
     return render(request, 'lev/f.html')
+@prerendered
 def difficulty2(request):
     return render(request, 'lev/ai.html')
+@prerendered
 def difficulty3(request):
     return render(request, 'lev/b.html')
+@prerendered
 def difficulty4(request):
     return render(request, 'lev/ds.html')
+@prerendered
 def difficulty5(request):
     return render(request, 'lev/w.html')
+@prerendered
 def difficulty6(request):
     return render(request, 'lev/m.html')
+@prerendered
 def difficulty7(request):
     return render(request, 'lev/cs.html')
+@prerendered
 def difficulty8(request):
     return render(request, 'lev/c.html')
+@prerendered
 def difficulty9(request):
     return render(request, 'lev/dev.html')
+@prerendered
 def difficulty10(request):
     return render(request, 'lev/blc.html')
\ No newline at end of file
@@ -3,10 +3,21 @@
 import os
 import sys
 
+# Commands that serve no pages start with the lean "cli" app profile (no
+# admin, messages or staticfiles) unless DJANGO_APP_PROFILE says otherwise.
+CLI_PROFILE_COMMANDS = {
+    "check_images",
+    "find_duplicates",
+    "reconcile_question_stats",
+    "run_graders",
+}
+
 
 def main():
     """Run administrative tasks."""
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Playground.settings")
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_PROFILE_COMMANDS:
+        os.environ.setdefault("DJANGO_APP_PROFILE", "cli")
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class ProbStatementsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "prob_statements"
+
+    def ready(self):
+        from Playground.conditional import track_versions
+        from . import stats
+        from .domains import DOMAIN_MODELS
+
+        track_versions(*DOMAIN_MODELS.values())
+        stats.connect_signals()
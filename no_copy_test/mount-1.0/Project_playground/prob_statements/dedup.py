@@ -0,0 +1,307 @@
+"""
+Near-duplicate questions across the domain tables, with MinHash and LSH.
+
+- Each question's `question` + `description` is normalised (lower case,
+  punctuation collapsed) and cut into character SHINGLE_SIZE-grams. Its
+  signature is the minimum of NUM_PERM universal hashes over those
+  shingles, so the fraction of equal signature values estimates the
+  Jaccard similarity of two questions.
+- Signatures are stored in QuestionSignature with a hash of the
+  normalised text; update_signatures() only re-signs questions whose text
+  changed (or that are new) and drops rows of deleted questions. Signing
+  runs in a process pool kept busy across domains (chunks of the next
+  domain are submitted while the previous one's are still hashing), and
+  with numpy (listed in requirements.txt) a whole batch of questions is
+  hashed in one vectorised step. Without numpy the same signatures are
+  computed in pure Python, which is fine for thousands of questions but
+  not millions.
+- find_clusters() splits every signature into BANDS bands; questions that
+  share any band land in the same bucket, only those candidate pairs are
+  compared, and pairs at or above the threshold are merged with
+  union-find. With 16 bands of 8 rows, pairs around 0.7 similarity become
+  candidates about half the time and pairs above 0.85 almost always.
+
+Changing NUM_PERM, SHINGLE_SIZE or SEED changes SIGNATURE_VERSION, which is
+part of the stored content hash, so the next update re-signs everything.
+"""
+import hashlib
+import itertools
+import random
+import re
+import struct
+import zlib
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.db import connections, transaction
+
+from .domains import DOMAIN_MODELS
+from .export import iter_domain_batches
+from .models import QuestionSignature
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+SEED = 1
+SIGNATURE_VERSION = f'minhash:{NUM_PERM}:{SHINGLE_SIZE}:{SEED}'
+
+MERSENNE = (1 << 61) - 1
+MASK32 = 0xFFFFFFFF
+MASK64 = (1 << 64) - 1
+SIGNATURE_FORMAT = f'<{NUM_PERM}I'
+
+_rng = random.Random(SEED)
+PERM_A = [_rng.randrange(1, 1 << 32) for _ in range(NUM_PERM)]
+PERM_B = [_rng.randrange(0, 1 << 32) for _ in range(NUM_PERM)]
+
+# Documents hashed per numpy step: bounds the (NUM_PERM x shingles) matrix.
+NUMPY_BATCH = 256
+
+NON_WORD_RE = re.compile(r'[^a-z0-9+#]+')
+
+
+def normalize(question, description):
+    return NON_WORD_RE.sub(' ', f'{question or ""} {description or ""}'.lower()).strip()
+
+
+def content_hash(text):
+    return hashlib.sha1(f'{SIGNATURE_VERSION}\0{text}'.encode()).hexdigest()
+
+
+def shingle_hashes(text):
+    """crc32 of every distinct SHINGLE_SIZE-byte shingle (of the whole text when it is shorter)."""
+    data = text.encode()
+    if len(data) <= SHINGLE_SIZE:
+        return {zlib.crc32(data)}
+    return {zlib.crc32(data[i:i + SHINGLE_SIZE]) for i in range(len(data) - SHINGLE_SIZE + 1)}
+
+
+# --- Signing ---
+
+def _signature_py(hashes):
+    # The & MASK64 reproduces numpy's uint64 wrap-around, so both paths agree bit for bit.
+    return struct.pack(SIGNATURE_FORMAT, *(
+        min((((a * x + b) & MASK64) % MERSENNE) & MASK32 for x in hashes)
+        for a, b in zip(PERM_A, PERM_B)
+    ))
+
+
+def _signatures_np(hash_sets):
+    perm_a = np.array(PERM_A, dtype=np.uint64)[:, None]
+    perm_b = np.array(PERM_B, dtype=np.uint64)[:, None]
+    lengths = [len(hashes) for hashes in hash_sets]
+    flat = np.fromiter(itertools.chain.from_iterable(hash_sets), dtype=np.uint64, count=sum(lengths))
+    offsets = np.zeros(len(lengths), dtype=np.intp)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    values = ((perm_a * flat[None, :] + perm_b) % np.uint64(MERSENNE)) & np.uint64(MASK32)
+    mins = np.minimum.reduceat(values, offsets, axis=1).T.astype('<u4')
+    return [row.tobytes() for row in mins]
+
+
+def signatures(texts):
+    """MinHash signatures (NUM_PERM little-endian uint32, as bytes) of normalised texts."""
+    hash_sets = [shingle_hashes(text) for text in texts]
+    if np is None:
+        return [_signature_py(hashes) for hashes in hash_sets]
+    result = []
+    for start in range(0, len(hash_sets), NUMPY_BATCH):
+        result += _signatures_np(hash_sets[start:start + NUMPY_BATCH])
+    return result
+
+
+def sign_chunk(rows):
+    """[(question_id, content_hash, text)] -> [(question_id, content_hash, signature)]. Runs in worker processes."""
+    sigs = signatures([text for _, _, text in rows])
+    return [(pk, digest, sig) for (pk, digest, _), sig in zip(rows, sigs)]
+
+
+def _save(domain, signed, replace):
+    with transaction.atomic():
+        stale = [pk for pk, _, _ in signed if pk in replace]
+        for start in range(0, len(stale), 1000):
+            QuestionSignature.objects.filter(domain=domain, question_id__in=stale[start:start + 1000]).delete()
+        QuestionSignature.objects.bulk_create(
+            [QuestionSignature(domain=domain, question_id=pk, content_hash=digest, signature=sig)
+             for pk, digest, sig in signed],
+            batch_size=500,
+        )
+
+
+def update_signatures(domains=None, workers=1, chunk_size=2000, rebuild=False):
+    """Signs new and changed questions; returns counts of 'signed', 'unchanged' and 'deleted' rows."""
+    counts = Counter()
+    pool = None
+    if workers > 1:
+        # Workers only hash; they must not share this process's database connections.
+        connections.close_all()
+        pool = ProcessPoolExecutor(max_workers=workers)
+    # Chunks still hashing, by the domain they belong to; one window for all domains.
+    in_flight = {}
+    stored_by_domain = {}
+
+    def collect(done):
+        for future in done:
+            domain = in_flight.pop(future)
+            signed = future.result()
+            _save(domain, signed, stored_by_domain[domain])
+            counts['signed'] += len(signed)
+
+    try:
+        for domain in domains or DOMAIN_MODELS:
+            if rebuild:
+                QuestionSignature.objects.filter(domain=domain).delete()
+                stored = {}
+            else:
+                stored = dict(QuestionSignature.objects.filter(domain=domain)
+                              .values_list('question_id', 'content_hash'))
+            stored_by_domain[domain] = stored
+            seen = set()
+
+            for _, batch in iter_domain_batches([domain], chunk_size=chunk_size):
+                todo = []
+                for pk, question, description, *_ in batch:
+                    seen.add(pk)
+                    text = normalize(question, description)
+                    digest = content_hash(text)
+                    if stored.get(pk) == digest:
+                        counts['unchanged'] += 1
+                    else:
+                        todo.append((pk, digest, text))
+                if not todo:
+                    continue
+                if pool is None:
+                    signed = sign_chunk(todo)
+                    _save(domain, signed, stored)
+                    counts['signed'] += len(signed)
+                    continue
+                in_flight[pool.submit(sign_chunk, todo)] = domain
+                if len(in_flight) >= 2 * workers:
+                    collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+
+            # Rows of deleted questions are never among the chunks still in flight.
+            gone = sorted(set(stored) - seen)
+            for start in range(0, len(gone), 1000):
+                QuestionSignature.objects.filter(domain=domain, question_id__in=gone[start:start + 1000]).delete()
+            counts['deleted'] += len(gone)
+        collect(wait(in_flight).done)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return counts
+
+
+# --- Clustering ---
+
+class UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i, j):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+
+def _band_groups_np(matrix):
+    """Index arrays of rows sharing a band, for every band (numpy path)."""
+    rng = np.random.default_rng(SEED)
+    mix = rng.integers(1, 1 << 63, size=ROWS, dtype=np.uint64) | np.uint64(1)
+    for band in range(BANDS):
+        # A 64-bit key per row and band; colliding keys are only candidates, so rare false merges are harmless.
+        keys = (matrix[:, band * ROWS:(band + 1) * ROWS].astype(np.uint64) * mix).sum(axis=1)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        sizes = np.diff(np.r_[starts, len(keys)])
+        for start, size in zip(starts[sizes > 1], sizes[sizes > 1]):
+            yield order[start:start + size]
+
+
+def _band_groups_py(sigs):
+    width = ROWS * 4
+    for band in range(BANDS):
+        buckets = defaultdict(list)
+        for index, sig in enumerate(sigs):
+            buckets[sig[band * width:(band + 1) * width]].append(index)
+        for members in buckets.values():
+            if len(members) > 1:
+                yield members
+
+
+def find_clusters(threshold=0.7, domains=None, max_bucket=500):
+    """Groups of (domain, question_id) whose estimated similarity is at least `threshold`, largest first.
+
+    Buckets larger than `max_bucket` (boilerplate every question shares) are
+    only compared against their first member instead of pairwise.
+    """
+    queryset = QuestionSignature.objects.all()
+    if domains:
+        queryset = queryset.filter(domain__in=domains)
+    keys, sigs = [], []
+    for domain, question_id, sig in queryset.order_by('domain', 'question_id').values_list(
+            'domain', 'question_id', 'signature').iterator(chunk_size=5000):
+        keys.append((domain, question_id))
+        sigs.append(bytes(sig))
+    if not keys:
+        return []
+
+    uf = UnionFind(len(keys))
+    if np is not None:
+        matrix = np.frombuffer(b''.join(sigs), dtype='<u4').reshape(len(sigs), NUM_PERM)
+        for group in _band_groups_np(matrix):
+            if len({uf.find(i) for i in group}) == 1:
+                continue
+            if len(group) > max_bucket:
+                similar = (matrix[group] == matrix[group[0]]).mean(axis=1) >= threshold
+                for i in group[similar]:
+                    uf.union(group[0], i)
+                continue
+            block = matrix[group]
+            similar = (block[:, None, :] == block[None, :, :]).mean(axis=2) >= threshold
+            for a, b in zip(*np.nonzero(np.triu(similar, k=1))):
+                uf.union(group[a], group[b])
+    else:
+        values = [struct.unpack(SIGNATURE_FORMAT, sig) for sig in sigs]
+
+        def similarity(i, j):
+            return sum(x == y for x, y in zip(values[i], values[j])) / NUM_PERM
+
+        for group in _band_groups_py(sigs):
+            if len({uf.find(i) for i in group}) == 1:
+                continue
+            pairs = ((group[0], j) for j in group[1:]) if len(group) > max_bucket \
+                else itertools.combinations(group, 2)
+            for i, j in pairs:
+                if uf.find(i) != uf.find(j) and similarity(i, j) >= threshold:
+                    uf.union(i, j)
+
+    clusters = defaultdict(list)
+    for index, key in enumerate(keys):
+        clusters[uf.find(index)].append(key)
+    return sorted((members for members in clusters.values() if len(members) > 1),
+                  key=lambda members: (-len(members), members))
+
+
+def question_texts(keys):
+    """{(domain, question_id): question} for the given keys, one query per domain."""
+    wanted = defaultdict(list)
+    for domain, question_id in keys:
+        wanted[domain].append(question_id)
+    texts = {}
+    for domain, ids in wanted.items():
+        for pk, question in DOMAIN_MODELS[domain].objects.filter(pk__in=ids).values_list('pk', 'question'):
+            texts[(domain, pk)] = question
+    return texts
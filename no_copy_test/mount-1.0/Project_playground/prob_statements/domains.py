@@ -0,0 +1,50 @@
+"""
+Registry of the ten question domains, keyed by URL slug.
+
+Every domain has its own table with the same columns (question,
+description, difficulty, created_at); code that works across domains goes
+through DOMAIN_MODELS instead of naming the models one by one.
+"""
+from django.http import Http404
+
+from .models import (AI_ML, Backend, Blockchain, Cloud_computing, Cybersecurity, Data_science, Dev_ops,
+                     Frontend, Mobile_app_dev, Web_developement)
+
+DOMAIN_MODELS = {
+    'frontend': Frontend,
+    'backend': Backend,
+    'web': Web_developement,
+    'blockchain': Blockchain,
+    'mobile': Mobile_app_dev,
+    'datasci': Data_science,
+    'devops': Dev_ops,
+    'cyber': Cybersecurity,
+    'aiml': AI_ML,
+    'cloud': Cloud_computing,
+}
+
+DIFFICULTIES = ('Easy', 'Medium', 'Hard')
+
+
+def domain_for_model(model):
+    """Slug of a question model (or instance)."""
+    model = model._meta.concrete_model
+    for slug, candidate in DOMAIN_MODELS.items():
+        if candidate is model:
+            return slug
+    raise KeyError(model)
+
+
+def get_domain_model(slug):
+    """Model for `slug`, or 404."""
+    try:
+        return DOMAIN_MODELS[slug]
+    except KeyError:
+        raise Http404(f"Unknown domain '{slug}'")
+
+
+def check_difficulty(difficulty):
+    """Validates a difficulty filter (None means any), or 404."""
+    if difficulty is not None and difficulty not in DIFFICULTIES:
+        raise Http404(f"Unknown difficulty '{difficulty}'")
+    return difficulty
@@ -0,0 +1,77 @@
+"""
+Streaming NDJSON/CSV export of questions.
+
+Rows are read in keyset-paginated batches (WHERE id > last ORDER BY id
+LIMIT n) rather than with a single cursor: MySQLdb buffers a whole result
+set client-side even under QuerySet.iterator(), whereas each keyset batch
+is an index range scan and only one batch is ever held in memory. Each
+batch is encoded and yielded as one chunk, so the first bytes leave the
+worker after the first query.
+"""
+import csv
+import io
+import json
+
+from django.conf import settings
+
+from .domains import DOMAIN_MODELS
+
+FIELDS = ('id', 'question', 'description', 'difficulty', 'created_at')
+
+
+def iter_batches(queryset, chunk_size):
+    """Yields lists of FIELDS tuples from `queryset` in primary key order."""
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).order_by('pk').values_list(*FIELDS)[:chunk_size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1][0]
+        if len(batch) < chunk_size:
+            return
+
+
+def iter_domain_batches(domains, difficulty=None, chunk_size=None):
+    """Yields (domain, batch) for each domain slug in turn."""
+    chunk_size = chunk_size or settings.QUESTION_EXPORT_CHUNK_SIZE
+    for slug in domains:
+        queryset = DOMAIN_MODELS[slug].objects.all()
+        if difficulty:
+            queryset = queryset.filter(difficulty=difficulty)
+        for batch in iter_batches(queryset, chunk_size):
+            yield slug, batch
+
+
+def ndjson_stream(domains, difficulty=None, chunk_size=None):
+    for slug, batch in iter_domain_batches(domains, difficulty, chunk_size):
+        yield ''.join(
+            json.dumps({
+                'domain': slug,
+                'id': pk,
+                'question': question,
+                'description': description,
+                'difficulty': level,
+                'created_at': created_at.isoformat() if created_at else None,
+            }) + '\n'
+            for pk, question, description, level, created_at in batch
+        )
+
+
+def csv_stream(domains, difficulty=None, chunk_size=None):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow(('domain',) + FIELDS)
+    yield flush()
+    for slug, batch in iter_domain_batches(domains, difficulty, chunk_size):
+        for pk, question, description, level, created_at in batch:
+            writer.writerow((slug, pk, question, description or '', level,
+                             created_at.isoformat() if created_at else ''))
+        yield flush()
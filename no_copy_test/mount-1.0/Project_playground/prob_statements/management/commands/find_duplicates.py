@@ -0,0 +1,61 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from prob_statements import dedup
+from prob_statements.domains import DOMAIN_MODELS
+
+
+class Command(BaseCommand):
+    help = "Reports clusters of near-duplicate questions across the domain tables (MinHash/LSH, see prob_statements/dedup.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, default=0.7,
+                            help='Minimum estimated Jaccard similarity of two duplicates (default: 0.7)')
+        parser.add_argument('--domain', action='append', dest='domains', choices=sorted(DOMAIN_MODELS),
+                            help='Only these domains (repeatable; default: all)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Signing processes')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Questions read and signed per batch')
+        parser.add_argument('--rebuild', action='store_true', help='Re-sign every question, ignoring stored signatures')
+        parser.add_argument('--skip-update', action='store_true', help='Cluster the stored signatures as they are')
+        parser.add_argument('--cross-domain', action='store_true', help='Only report clusters spanning several domains')
+        parser.add_argument('--limit', type=int, default=50, help='Clusters to print (0: all)')
+        parser.add_argument('--json', action='store_true', help='Print the clusters as JSON')
+
+    def handle(self, *args, **options):
+        if not 0 < options['threshold'] <= 1:
+            raise CommandError('--threshold must be in (0, 1]')
+        engine = 'numpy' if dedup.np is not None else 'pure Python'
+        if not options['skip_update']:
+            start = time.perf_counter()
+            counts = dedup.update_signatures(options['domains'], workers=options['workers'],
+                                             chunk_size=options['chunk_size'], rebuild=options['rebuild'])
+            self.stderr.write(
+                f"Signatures: {counts['signed']} signed, {counts['unchanged']} unchanged, "
+                f"{counts['deleted']} deleted in {time.perf_counter() - start:.1f}s ({engine})"
+            )
+
+        start = time.perf_counter()
+        clusters = dedup.find_clusters(options['threshold'], options['domains'])
+        if options['cross_domain']:
+            clusters = [members for members in clusters if len({domain for domain, _ in members}) > 1]
+        elapsed = time.perf_counter() - start
+        shown = clusters[:options['limit']] if options['limit'] else clusters
+        texts = dedup.question_texts(key for members in shown for key in members)
+
+        if options['json']:
+            self.stdout.write(json.dumps([
+                [{'domain': domain, 'id': pk, 'question': texts.get((domain, pk))} for domain, pk in members]
+                for members in shown
+            ], indent=2))
+        else:
+            for number, members in enumerate(shown, 1):
+                self.stdout.write(self.style.MIGRATE_HEADING(f'Cluster {number} ({len(members)} questions)'))
+                for domain, pk in members:
+                    self.stdout.write(f"  {f'{domain}#{pk}':<16} {texts.get((domain, pk), '')[:100]}")
+        self.stderr.write(self.style.SUCCESS(
+            f'{len(clusters)} cluster(s) covering {sum(map(len, clusters))} questions '
+            f'at similarity >= {options["threshold"]} ({elapsed:.1f}s)'
+        ))
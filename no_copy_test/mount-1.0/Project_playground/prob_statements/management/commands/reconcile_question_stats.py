@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from prob_statements.stats import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recounts every domain table and corrects drifted QuestionStats rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Repeat every N seconds instead of running once (for a sidecar/cron-less setup)')
+
+    def handle(self, *args, **options):
+        while True:
+            drift = reconcile()
+            for (domain, difficulty), (stored, actual) in sorted(drift.items()):
+                self.stdout.write(f'  {domain}/{difficulty}: {stored} -> {actual}')
+            self.stdout.write(self.style.SUCCESS(f'Reconciled question stats ({len(drift)} row(s) corrected)'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.15 on 2026-10-19 14:02
+
+from django.db import migrations, models
+from django.db.models import Count
+
+DOMAIN_TABLES = {
+    "frontend": "Frontend",
+    "backend": "Backend",
+    "web": "Web_developement",
+    "blockchain": "Blockchain",
+    "mobile": "Mobile_app_dev",
+    "datasci": "Data_science",
+    "devops": "Dev_ops",
+    "cyber": "Cybersecurity",
+    "aiml": "AI_ML",
+    "cloud": "Cloud_computing",
+}
+
+
+def populate_stats(apps, schema_editor):
+    QuestionStats = apps.get_model("prob_statements", "QuestionStats")
+    rows = []
+    for domain, model_name in DOMAIN_TABLES.items():
+        model = apps.get_model("prob_statements", model_name)
+        counts = (
+            model.objects.values_list("difficulty").annotate(n=Count("pk")).order_by()
+        )
+        rows.extend(
+            QuestionStats(domain=domain, difficulty=difficulty, count=n)
+            for difficulty, n in counts
+        )
+    QuestionStats.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("prob_statements", "0002_ai_ml_backend_blockchain_cloud_computing_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuestionStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("domain", models.CharField(max_length=20)),
+                (
+                    "difficulty",
+                    models.CharField(
+                        choices=[
+                            ("Easy", "Easy"),
+                            ("Medium", "Medium"),
+                            ("Hard", "Hard"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("domain", "difficulty"), name="unique_question_stats"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_stats, migrations.RunPython.noop),
+    ]
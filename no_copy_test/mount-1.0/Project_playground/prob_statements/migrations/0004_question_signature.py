@@ -0,0 +1,40 @@
+# Generated by Django 5.1.15 on 2026-10-19 14:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("prob_statements", "0003_question_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuestionSignature",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("domain", models.CharField(max_length=20)),
+                ("question_id", models.BigIntegerField()),
+                ("content_hash", models.CharField(max_length=40)),
+                ("signature", models.BinaryField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("domain", "question_id"),
+                        name="unique_question_signature",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.1.15 on 2026-10-19 14:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("prob_statements", "0001_squashed_0004_question_signature"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="ai_ml",
+            name="difficulty",
+            field=models.CharField(
+                choices=[("Easy", "Easy"), ("Medium", "Medium"), ("Hard", "Hard")],
+                db_index=True,
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="backend",
+            name="difficulty",
+            field=models.CharField(
+                choices=[("Easy", "Easy"), ("Medium", "Medium"), ("Hard", "Hard")],
+                db_index=True,
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="blockchain",
+            name="difficulty",
+            field=models.CharField(
+                choices=[("Easy", "Easy"), ("Medium", "Medium"), ("Hard", "Hard")],
+                db_index=True,
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="cloud_computing",
+            name="difficulty",
+            field=models.CharField(
+                choices=[("Easy", "Easy"), ("Medium", "Medium"), ("Hard", "Hard")],
+                db_index=True,
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="cybersecurity",
+            name="difficulty",
+            field=models.CharField(
+                choices=[("Easy", "Easy"), ("Medium", "Medium"), ("Hard", "Hard")],
+                db_index=True,
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="data_science",
+            name="difficulty",
+            field=models.CharField(
+                choices=[("Easy", "Easy"), ("Medium", "Medium"), ("Hard", "Hard")],
+                db_index=True,
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="dev_ops",
+            name="difficulty",
+            field=models.CharField(
+                choices=[("Easy", "Easy"), ("Medium", "Medium"), ("Hard", "Hard")],
+                db_index=True,
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="frontend",
+            name="difficulty",
+            field=models.CharField(
+                choices=[("Easy", "Easy"), ("Medium", "Medium"), ("Hard", "Hard")],
+                db_index=True,
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="mobile_app_dev",
+            name="difficulty",
+            field=models.CharField(
+                choices=[("Easy", "Easy"), ("Medium", "Medium"), ("Hard", "Hard")],
+                db_index=True,
+                max_length=50,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="web_developement",
+            name="difficulty",
+            field=models.CharField(
+                choices=[("Easy", "Easy"), ("Medium", "Medium"), ("Hard", "Hard")],
+                db_index=True,
+                max_length=50,
+            ),
+        ),
+    ]
@@ -3,93 +3,136 @@ from django.db import models
 # Create your models here.
 # models.py
 
-class Frontend(models.Model):
+class LoadedDifficultyMixin:
+    """Remembers the difficulty a row was loaded with, so prob_statements.stats can
+    move a changed question between counters without re-reading it on save."""
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_difficulty = instance.__dict__.get('difficulty')
+        return instance
+
+
+class Frontend(LoadedDifficultyMixin, models.Model):
     question = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
-    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')])
+    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')], db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.question
 
-class Backend(models.Model):
+class Backend(LoadedDifficultyMixin, models.Model):
     question = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
-    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')])
+    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')], db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.question
 
-class AI_ML(models.Model):
+class AI_ML(LoadedDifficultyMixin, models.Model):
     question = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
-    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')])
+    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')], db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.question
 
-class Blockchain(models.Model):
+class Blockchain(LoadedDifficultyMixin, models.Model):
     question = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
-    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')])
+    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')], db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.question
 
-class Data_science(models.Model):
+class Data_science(LoadedDifficultyMixin, models.Model):
     question = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
-    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')])
+    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')], db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.question
 
-class Web_developement(models.Model):
+class Web_developement(LoadedDifficultyMixin, models.Model):
     question = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
-    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')])
+    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')], db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.question
 
-class Mobile_app_dev(models.Model):
+class Mobile_app_dev(LoadedDifficultyMixin, models.Model):
     question = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
-    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')])
+    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')], db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.question
 
-class Cybersecurity(models.Model):
+class Cybersecurity(LoadedDifficultyMixin, models.Model):
     question = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
-    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')])
+    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')], db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.question
 
 
-class Cloud_computing(models.Model):
+class Cloud_computing(LoadedDifficultyMixin, models.Model):
     question = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
-    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')])
+    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')], db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.question
 
-class Dev_ops(models.Model):
+class Dev_ops(LoadedDifficultyMixin, models.Model):
     question = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
-    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')])
+    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')], db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return self.question
\ No newline at end of file
+        return self.question
+
+class QuestionStats(models.Model):
+    """Denormalised question count per (domain, difficulty); maintained by prob_statements/stats.py."""
+    domain = models.CharField(max_length=20)
+    difficulty = models.CharField(max_length=50, choices=[('Easy', 'Easy'), ('Medium', 'Medium'), ('Hard', 'Hard')])
+    count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['domain', 'difficulty'], name='unique_question_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.domain}/{self.difficulty}: {self.count}"
+
+
+class QuestionSignature(models.Model):
+    """MinHash signature of one question's text; maintained by prob_statements/dedup.py."""
+    domain = models.CharField(max_length=20)
+    question_id = models.BigIntegerField()
+    content_hash = models.CharField(max_length=40)
+    signature = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['domain', 'question_id'], name='unique_question_signature'),
+        ]
+
+    def __str__(self):
+        return f"{self.domain}#{self.question_id}"
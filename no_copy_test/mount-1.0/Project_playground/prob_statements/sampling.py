@@ -0,0 +1,108 @@
+"""
+Random question sampling ("practice mode") without ORDER BY RAND().
+
+For each (domain, difficulty) the primary keys are loaded once with an
+index-only query into a compact array('q'). Every worker process keeps
+its own copy, tagged with the model's content version; the shared cache
+(through Playground.singleflight) is only read when that copy is missing
+or outdated, so a rebuild on a busy pool runs one query and every worker
+unpickles the new array once, not on every sample.
+
+The cache key embeds the model's content version (Playground.conditional),
+which save/delete signals and stats.bulk_import() bump, so any write
+makes the next sample rebuild the array under a new key. That key has no
+previous array to serve, so callers arriving during such a rebuild wait
+for it (single-flight still keeps it to one query). Only a caller whose
+wait times out falls back to its process's older copy, if it has one; the
+cache itself serves a stale array only when an entry outlives
+SAMPLER_IDS_TTL with the version unchanged. The TTL, which applies to the
+per-process copies too, also bounds staleness after writes that skip the
+version (raw SQL) and when the cache is not shared between workers.
+
+Drawing k questions is then one ContentVersion lookup, random.sample()
+over the local array and one in_bulk() lookup: O(k) work and no table
+scan while the version is unchanged.
+"""
+import random
+import time
+from array import array
+
+from django.conf import settings
+
+from Playground.conditional import content_version
+from Playground.singleflight import BuildTimeout, get_or_compute
+
+from .domains import get_domain_model
+
+SEEN_SESSION_KEY = 'practice_seen:{domain}:{difficulty}'
+
+# {(domain, difficulty): (content version, monotonic expiry, ids)} of this process.
+_local_ids = {}
+
+
+def question_ids(domain, difficulty):
+    """Array of primary keys for one (domain, difficulty) pool, from this process's copy when current."""
+    model = get_domain_model(domain)
+    version = content_version(model)
+    local = _local_ids.get((domain, difficulty))
+    if local is not None and local[0] == version and local[1] > time.monotonic():
+        return local[2]
+    try:
+        ids = get_or_compute(
+            f'question-ids:{domain}:{difficulty}:v{version}',
+            lambda: array('q', model.objects.filter(difficulty=difficulty).order_by().values_list('pk', flat=True)),
+            ttl=settings.SAMPLER_IDS_TTL,
+        )
+    except BuildTimeout:
+        if local is None:
+            raise
+        # The rebuild is taking long: a slightly outdated pool beats a failed request.
+        return local[2]
+    _local_ids[(domain, difficulty)] = (version, time.monotonic() + settings.SAMPLER_IDS_TTL, ids)
+    return ids
+
+
+def _draw(ids, k, exclude):
+    """k distinct ids from `ids` not in `exclude`."""
+    if not exclude:
+        return random.sample(ids, min(k, len(ids)))
+    available = len(ids) - len(exclude)
+    if available <= 2 * k:
+        # Most of the pool is excluded: filter once instead of rejecting forever.
+        pool = [pk for pk in ids if pk not in exclude]
+        return random.sample(pool, min(k, len(pool)))
+    picked = set()
+    while len(picked) < k:
+        pk = ids[random.randrange(len(ids))]
+        if pk not in exclude:
+            picked.add(pk)
+    return list(picked)
+
+
+def sample_questions(domain, difficulty, k=1, session=None):
+    """
+    Returns up to k distinct random questions of one domain and difficulty.
+
+    With a `session`, questions already served to it are skipped until the
+    pool is exhausted, after which the history starts over.
+    """
+    model = get_domain_model(domain)
+    ids = question_ids(domain, difficulty)
+    if not ids:
+        return []
+    k = min(k, len(ids))
+
+    seen_key = SEEN_SESSION_KEY.format(domain=domain, difficulty=difficulty)
+    seen = set(session.get(seen_key, ())) if session is not None else set()
+    if len(seen) + k > len(ids):
+        seen = set()
+
+    picked = _draw(ids, k, seen)
+    rows = model.objects.in_bulk(picked)
+    questions = [rows[pk] for pk in picked if pk in rows]
+
+    if session is not None:
+        history = [pk for pk in session.get(seen_key, ()) if pk in seen] + [q.pk for q in questions]
+        # Cookie-backed sessions are small; keep only the most recent ids.
+        session[seen_key] = history[-settings.SAMPLER_MAX_SEEN:]
+    return questions
@@ -0,0 +1,128 @@
+"""
+Incrementally maintained question counts per (domain, difficulty).
+
+Single-row saves and deletes keep QuestionStats current through signals
+(connected in ProbStatementsConfig.ready); QuerySet.delete() sends
+post_delete per row too. bulk_create() bypasses signals, so imports go
+through bulk_import() here, and
+`manage.py reconcile_question_stats` periodically recounts everything to
+correct any drift (raw SQL, fixtures loaded with raw=True, ...).
+
+Counters never go below zero: deleting a question that was never counted
+(inserted behind the signals' back) leaves its counter at 0 instead of
+failing the delete, and the next reconcile() sets the right value.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Value, When
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from Playground.conditional import bump_version
+
+from .domains import DIFFICULTIES, DOMAIN_MODELS, domain_for_model
+from .models import QuestionStats
+
+
+def adjust(domain, difficulty, delta):
+    """Adds `delta` to one counter, creating the row on first use."""
+    if not delta:
+        return
+    QuestionStats.objects.bulk_create(
+        [QuestionStats(domain=domain, difficulty=difficulty, count=0)], ignore_conflicts=True
+    )
+    if delta > 0:
+        count = F('count') + delta
+    else:
+        # Not GREATEST(count + delta, 0): MySQL rejects a negative intermediate on an unsigned column.
+        count = Case(When(count__gte=-delta, then=F('count') + delta), default=Value(0))
+    QuestionStats.objects.filter(domain=domain, difficulty=difficulty).update(count=count)
+
+
+def _apply(domain, counts, sign):
+    with transaction.atomic():
+        for difficulty, count in counts.items():
+            adjust(domain, difficulty, sign * count)
+
+
+def bulk_import(model, objs, batch_size=1000):
+    """bulk_create() for question rows that also updates the counters."""
+    objs = list(objs)
+    with transaction.atomic():
+        created = model.objects.bulk_create(objs, batch_size=batch_size)
+        _apply(domain_for_model(model), Counter(obj.difficulty for obj in created), +1)
+    bump_version(model)
+    return created
+
+
+def reconcile():
+    """Recounts every domain table; returns {(domain, difficulty): (stored, actual)} for rows that drifted.
+
+    Each domain is recounted in its own transaction with its counters locked
+    first, so signal adjustments made meanwhile wait for the new values
+    instead of being overwritten by them.
+    """
+    drift = {}
+    for domain, model in DOMAIN_MODELS.items():
+        with transaction.atomic():
+            stored = dict(QuestionStats.objects.select_for_update().filter(domain=domain)
+                          .values_list('difficulty', 'count'))
+            actual = dict(model.objects.values_list('difficulty').annotate(n=Count('pk')).order_by())
+            for difficulty in set(DIFFICULTIES) | set(actual):
+                count = actual.get(difficulty, 0)
+                if stored.get(difficulty, 0) == count:
+                    continue
+                QuestionStats.objects.update_or_create(domain=domain, difficulty=difficulty,
+                                                       defaults={'count': count})
+                drift[(domain, difficulty)] = (stored.get(difficulty), count)
+    return drift
+
+
+def summary():
+    """{domain: {'Easy': n, 'Medium': n, 'Hard': n, 'total': n}} from one QuestionStats read."""
+    result = {domain: dict.fromkeys(DIFFICULTIES, 0) for domain in DOMAIN_MODELS}
+    for domain, difficulty, count in QuestionStats.objects.values_list('domain', 'difficulty', 'count'):
+        result.setdefault(domain, dict.fromkeys(DIFFICULTIES, 0))[difficulty] = count
+    for counts in result.values():
+        counts['total'] = sum(counts[d] for d in DIFFICULTIES)
+    return result
+
+
+# --- Signal handlers ---
+
+def _remember_difficulty(sender, instance, raw=False, update_fields=None, **kwargs):
+    if (raw or instance._state.adding or instance.pk is None
+            or (update_fields is not None and 'difficulty' not in update_fields)):
+        instance._stats_old_difficulty = None
+        return
+    old = getattr(instance, '_loaded_difficulty', None)
+    if old is None:
+        # Built by hand around an existing pk, or loaded with difficulty deferred.
+        old = sender.objects.filter(pk=instance.pk).values_list('difficulty', flat=True).first()
+    instance._stats_old_difficulty = old
+
+
+def _count_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    domain = domain_for_model(sender)
+    old = getattr(instance, '_stats_old_difficulty', None)
+    instance._loaded_difficulty = instance.difficulty
+    if created:
+        adjust(domain, instance.difficulty, +1)
+        return
+    if old is not None and old != instance.difficulty:
+        adjust(domain, old, -1)
+        adjust(domain, instance.difficulty, +1)
+
+
+def _count_delete(sender, instance, **kwargs):
+    adjust(domain_for_model(sender), instance.difficulty, -1)
+
+
+def connect_signals():
+    for model in DOMAIN_MODELS.values():
+        uid = f'question-stats:{model._meta.label_lower}'
+        pre_save.connect(_remember_difficulty, sender=model, dispatch_uid=uid + ':pre_save')
+        post_save.connect(_count_save, sender=model, dispatch_uid=uid + ':post_save')
+        post_delete.connect(_count_delete, sender=model, dispatch_uid=uid + ':post_delete')
@@ -1,3 +1,159 @@
-from django.test import TestCase
+import csv
+import io
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from . import sampling, stats
+from .models import Backend, Frontend, QuestionStats
 
 # Create your tests here.
+
+
+class QuestionStatsTests(TestCase):
+    """Counters kept by the save/delete signals in stats.py."""
+
+    def count(self, difficulty, domain='frontend'):
+        row = QuestionStats.objects.filter(domain=domain, difficulty=difficulty)
+        return row.values_list('count', flat=True).first()
+
+    def test_create_and_delete_adjust_the_counter(self):
+        first = Frontend.objects.create(question='a', difficulty='Easy')
+        Frontend.objects.create(question='b', difficulty='Easy')
+        Backend.objects.create(question='c', difficulty='Easy')
+        self.assertEqual(self.count('Easy'), 2)
+        self.assertEqual(self.count('Easy', 'backend'), 1)
+        first.delete()
+        self.assertEqual(self.count('Easy'), 1)
+        # QuerySet.delete() sends post_delete per row as well.
+        Frontend.objects.all().delete()
+        self.assertEqual(self.count('Easy'), 0)
+
+    def test_changing_difficulty_moves_the_count(self):
+        question = Frontend.objects.create(question='a', difficulty='Easy')
+        question.difficulty = 'Hard'
+        question.save()
+        self.assertEqual((self.count('Easy'), self.count('Hard')), (0, 1))
+        # A save that leaves difficulty alone touches no counter.
+        question.question = 'renamed'
+        question.save(update_fields=['question'])
+        self.assertEqual((self.count('Easy'), self.count('Hard')), (0, 1))
+
+    def test_decrement_is_clamped_at_zero(self):
+        # Inserted behind the signals' back, so never counted.
+        Frontend.objects.bulk_create([Frontend(question='raw', difficulty='Medium')])
+        Frontend.objects.get(question='raw').delete()
+        self.assertEqual(self.count('Medium'), 0)
+        stats.adjust('frontend', 'Medium', -5)
+        self.assertEqual(self.count('Medium'), 0)
+
+    def test_bulk_import_counts_its_rows(self):
+        stats.bulk_import(Frontend, [Frontend(question=str(i), difficulty='Hard') for i in range(4)])
+        self.assertEqual(self.count('Hard'), 4)
+
+    def test_reconcile_fixes_drifted_counts(self):
+        Frontend.objects.create(question='a', difficulty='Easy')
+        # Rows inserted behind the signals' back and a counter set by hand make the drift.
+        Frontend.objects.bulk_create([Frontend(question='b', difficulty='Easy'),
+                                      Frontend(question='c', difficulty='Hard')])
+        QuestionStats.objects.filter(domain='backend', difficulty='Medium').delete()
+        stats.adjust('backend', 'Medium', 3)
+        drift = stats.reconcile()
+        self.assertEqual(drift, {
+            ('frontend', 'Easy'): (1, 2),
+            ('frontend', 'Hard'): (None, 1),
+            ('backend', 'Medium'): (3, 0),
+        })
+        self.assertEqual((self.count('Easy'), self.count('Hard'), self.count('Medium', 'backend')), (2, 1, 0))
+        self.assertEqual(stats.reconcile(), {})
+        self.assertEqual(stats.summary()['frontend'], {'Easy': 2, 'Medium': 0, 'Hard': 1, 'total': 3})
+
+
+class SamplingTests(TestCase):
+    """Practice-mode sampling from per-process id arrays."""
+
+    def setUp(self):
+        # Content versions restart with every test's rollback; so must anything keyed by them.
+        cache.clear()
+        sampling._local_ids.clear()
+        self.questions = [Frontend.objects.create(question=str(i), difficulty='Easy') for i in range(10)]
+
+    def test_repeat_samples_reuse_the_local_array(self):
+        with mock.patch.object(sampling, 'get_or_compute', wraps=sampling.get_or_compute) as shared:
+            for _ in range(5):
+                self.assertEqual(len(sampling.sample_questions('frontend', 'Easy', k=3)), 3)
+        self.assertEqual(shared.call_count, 1)
+
+    def test_a_write_rebuilds_the_array(self):
+        sampling.sample_questions('frontend', 'Easy')
+        added = Frontend.objects.create(question='new', difficulty='Easy')
+        self.assertIn(added.pk, sampling.question_ids('frontend', 'Easy'))
+        self.questions[0].delete()
+        self.assertNotIn(self.questions[0].pk, sampling.question_ids('frontend', 'Easy'))
+
+    def test_no_repeat_session_skips_served_questions(self):
+        session = {}
+        served = [q.pk for _ in range(5) for q in sampling.sample_questions('frontend', 'Easy', k=2, session=session)]
+        self.assertEqual(sorted(served), sorted(q.pk for q in self.questions))
+
+
+@override_settings(QUESTION_EXPORT_CHUNK_SIZE=7)
+class ExportTests(TestCase):
+    """Keyset-paginated streaming export, with more rows than one batch."""
+
+    @classmethod
+    def setUpTestData(cls):
+        Frontend.objects.bulk_create(
+            Frontend(question=f'Question {i}', description='a, "quoted"\nline' if i % 5 == 0 else None,
+                     difficulty=('Easy', 'Medium', 'Hard')[i % 3])
+            for i in range(20)
+        )
+        # Deleted rows leave gaps the keyset must step over.
+        Frontend.objects.filter(question__in=['Question 6', 'Question 7']).delete()
+        Backend.objects.create(question='Backend only', difficulty='Easy')
+        cls.pks = list(Frontend.objects.order_by('pk').values_list('pk', flat=True))
+
+    def export(self, fmt, domain='frontend', query=''):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/frontend-questions/export/{domain}.{fmt}{query}', HTTP_HOST='localhost')
+            self.assertTrue(response.streaming)
+            chunks = [chunk.decode() for chunk in response.streaming_content]
+        return response, chunks, queries
+
+    def test_ndjson_streams_every_row_once_in_pk_order(self):
+        response, chunks, queries = self.export('ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in ''.join(chunks).splitlines()]
+        self.assertEqual([row['id'] for row in rows], self.pks)
+        self.assertEqual({row['domain'] for row in rows}, {'frontend'})
+        # 18 rows in batches of 7: three batches, three chunks, three SELECTs.
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(len(queries), 3)
+
+    def test_csv_streams_every_row_once_in_pk_order(self):
+        response, chunks, _ = self.export('csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.reader(io.StringIO(''.join(chunks))))
+        self.assertEqual(rows[0], ['domain', 'id', 'question', 'description', 'difficulty', 'created_at'])
+        self.assertEqual([int(row[1]) for row in rows[1:]], self.pks)
+        self.assertEqual(rows[1][3], 'a, "quoted"\nline')
+        # Header chunk plus one chunk per batch.
+        self.assertEqual(len(chunks), 4)
+
+    def test_difficulty_filter_and_all_domains(self):
+        _, chunks, _ = self.export('ndjson', query='?difficulty=Hard')
+        rows = [json.loads(line) for line in ''.join(chunks).splitlines()]
+        self.assertEqual([row['id'] for row in rows],
+                         list(Frontend.objects.filter(difficulty='Hard').order_by('pk').values_list('pk', flat=True)))
+        _, chunks, _ = self.export('ndjson', domain='all')
+        domains = [json.loads(line)['domain'] for line in ''.join(chunks).splitlines()]
+        self.assertEqual(domains.count('frontend'), len(self.pks))
+        self.assertEqual(domains.count('backend'), 1)
+
+    def test_unknown_format_is_404(self):
+        response = self.client.get('/frontend-questions/export/frontend.xml', HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 404)
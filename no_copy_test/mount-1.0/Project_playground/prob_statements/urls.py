@@ -3,4 +3,7 @@ from django.urls import path
 
 urlpatterns = [
     path('frontend-questions/', views.frontend_questions, name='frontend_questions'),
+    path('summary/', views.question_summary, name='question_summary'),
+    path('practice/<slug:domain>/<str:difficulty>/', views.practice_questions, name='practice_questions'),
+    path('export/<slug:domain>.<slug:fmt>', views.export_questions, name='export_questions'),
 ]
\ No newline at end of file
@@ -1,54 +1,126 @@
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.views.decorators.cache import cache_control, never_cache
+from django.views.decorators.http import require_GET
+
+from interface_profile import progress
+from Playground.conditional import conditional_page
+
+from . import export, sampling, stats
+from .domains import DOMAIN_MODELS, check_difficulty, get_domain_model
 
 # Create your views here.
 from .models import Frontend , Web_developement , Backend , AI_ML , Cybersecurity , Dev_ops , Data_science , Mobile_app_dev , Cloud_computing , Blockchain
 
+@conditional_page(Frontend)
 def frontend_questions(request):
     f_questions = Frontend.objects.all()  # Fetch all questions from the database
     return render(request, 'prob_st/frontend.html', {'f_questions': f_questions})
 # views.py
 
+@conditional_page(Backend)
 def backend_questions(request):
     b_questions = Backend.objects.all()  # Fetch all questions from the database
     return render(request, 'prob_st/backend.html', {'b_questions': b_questions})
 # views.py
 
+@conditional_page(Web_developement)
 def web_questions(request):
     w_questions = Web_developement.objects.all()  # Fetch all questions from the database
     return render(request, 'prob_st/web.html', {'w_questions': w_questions})
 # views.py
 
+@conditional_page(Blockchain)
 def blockchain_questions(request):
     blc_questions = Blockchain.objects.all()  # Fetch all questions from the database
     return render(request, 'prob_st/block.html', {'blc_questions': blc_questions})
 # views.py
 
+@conditional_page(Mobile_app_dev)
 def mobile_questions(request):
     m_questions = Mobile_app_dev.objects.all()  # Fetch all questions from the database
     return render(request, 'prob_st/Mobile.html', {'m_questions': m_questions})
 # views.py
 
+@conditional_page(Data_science)
 def datasci_questions(request):
     ds_questions = Data_science.objects.all()  # Fetch all questions from the database
     return render(request, 'prob_st/datasci.html', {'ds_questions': ds_questions})
 # views.py
 
+@conditional_page(Dev_ops)
 def devops_questions(request):
     d_questions = Dev_ops.objects.all()  # Fetch all questions from the database
     return render(request, 'prob_st/dev.html', {'d_questions': d_questions})
 # views.py
 
+@conditional_page(Cybersecurity)
 def cyber_questions(request):
     cs_questions = Cybersecurity.objects.all()  # Fetch all questions from the database
     return render(request, 'prob_st/cyber.html', {'cs_questions': cs_questions})
 # views.py
 
+@conditional_page(AI_ML)
 def al_ml_questions(request):
     ai_questions = AI_ML.objects.all()  # Fetch all questions from the database
     return render(request, 'prob_st/aiml.html', {'ai_questions': ai_questions})
 # views.py
 
+@conditional_page(Cloud_computing)
 def cloud_questions(request):
     c_questions = Cloud_computing.objects.all()  # Fetch all questions from the database
     return render(request, 'prob_st/cloud.html', {'c_questions': c_questions})
-# views.py
\ No newline at end of file
+# views.py
+
+EXPORT_FORMATS = {
+    'ndjson': (export.ndjson_stream, 'application/x-ndjson'),
+    'csv': (export.csv_stream, 'text/csv; charset=utf-8'),
+}
+
+
+@require_GET
+def export_questions(request, domain, fmt):
+    """Streams every question of `domain` (or 'all') as NDJSON or CSV; ?difficulty= filters."""
+    if fmt not in EXPORT_FORMATS:
+        raise Http404(f"Unknown export format '{fmt}'")
+    domains = list(DOMAIN_MODELS) if domain == 'all' else [domain]
+    for slug in domains:
+        get_domain_model(slug)
+    difficulty = check_difficulty(request.GET.get('difficulty'))
+
+    stream, content_type = EXPORT_FORMATS[fmt]
+    response = StreamingHttpResponse(stream(domains, difficulty), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="questions-{domain}.{fmt}"'
+    # Ask a fronting proxy to pass chunks through instead of buffering them.
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@require_GET
+@cache_control(public=True, max_age=30)
+def question_summary(request):
+    """Easy/Medium/Hard/total counts for every domain, read from QuestionStats in one query."""
+    return JsonResponse({'domains': stats.summary()})
+
+
+@require_GET
+@never_cache
+def practice_questions(request, domain, difficulty):
+    """k random questions of one domain/difficulty; ?k=1..50, ?no_repeat=1 skips ones this session has seen."""
+    get_domain_model(domain)
+    check_difficulty(difficulty)
+    try:
+        k = max(1, min(50, int(request.GET.get('k', 1))))
+    except ValueError:
+        k = 1
+    session = request.session if request.GET.get('no_repeat') == '1' else None
+    questions = sampling.sample_questions(domain, difficulty, k, session=session)
+    progress.record_view(request.user, domain, difficulty, len(questions))
+    return JsonResponse({
+        'domain': domain,
+        'difficulty': difficulty,
+        'questions': [
+            {'id': q.pk, 'question': q.question, 'description': q.description, 'difficulty': q.difficulty}
+            for q in questions
+        ],
+    })
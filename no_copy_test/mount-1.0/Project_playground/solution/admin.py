@@ -1,3 +1,17 @@
 from django.contrib import admin
 
 # Register your models here.
+
+from .models import GradingJob, Submission
+
+
+@admin.register(Submission)
+class SubmissionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'domain', 'question_id', 'status', 'score', 'created_at', 'graded_at')
+    list_filter = ('status', 'domain')
+
+
+@admin.register(GradingJob)
+class GradingJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'submission', 'state', 'attempts', 'run_after', 'duration_ms', 'finished_at')
+    list_filter = ('state',)
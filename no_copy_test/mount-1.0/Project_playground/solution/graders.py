@@ -0,0 +1,48 @@
+"""
+Graders run by `manage.py run_graders` in worker processes.
+
+A grader is a module-level function (so it can be sent to a process pool)
+taking a payload dict:
+
+    {'domain', 'question_id', 'question', 'description', 'difficulty', 'answer'}
+
+and returning {'score': 0.0-1.0, 'feedback': str}. It must not touch the
+database; everything it needs is in the payload. settings.SOLUTION_GRADER
+names the grader to use.
+"""
+import re
+
+from django.utils.module_loading import import_string
+
+WORD_RE = re.compile(r'[a-z][a-z0-9+#.-]{3,}')
+STOPWORDS = frozenset((
+    'what', 'when', 'where', 'which', 'with', 'would', 'your', 'that', 'this', 'there', 'their', 'about',
+    'explain', 'describe', 'detail', 'difference', 'between', 'does', 'have', 'from', 'into', 'should',
+    'could', 'them', 'they', 'than', 'then', 'also', 'used', 'using', 'example',
+))
+
+
+def keywords(text):
+    words = (word.rstrip('.-') for word in WORD_RE.findall((text or '').lower()))
+    return {word for word in words if len(word) > 3 and word not in STOPWORDS}
+
+
+def keyword_grader(payload):
+    """Scores the share of the question's keywords that the answer mentions."""
+    expected = keywords(payload['question']) | keywords(payload['description'])
+    answer = payload['answer'] or ''
+    if not answer.strip():
+        return {'score': 0.0, 'feedback': 'Empty answer.'}
+    if not expected:
+        return {'score': 1.0, 'feedback': 'Answer received.'}
+    found = expected & keywords(answer)
+    missing = sorted(expected - found)
+    score = round(len(found) / len(expected), 3)
+    feedback = f'Covered {len(found)} of {len(expected)} key terms.'
+    if missing:
+        feedback += ' Consider discussing: ' + ', '.join(missing[:10]) + '.'
+    return {'score': score, 'feedback': feedback}
+
+
+def load_grader(path):
+    return import_string(path)
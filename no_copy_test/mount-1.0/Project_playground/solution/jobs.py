@@ -0,0 +1,107 @@
+"""
+Database-backed grading queue.
+
+Request threads call enqueue(), which writes a Submission and its
+GradingJob in one transaction and returns. `manage.py run_graders` then:
+
+- claim_batch(): picks ready jobs (queued, run_after <= now) and claims them
+  with one conditional UPDATE stamped with a unique claim token, so several
+  grader processes never run the same job. This works the same on MySQL and
+  SQLite without SELECT ... FOR UPDATE.
+- complete() / fail(): store the result, or schedule a retry with
+  exponential backoff until max_attempts is reached.
+- requeue_stale(): returns jobs whose grader died mid-run to the queue.
+"""
+import random
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import GradingJob, Submission
+
+
+def enqueue(domain, question_id, answer, submitter=''):
+    """Stores a submission and queues it for grading; returns the Submission."""
+    with transaction.atomic():
+        submission = Submission.objects.create(
+            domain=domain, question_id=question_id, answer=answer, submitter=submitter,
+        )
+        GradingJob.objects.create(
+            submission=submission,
+            max_attempts=settings.SOLUTION_MAX_ATTEMPTS,
+            run_after=timezone.now(),
+        )
+    return submission
+
+
+def claim_batch(batch_size):
+    """Claims up to batch_size ready jobs for this caller; returns them with their submissions."""
+    now = timezone.now()
+    candidates = list(
+        GradingJob.objects.filter(state=GradingJob.QUEUED, run_after__lte=now)
+        .order_by('run_after', 'pk')
+        .values_list('pk', flat=True)[:batch_size]
+    )
+    if not candidates:
+        return []
+    token = uuid.uuid4().hex
+    # Only rows still queued are taken; a concurrent grader keeps the rest.
+    GradingJob.objects.filter(pk__in=candidates, state=GradingJob.QUEUED).update(
+        state=GradingJob.RUNNING, claim=token, locked_at=now, attempts=F('attempts') + 1,
+    )
+    return list(GradingJob.objects.filter(claim=token).select_related('submission'))
+
+
+def backoff_seconds(attempts):
+    """Delay before retry number `attempts`: base * 2^(n-1), capped, with +-20% jitter."""
+    delay = min(settings.SOLUTION_RETRY_BACKOFF * 2 ** max(attempts - 1, 0), settings.SOLUTION_RETRY_BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def complete(job, score, feedback, duration_ms):
+    now = timezone.now()
+    with transaction.atomic():
+        Submission.objects.filter(pk=job.submission_id).update(
+            status=Submission.GRADED, score=score, feedback=feedback, graded_at=now,
+        )
+        GradingJob.objects.filter(pk=job.pk).update(
+            state=GradingJob.DONE, finished_at=now, duration_ms=duration_ms, last_error='',
+        )
+
+
+def fail(job, error, duration_ms=None):
+    """Schedules a retry, or marks the job failed once it has used all its attempts. Returns True on retry."""
+    now = timezone.now()
+    retry = job.attempts < job.max_attempts
+    with transaction.atomic():
+        if retry:
+            GradingJob.objects.filter(pk=job.pk).update(
+                state=GradingJob.QUEUED, claim='', locked_at=None, last_error=error[:2000],
+                run_after=now + timedelta(seconds=backoff_seconds(job.attempts)), duration_ms=duration_ms,
+            )
+        else:
+            GradingJob.objects.filter(pk=job.pk).update(
+                state=GradingJob.FAILED, finished_at=now, last_error=error[:2000], duration_ms=duration_ms,
+            )
+            Submission.objects.filter(pk=job.submission_id).update(
+                status=Submission.ERROR, feedback='Grading failed; please resubmit.',
+            )
+    return retry
+
+
+def requeue_stale(older_than_seconds):
+    """Jobs stuck in `running` longer than this go back to the queue; returns how many."""
+    cutoff = timezone.now() - timedelta(seconds=older_than_seconds)
+    return GradingJob.objects.filter(state=GradingJob.RUNNING, locked_at__lt=cutoff).update(
+        state=GradingJob.QUEUED, claim='', locked_at=None, run_after=timezone.now(),
+        last_error='Requeued after the grader stopped responding',
+    )
+
+
+def queue_depth():
+    """Jobs waiting to run (including ones in backoff)."""
+    return GradingJob.objects.filter(state=GradingJob.QUEUED).count()
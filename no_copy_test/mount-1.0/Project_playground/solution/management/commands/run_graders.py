@@ -0,0 +1,177 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from prob_statements.domains import DOMAIN_MODELS
+from solution import jobs
+from solution.graders import load_grader
+
+logger = logging.getLogger('solution.graders')
+
+
+def _timed_call(grader, payload):
+    """Runs in a worker process: the grader's result and how long it took."""
+    start = time.perf_counter()
+    result = grader(payload)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def _terminate(pool):
+    """Stops a pool whose workers may be stuck in a grader."""
+    processes = list(getattr(pool, '_processes', {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+class Metrics:
+    """Running totals plus the throughput since the previous report."""
+
+    def __init__(self):
+        self.started = self.last_report = time.monotonic()
+        self.done = self.failed = self.retried = self.timeouts = 0
+        self.grade_ms = 0.0
+        self.done_at_last_report = 0
+
+    def report(self, queue_depth):
+        now = time.monotonic()
+        window = max(now - self.last_report, 1e-9)
+        recent = (self.done - self.done_at_last_report) / window
+        self.last_report, self.done_at_last_report = now, self.done
+        return {
+            'done': self.done,
+            'failed': self.failed,
+            'retried': self.retried,
+            'timeouts': self.timeouts,
+            'jobs_per_s': round(recent, 2),
+            'jobs_per_s_total': round(self.done / max(now - self.started, 1e-9), 2),
+            'mean_grade_ms': round(self.grade_ms / self.done, 2) if self.done else None,
+            'queue_depth': queue_depth,
+        }
+
+
+class Command(BaseCommand):
+    help = "Grades queued solution submissions in a process pool (see solution/jobs.py)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help='Grader processes')
+        parser.add_argument('--batch-size', type=int, default=0,
+                            help='Jobs claimed per round (default: twice the worker count)')
+        parser.add_argument('--timeout', type=float, default=settings.SOLUTION_JOB_TIMEOUT,
+                            help='Seconds one job may run before it is failed and retried')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when the queue is empty')
+        parser.add_argument('--metrics-every', type=float, default=30.0, help='Seconds between throughput reports')
+        parser.add_argument('--grader', default=settings.SOLUTION_GRADER, help='Dotted path of the grader function')
+        parser.add_argument('--once', action='store_true', help='Exit when no job is ready instead of polling')
+
+    def handle(self, *args, **options):
+        self.grader = load_grader(options['grader'])
+        self.workers = options['workers']
+        self.timeout = options['timeout']
+        batch_size = options['batch_size'] or 2 * self.workers
+        metrics = Metrics()
+        next_report = time.monotonic() + options['metrics_every']
+
+        pool = self._new_pool()
+        try:
+            while True:
+                requeued = jobs.requeue_stale(self.timeout * 3 + 60)
+                if requeued:
+                    logger.warning('Requeued %s stale grading job(s)', requeued)
+                claimed = jobs.claim_batch(batch_size)
+                if claimed:
+                    if self.run_batch(pool, claimed, metrics):
+                        # A grader overran its timeout and may still be running: replace the pool.
+                        _terminate(pool)
+                        pool = self._new_pool()
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['poll_interval'])
+                if time.monotonic() >= next_report:
+                    self.report(metrics)
+                    next_report = time.monotonic() + options['metrics_every']
+        except KeyboardInterrupt:
+            pass
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            self.report(metrics)
+
+    def _new_pool(self):
+        # Workers never use the database; do not hand them our sockets.
+        connections.close_all()
+        return ProcessPoolExecutor(max_workers=self.workers)
+
+    def payloads(self, claimed):
+        """Grader input per job id, loading each domain's questions with one query."""
+        wanted = {}
+        for job in claimed:
+            wanted.setdefault(job.submission.domain, set()).add(job.submission.question_id)
+        questions = {}
+        for domain, ids in wanted.items():
+            model = DOMAIN_MODELS.get(domain)
+            if model is not None:
+                for pk, q in model.objects.in_bulk(ids).items():
+                    questions[(domain, pk)] = q
+        payloads = {}
+        for job in claimed:
+            q = questions.get((job.submission.domain, job.submission.question_id))
+            if q is not None:
+                payloads[job.pk] = {
+                    'domain': job.submission.domain,
+                    'question_id': q.pk,
+                    'question': q.question,
+                    'description': q.description or '',
+                    'difficulty': q.difficulty,
+                    'answer': job.submission.answer,
+                }
+        return payloads
+
+    def run_batch(self, pool, claimed, metrics):
+        """Grades one claimed batch; returns True when a job timed out."""
+        payloads = self.payloads(claimed)
+        futures = []
+        for job in claimed:
+            if job.pk not in payloads:
+                job.attempts = job.max_attempts  # the question is gone; retrying cannot help
+                jobs.fail(job, 'Question no longer exists')
+                metrics.failed += 1
+                continue
+            futures.append((job, pool.submit(_timed_call, self.grader, payloads[job.pk])))
+
+        timed_out = False
+        start = time.monotonic()
+        for index, (job, future) in enumerate(futures):
+            # Jobs beyond the first `workers` wait for a free process first.
+            deadline = start + self.timeout * (1 + index // self.workers)
+            try:
+                result, elapsed_ms = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                timed_out = True
+                metrics.timeouts += 1
+                self._failed(job, f'Timed out after {self.timeout}s', metrics)
+                continue
+            except Exception as exc:
+                self._failed(job, f'{type(exc).__name__}: {exc}', metrics)
+                continue
+            jobs.complete(job, result['score'], result.get('feedback', ''), round(elapsed_ms, 3))
+            metrics.done += 1
+            metrics.grade_ms += elapsed_ms
+        return timed_out
+
+    def _failed(self, job, error, metrics):
+        if jobs.fail(job, error):
+            metrics.retried += 1
+        else:
+            metrics.failed += 1
+        logger.warning('Grading job %s failed (attempt %s/%s): %s', job.pk, job.attempts, job.max_attempts, error)
+
+    def report(self, metrics):
+        snapshot = metrics.report(jobs.queue_depth())
+        logger.info('Grader throughput', extra={'graders': snapshot})
+        self.stdout.write(' '.join(f'{key}={value}' for key, value in snapshot.items()))
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-19 15:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("solution", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="submission",
+            name="session_key",
+        ),
+        migrations.AddField(
+            model_name="submission",
+            name="submitter",
+            field=models.CharField(blank=True, db_index=True, max_length=32),
+        ),
+    ]
@@ -1,3 +1,55 @@
 from django.db import models
 
 # Create your models here.
+
+class Submission(models.Model):
+    """An answer to one question of one prob_statements domain."""
+    PENDING = 'pending'
+    GRADED = 'graded'
+    ERROR = 'error'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (GRADED, 'Graded'), (ERROR, 'Error')]
+
+    domain = models.CharField(max_length=20)
+    question_id = models.BigIntegerField()
+    answer = models.TextField()
+    # Random token kept in the submitter's session (see views.SUBMITTER_KEY). Not the session key,
+    # which the signed_cookies backend replaces on every session write.
+    submitter = models.CharField(max_length=32, blank=True, db_index=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    score = models.FloatField(null=True, blank=True)
+    feedback = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    graded_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['domain', 'question_id'], name='submission_question_idx')]
+
+    def __str__(self):
+        return f"{self.domain}#{self.question_id} ({self.status})"
+
+
+class GradingJob(models.Model):
+    """Queue entry for grading one Submission; claimed and run by `manage.py run_graders`."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATE_CHOICES = [(QUEUED, 'Queued'), (RUNNING, 'Running'), (DONE, 'Done'), (FAILED, 'Failed')]
+
+    submission = models.OneToOneField(Submission, on_delete=models.CASCADE, related_name='job')
+    state = models.CharField(max_length=10, choices=STATE_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField()
+    claim = models.CharField(max_length=64, blank=True, db_index=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    duration_ms = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['state', 'run_after'], name='gradingjob_ready_idx')]
+
+    def __str__(self):
+        return f"job {self.pk} for submission {self.submission_id} ({self.state})"
@@ -1,3 +1,50 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+
+from prob_statements.models import Frontend
+
+from .models import Submission
 
 # Create your tests here.
+
+
+class SubmissionOwnershipTests(TestCase):
+    """A session keeps seeing its submissions whichever backend stores it."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.question = Frontend.objects.create(question='Reverse a list', difficulty='Easy')
+
+    def submit(self):
+        response = self.client.post(f'/solutions/frontend/{self.question.pk}/', {'answer': 'list[::-1]'},
+                                    HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 202)
+        return response.json()['status_url']
+
+    def status(self, url):
+        return self.client.get(url, HTTP_HOST='localhost').status_code
+
+    def check_session_writes_keep_access(self):
+        url = self.submit()
+        self.assertEqual(self.status(url), 200)
+        # no_repeat stores the served ids in the session, which writes it again.
+        self.client.get('/frontend-questions/practice/frontend/Easy/?no_repeat=1', HTTP_HOST='localhost')
+        self.assertEqual(self.status(url), 200)
+        # A second submission from the same session is filed under the same token.
+        self.assertEqual(self.status(self.submit()), 200)
+        self.assertEqual(len(set(Submission.objects.values_list('submitter', flat=True))), 1)
+
+    def test_db_sessions(self):
+        self.check_session_writes_keep_access()
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+    def test_signed_cookie_sessions(self):
+        # The session key here is the signed cookie itself, which changes with every write.
+        self.check_session_writes_keep_access()
+
+    def test_other_sessions_get_404(self):
+        url = self.submit()
+        self.client.logout()
+        self.assertEqual(self.status(url), 404)
+        # Rows filed under no token are nobody's.
+        Submission.objects.update(submitter='')
+        self.assertEqual(self.status(url), 404)
@@ -0,0 +1,7 @@
+from . import views
+from django.urls import path
+
+urlpatterns = [
+    path('status/<int:pk>/', views.submission_status, name='submission_status'),
+    path('<slug:domain>/<int:question_id>/', views.submit_answer, name='submit_answer'),
+]
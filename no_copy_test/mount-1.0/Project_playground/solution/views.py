@@ -1,3 +1,59 @@
-from django.shortcuts import render
+import uuid
 
-# Create your views here.
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import require_GET, require_POST
+
+from interface_profile import progress
+from prob_statements.domains import get_domain_model
+
+from . import jobs
+from .models import Submission
+
+MAX_ANSWER_LENGTH = 20000
+# Session entry holding the token submissions are filed under.
+SUBMITTER_KEY = 'submitter'
+
+
+# views.py
+@require_POST
+def submit_answer(request, domain, question_id):
+    """Queues an answer for grading and returns 202 at once; poll the status URL for the result."""
+    model = get_domain_model(domain)
+    difficulty = model.objects.filter(pk=question_id).values_list('difficulty', flat=True).first()
+    if difficulty is None:
+        raise Http404('Unknown question')
+    answer = request.POST.get('answer', '')
+    if not answer.strip() or len(answer) > MAX_ANSWER_LENGTH:
+        return JsonResponse({'error': f'answer must be 1-{MAX_ANSWER_LENGTH} characters'}, status=400)
+    # Stays the same for the life of the session, whichever backend stores it.
+    submitter = request.session.setdefault(SUBMITTER_KEY, uuid.uuid4().hex)
+    submission = jobs.enqueue(domain, question_id, answer, submitter)
+    progress.record_attempt(request.user, domain, difficulty)
+    status_url = reverse('submission_status', args=[submission.pk])
+    response = JsonResponse({'id': submission.pk, 'status': submission.status, 'status_url': status_url}, status=202)
+    response['Location'] = status_url
+    return response
+
+
+# views.py
+@require_GET
+@never_cache
+def submission_status(request, pk):
+    """Grading state of one of this session's submissions."""
+    submitter = request.session.get(SUBMITTER_KEY)
+    if not submitter:
+        raise Http404('No submissions in this session')
+    submission = get_object_or_404(Submission, pk=pk, submitter=submitter)
+    return JsonResponse({
+        'id': submission.pk,
+        'domain': submission.domain,
+        'question_id': submission.question_id,
+        'status': submission.status,
+        'score': submission.score,
+        'feedback': submission.feedback,
+        'created_at': submission.created_at.isoformat(),
+        'graded_at': submission.graded_at.isoformat() if submission.graded_at else None,
+    })
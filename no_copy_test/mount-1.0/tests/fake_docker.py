@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the docker CLI, for exercising update_mounts.py without Docker.
+
+Point DOCKER_BIN at this file and FAKE_DOCKER_DIR at an empty directory.
+It understands the calls update_mounts.py makes:
+
+- run --rm ... / run -d ...: `-d` prints a new container id and records the
+  container as running; a foreground run exits with FAKE_DOCKER_EXIT.
+- exec ID ...: 125 (like docker) when ID is not running, else FAKE_DOCKER_EXIT.
+- inspect -f '{{.State.Running}}' ID: "true" or "false".
+- rm -f ID: forgets the container.
+
+Every call is appended to FAKE_DOCKER_DIR/calls.jsonl as
+{"argv": [...], "lock_held": bool}, where lock_held says whether the file
+named by FAKE_DOCKER_LOCK was flock()ed by someone else during the call.
+FAKE_DOCKER_FAIL_RUN=1 makes `run -d` fail.
+"""
+import fcntl
+import json
+import os
+import sys
+import uuid
+from pathlib import Path
+
+
+def lock_held(path):
+    if not path or not os.path.exists(path):
+        return False
+    with open(path) as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        fcntl.flock(lock, fcntl.LOCK_UN)
+    return False
+
+
+def main(argv):
+    home = Path(os.environ['FAKE_DOCKER_DIR'])
+    running = home / 'running'
+    running.mkdir(parents=True, exist_ok=True)
+    with open(home / 'calls.jsonl', 'a') as calls:
+        calls.write(json.dumps({'argv': argv, 'lock_held': lock_held(os.environ.get('FAKE_DOCKER_LOCK'))}) + '\n')
+    exit_code = int(os.environ.get('FAKE_DOCKER_EXIT', 0))
+
+    command = argv[0] if argv else ''
+    if command == 'run' and '-d' in argv:
+        if os.environ.get('FAKE_DOCKER_FAIL_RUN'):
+            print('fake docker: run refused', file=sys.stderr)
+            return 125
+        container_id = uuid.uuid4().hex
+        (running / container_id).touch()
+        print(container_id)
+        return 0
+    if command == 'run':
+        return exit_code
+    if command == 'exec':
+        if not (running / argv[1]).exists():
+            print(f'Error response from daemon: No such container: {argv[1]}', file=sys.stderr)
+            return 125
+        return exit_code
+    if command == 'inspect':
+        container_id = argv[-1]
+        print('true' if (running / container_id).exists() else 'false')
+        return 0
+    if command == 'rm':
+        (running / argv[-1]).unlink(missing_ok=True)
+        print(argv[-1])
+        return 0
+    print(f'fake docker: unsupported command {argv}', file=sys.stderr)
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
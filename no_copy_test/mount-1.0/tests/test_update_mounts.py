@@ -0,0 +1,110 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import update_mounts  # noqa: E402
+
+FAKE_DOCKER = Path(__file__).resolve().parent / 'fake_docker.py'
+
+
+class ContainerPoolTests(unittest.TestCase):
+    """The pool against tests/fake_docker.py, which stands in for the docker CLI."""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.state_file = self.tmp / 'pool.json'
+        self.env = mock.patch.dict(os.environ, {
+            'DOCKER_BIN': str(FAKE_DOCKER),
+            'FAKE_DOCKER_DIR': str(self.tmp / 'docker'),
+            'FAKE_DOCKER_LOCK': str(self.state_file.with_suffix('.lock')),
+        })
+        self.env.start()
+        self.addCleanup(self.env.stop)
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        self.pool = update_mounts.ContainerPool(self.state_file, size=2, max_runs=3, bash_dir=self.tmp)
+
+    def calls(self, command=None):
+        path = self.tmp / 'docker' / 'calls.jsonl'
+        if not path.exists():
+            return []
+        calls = [json.loads(line) for line in path.read_text().splitlines()]
+        return [call for call in calls if command is None or call['argv'][0] == command]
+
+    def containers(self, image='img'):
+        return self.pool.status().get(image, [])
+
+    def test_reuses_a_warm_container(self):
+        self.assertEqual(self.pool.run('img', 'qa.sh'), 0)
+        self.assertEqual(self.pool.run('img', 'qa.sh'), 0)
+        self.assertEqual(len(self.calls('run')), 1)
+        self.assertEqual(len(self.calls('exec')), 2)
+        [container] = self.containers()
+        self.assertEqual(container['runs'], 2)
+        self.assertIsNone(container['busy_pid'])
+
+    def test_docker_runs_without_the_state_lock(self):
+        self.pool.run('img', 'qa.sh')
+        self.assertTrue(self.calls('run'))
+        self.assertFalse(any(call['lock_held'] for call in self.calls()))
+
+    def test_retires_a_container_after_max_runs(self):
+        for _ in range(3):
+            self.pool.run('img', 'qa.sh')
+        self.assertEqual(self.containers(), [])
+        self.assertEqual(len(self.calls('rm')), 1)
+
+    def test_failed_script_retires_its_container(self):
+        with mock.patch.dict(os.environ, {'FAKE_DOCKER_EXIT': '3'}):
+            self.assertEqual(self.pool.run('img', 'qa.sh'), 3)
+        self.assertEqual(self.containers(), [])
+        self.assertEqual(len(self.calls('rm')), 1)
+
+    def test_retries_once_when_the_container_is_gone(self):
+        self.pool.run('img', 'qa.sh')
+        [container] = self.containers()
+        update_mounts.subprocess.run([str(FAKE_DOCKER), 'rm', '-f', container['id']], capture_output=True)
+        self.assertEqual(self.pool.run('img', 'qa.sh'), 0)
+        self.assertEqual(len(self.calls('run')), 2)
+        [fresh] = self.containers()
+        self.assertNotEqual(fresh['id'], container['id'])
+
+    def test_exec_that_raises_releases_the_container(self):
+        with mock.patch.object(update_mounts, 'stream_command', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.pool.run('img', 'qa.sh')
+        # The lease was returned (and the container retired as failed), so the pool has room again.
+        self.assertEqual(self.containers(), [])
+        self.assertEqual(self.pool.run('img', 'qa.sh'), 0)
+
+    def test_failed_start_frees_the_reserved_slot(self):
+        with mock.patch.dict(os.environ, {'FAKE_DOCKER_FAIL_RUN': '1'}):
+            with self.assertRaises(RuntimeError):
+                self.pool.run('img', 'qa.sh')
+        self.assertEqual(self.containers(), [])
+
+    def test_never_starts_more_than_pool_size(self):
+        first = self.pool.acquire('img')
+        second = self.pool.acquire('img')
+        with self.assertRaises(RuntimeError):
+            self.pool.acquire('img', wait_timeout=0.1)
+        self.assertEqual(len(self.calls('run')), 2)
+        self.pool.release('img', first['id'], failed=False)
+        self.assertEqual(self.pool.acquire('img')['id'], first['id'])
+        self.pool.release('img', second['id'], failed=False)
+
+    def test_drain_removes_every_container(self):
+        self.pool.run('img', 'qa.sh')
+        self.pool.run('other', 'qa.sh')
+        self.assertEqual(len(self.pool.drain()), 2)
+        self.assertEqual(self.pool.status(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
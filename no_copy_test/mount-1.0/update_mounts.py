@@ -1,6 +1,50 @@
+"""
+Mounts a script from bash_files/ into a Docker container and runs it.
+
+One-shot mode (default) starts a fresh container per run:
+
+    python update_mounts.py --sh-name entrypoint.sh --no-input
+
+Pool mode keeps up to --pool-size long-lived containers per image, each
+with bash_files/ mounted read-only, and runs scripts in them with
+`docker exec`, so repeat runs skip container start-up:
+
+    python update_mounts.py --sh-name qa.sh --pool --no-input
+    python update_mounts.py --pool-status
+    python update_mounts.py --pool-drain
+
+Pooled containers are recycled after --max-runs runs, after any failed run
+and when they turn out to be gone. The pool is tracked in a JSON state file
+(--state-file, locked while it is read and updated, never while docker runs)
+so separate invocations share it: a container being started holds a
+reserved slot, so the pool never outgrows --pool-size.
+Set DOCKER_BIN to point the script at another docker CLI, e.g. the test
+shim: tests/test_update_mounts.py runs the pool against tests/fake_docker.py.
+
+    python -m unittest discover -s tests
+"""
 import argparse
+import fcntl
+import json
+import os
 import subprocess
 import sys
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+
+BASH_DIR = Path(__file__).resolve().parent.parent / 'bash_files'
+MOUNT_POINT = '/usr/local/bin/bash_files'
+POOL_LABEL = 'update_mounts.pool'
+DEFAULT_STATE_FILE = Path.home() / '.cache' / 'update_mounts' / 'pool.json'
+# `docker exec` exits with these when the container, not the script, failed.
+DOCKER_EXEC_ERRORS = (125, 126, 127)
+
+
+def docker_bin():
+    return os.environ.get('DOCKER_BIN', 'docker')
 
 
 # --- Helper Functions ---
@@ -18,6 +62,7 @@ def print_color(text, color):
         'reset': '\033[0m'
     }
     sys.stdout.write(colors.get(color, '') + text + colors['reset'])
+    sys.stdout.flush()
 
 def run_command(command, description):
     """Runs a command and prints a description."""
@@ -34,7 +79,169 @@ def run_command(command, description):
         print_color(" [FAILED]\n", 'red')
         return False
 
-import os
+def stream_command(command):
+    """Runs a command with its output going straight to our stdout/stderr; returns the exit code."""
+    sys.stdout.flush()
+    return subprocess.run(command).returncode
+
+
+# --- One-shot mode ---
+
+def run_once(image, sh_name, bash_dir=BASH_DIR):
+    """`docker run --rm` with bash_files mounted; returns the script's exit code."""
+    return stream_command([
+        docker_bin(), 'run', '--rm',
+        '-v', f'{bash_dir}:{MOUNT_POINT}:ro',
+        image, 'bash', f'{MOUNT_POINT}/{sh_name}',
+    ])
+
+
+# --- Pool mode ---
+
+class ContainerPool:
+    """Long-lived containers per image, shared between invocations through a locked state file."""
+
+    def __init__(self, state_file=DEFAULT_STATE_FILE, size=2, max_runs=50, bash_dir=BASH_DIR):
+        self.state_file = Path(state_file)
+        self.size = size
+        self.max_runs = max_runs
+        self.bash_dir = bash_dir
+
+    @contextmanager
+    def _state(self):
+        """Yields the pool state dict under an exclusive lock and writes it back."""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_file.with_suffix('.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                state = json.loads(self.state_file.read_text()) if self.state_file.exists() else {}
+            except ValueError:
+                state = {}
+            yield state
+            tmp = self.state_file.with_suffix('.tmp')
+            tmp.write_text(json.dumps(state, indent=2, sort_keys=True) + '\n')
+            os.replace(tmp, self.state_file)
+
+    def _start(self, image):
+        result = subprocess.run(
+            [docker_bin(), 'run', '-d', '--init',
+             '--label', f'{POOL_LABEL}={image}',
+             '-v', f'{self.bash_dir}:{MOUNT_POINT}:ro',
+             image, 'sleep', 'infinity'],
+            capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f'Could not start a pool container for {image}: {result.stderr.strip()}')
+        return {'id': result.stdout.strip(), 'runs': 0, 'busy_pid': None, 'started': time.time()}
+
+    def _remove(self, container_id):
+        subprocess.run([docker_bin(), 'rm', '-f', container_id], capture_output=True)
+
+    @staticmethod
+    def _pid_alive(pid):
+        if not pid:
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def acquire(self, image, wait_timeout=60.0):
+        """Marks an idle container of `image` busy (starting one if the pool has room) and returns it."""
+        deadline = time.monotonic() + wait_timeout
+        while True:
+            slot = None
+            with self._state() as state:
+                containers = state.setdefault(image, [])
+                # A slot whose starter died never got its container.
+                containers[:] = [c for c in containers if c['id'] or self._pid_alive(c.get('busy_pid'))]
+                for container in containers:
+                    if container['id'] and not self._pid_alive(container.get('busy_pid')):
+                        container['busy_pid'] = os.getpid()
+                        return dict(container)
+                if len(containers) < self.size:
+                    slot = uuid.uuid4().hex
+                    containers.append({'id': None, 'slot': slot, 'busy_pid': os.getpid()})
+            if slot is not None:
+                return self._fill_slot(image, slot)
+            if time.monotonic() > deadline:
+                raise RuntimeError(f'No idle pool container for {image} after {wait_timeout}s')
+            time.sleep(0.05)
+
+    def _fill_slot(self, image, slot):
+        """Starts a container for a slot reserved by acquire(); `docker run` runs without the lock."""
+        try:
+            container = self._start(image)
+        except BaseException:
+            with self._state() as state:
+                state[image] = [c for c in state.get(image, []) if c.get('slot') != slot]
+            raise
+        container['busy_pid'] = os.getpid()
+        with self._state() as state:
+            containers = state.setdefault(image, [])
+            containers[:] = [c for c in containers if c.get('slot') != slot]
+            containers.append(container)
+        return dict(container)
+
+    def release(self, image, container_id, failed):
+        """Counts the run; removes the container when it failed or reached max_runs."""
+        retire = failed
+        with self._state() as state:
+            containers = state.setdefault(image, [])
+            for container in containers:
+                if container['id'] == container_id:
+                    container['runs'] += 1
+                    container['busy_pid'] = None
+                    retire = retire or container['runs'] >= self.max_runs
+                    if retire:
+                        containers.remove(container)
+                    break
+        if retire:
+            self._remove(container_id)
+        return retire
+
+    def run(self, image, sh_name):
+        """Runs bash_files/<sh_name> in a pooled container; returns the script's exit code."""
+        for attempt in range(2):
+            container = self.acquire(image)
+            code = None
+            try:
+                code = stream_command([docker_bin(), 'exec', container['id'], 'bash', f'{MOUNT_POINT}/{sh_name}'])
+                gone = code in DOCKER_EXEC_ERRORS and not self.is_running(container['id'])
+            finally:
+                # Also on Ctrl-C or a failed exec: never leave the container leased to us.
+                self.release(image, container['id'], failed=code != 0)
+            if gone and attempt == 0:
+                # The container died underneath us, not the script: retry once in a fresh one.
+                print_color(f"[!] Pool container {container['id'][:12]} was gone; retrying\n", 'yellow')
+                continue
+            return code
+        return code
+
+    def is_running(self, container_id):
+        result = subprocess.run(
+            [docker_bin(), 'inspect', '-f', '{{.State.Running}}', container_id],
+            capture_output=True, text=True,
+        )
+        return result.returncode == 0 and result.stdout.strip() == 'true'
+
+    def status(self):
+        with self._state() as state:
+            return {image: list(containers) for image, containers in state.items()}
+
+    def drain(self, image=None):
+        """Removes every pooled container (of one image, or all)."""
+        with self._state() as state:
+            images = [image] if image else list(state)
+            # Slots still being started have no id yet; their starter adds the container afterwards.
+            doomed = [c['id'] for name in images for c in state.pop(name, []) if c['id']]
+        for container_id in doomed:
+            self._remove(container_id)
+        return doomed
+
 
 def main():
     """Main function."""
@@ -45,8 +252,24 @@ def main():
     parser.add_argument('--sh-name', help='Name of the .sh file in the bash_files directory')
     parser.add_argument('--image-name', default='mount_trekker:01.09', help='Name of the Docker image to run')
     parser.add_argument('--no-input', action='store_true', help='Do not prompt for input')
+    parser.add_argument('--pool', action='store_true', help='Run in a warm pooled container via docker exec')
+    parser.add_argument('--pool-size', type=int, default=2, help='Containers kept per image (default: 2)')
+    parser.add_argument('--max-runs', type=int, default=50,
+                        help='Recycle a pooled container after this many runs (default: 50)')
+    parser.add_argument('--state-file', default=str(DEFAULT_STATE_FILE), help='Pool state file')
+    parser.add_argument('--pool-status', action='store_true', help='Show pooled containers and exit')
+    parser.add_argument('--pool-drain', action='store_true', help='Remove pooled containers and exit')
 
     args = parser.parse_args()
+    pool = ContainerPool(args.state_file, size=args.pool_size, max_runs=args.max_runs)
+
+    if args.pool_status:
+        print(json.dumps(pool.status(), indent=2, sort_keys=True))
+        return 0
+    if args.pool_drain:
+        removed = pool.drain()
+        print_color(f"Removed {len(removed)} pooled container(s)\n", 'green')
+        return 0
 
     # --- Get user input if not provided via command-line arguments ---
     if not args.no_input:
@@ -60,14 +283,20 @@ def main():
         print_color("Error: Bash file name is required.\n", 'red')
         sys.exit(1)
 
-    # This script assumes it is being run from the project root directory.
-    # Construct the full path for the volume mount.
-    # e.g., /home/user/project/bash_files/entrypoint.sh:/usr/local/bin/entrypoint.sh
-    run_command(['chmod','+x',f"/{os.getcwd()}/../bash_files/{args.sh_name}"], f"chmod +x {os.getcwd()}/bash_files/{args.sh_name}")
+    script = BASH_DIR / args.sh_name
+    if not script.is_file():
+        print_color(f"Error: {script} does not exist.\n", 'red')
+        sys.exit(1)
+    run_command(['chmod', '+x', str(script)], f"chmod +x {script}")
 
-    # Build the command as a list of separate arguments
-    # Mount the entire bash_files directory to /usr/local/bin
+    # The whole bash_files directory is mounted read-only at MOUNT_POINT.
+    if args.pool:
+        code = pool.run(args.image_name, args.sh_name)
+    else:
+        code = run_once(args.image_name, args.sh_name)
+    print_color(f"[*] {args.sh_name} exited with {code}\n", 'green' if code == 0 else 'red')
+    return code
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(main())